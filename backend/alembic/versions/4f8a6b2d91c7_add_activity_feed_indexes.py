@@ -0,0 +1,40 @@
+"""add activity feed indexes
+
+Revision ID: 4f8a6b2d91c7
+Revises: 9d41c2e7a0b3
+Create Date: 2025-07-03 14:41:09.552810
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4f8a6b2d91c7'
+down_revision: Union[str, None] = '9d41c2e7a0b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Index the (created_at, id) keyset used by the activity feed, globally and per user."""
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_ticket_history_created_at_id
+            ON ticket_history (created_at DESC, id DESC)
+        """)
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_ticket_history_user_created_at_id
+            ON ticket_history (user_id, created_at DESC, id DESC)
+        """)
+        # Superseded by idx_ticket_history_created_at_id
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_ticket_history_created_at")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_ticket_history_created_at ON ticket_history (created_at)")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_ticket_history_user_created_at_id")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_ticket_history_created_at_id")
@@ -0,0 +1,56 @@
+"""spread ticket positions
+
+Revision ID: 9d41c2e7a0b3
+Revises: bfebbe865a1f
+Create Date: 2025-07-02 10:12:44.318205
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d41c2e7a0b3'
+down_revision: Union[str, None] = 'bfebbe865a1f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Keep in sync with utils.positions.POSITION_GAP
+POSITION_GAP = 1024
+
+
+def upgrade() -> None:
+    """Renumber tickets per category with gaps so moves only touch one row.
+
+    Appends and moves to the top step POSITION_GAP past the column's ends, with no
+    rebalance to pull them back, so positions are widened to bigint: an int would
+    overflow after about two million of them in one column.
+    """
+    op.alter_column("tickets", "position", type_=sa.BigInteger(), existing_type=sa.Integer(),
+                    existing_nullable=False)
+    op.execute(f"""
+        UPDATE tickets t
+        SET position = ranked.rank * {POSITION_GAP}
+        FROM (
+            SELECT id, row_number() OVER (PARTITION BY category_id ORDER BY position, id) AS rank
+            FROM tickets
+        ) ranked
+        WHERE t.id = ranked.id
+    """)
+
+
+def downgrade() -> None:
+    """Restore dense zero-based integer positions."""
+    op.execute("""
+        UPDATE tickets t
+        SET position = ranked.rank - 1
+        FROM (
+            SELECT id, row_number() OVER (PARTITION BY category_id ORDER BY position, id) AS rank
+            FROM tickets
+        ) ranked
+        WHERE t.id = ranked.id
+    """)
+    op.alter_column("tickets", "position", type_=sa.Integer(), existing_type=sa.BigInteger(),
+                    existing_nullable=False)
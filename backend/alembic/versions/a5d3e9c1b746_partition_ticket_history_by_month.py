@@ -0,0 +1,89 @@
+"""partition ticket history by month
+
+Revision ID: a5d3e9c1b746
+Revises: f1a9c3d57e28
+Create Date: 2025-07-11 09:48:15.270533
+
+"""
+from typing import Sequence, Union
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a5d3e9c1b746'
+down_revision: Union[str, None] = 'f1a9c3d57e28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Mirrors services.history_partitions at the time of writing
+MONTHS_AHEAD = 3
+
+COLUMNS = """
+    id uuid NOT NULL DEFAULT uuid_generate_v4(),
+    ticket_id uuid NOT NULL REFERENCES tickets (id) ON DELETE CASCADE,
+    user_id uuid NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+    action_type varchar(20) NOT NULL,
+    old_values jsonb,
+    new_values jsonb,
+    from_category_name varchar(100),
+    to_category_name varchar(100),
+    created_at timestamptz NOT NULL DEFAULT now(),
+    is_checkpoint boolean NOT NULL DEFAULT true
+"""
+COLUMN_NAMES = "id, ticket_id, user_id, action_type, old_values, new_values, from_category_name, to_category_name, created_at, is_checkpoint"
+
+
+def _add_months(value, months):
+    month = value.month - 1 + months
+    return date(value.year + month // 12, month % 12 + 1, 1)
+
+
+def _create_indexes():
+    op.execute("CREATE INDEX idx_ticket_history_created_at_id ON ticket_history (created_at DESC, id DESC)")
+    op.execute("CREATE INDEX idx_ticket_history_user_created_at_id ON ticket_history (user_id, created_at DESC, id DESC)")
+    op.execute("CREATE INDEX idx_ticket_history_ticket_created_at ON ticket_history (ticket_id, created_at DESC)")
+
+
+def _rename_old_table(suffix):
+    op.execute(f"ALTER TABLE ticket_history RENAME TO ticket_history_{suffix}")
+    op.execute(f"ALTER INDEX ticket_history_pkey RENAME TO ticket_history_{suffix}_pkey")
+    for index in ("idx_ticket_history_created_at_id", "idx_ticket_history_user_created_at_id", "idx_ticket_history_ticket_created_at"):
+        op.execute(f"ALTER INDEX IF EXISTS {index} RENAME TO {index}_{suffix}")
+
+
+def upgrade() -> None:
+    """Rebuild ticket_history as a table range partitioned by month on created_at."""
+    _rename_old_table("unpartitioned")
+
+    op.execute(f"CREATE TABLE ticket_history ({COLUMNS}, PRIMARY KEY (id, created_at)) PARTITION BY RANGE (created_at)")
+    op.execute("CREATE TABLE ticket_history_default PARTITION OF ticket_history DEFAULT")
+
+    conn = op.get_bind()
+    oldest = conn.execute(sa.text("SELECT min(created_at) FROM ticket_history_unpartitioned")).scalar()
+    today = date.today()
+    month = date(oldest.year, oldest.month, 1) if oldest else date(today.year, today.month, 1)
+    last = _add_months(date(today.year, today.month, 1), MONTHS_AHEAD)
+
+    while month <= last:
+        op.execute(f"""
+            CREATE TABLE ticket_history_y{month.year:04d}m{month.month:02d} PARTITION OF ticket_history
+            FOR VALUES FROM ('{month}') TO ('{_add_months(month, 1)}')
+        """)
+        month = _add_months(month, 1)
+
+    op.execute(f"INSERT INTO ticket_history ({COLUMN_NAMES}) SELECT {COLUMN_NAMES} FROM ticket_history_unpartitioned")
+    op.execute("DROP TABLE ticket_history_unpartitioned")
+    _create_indexes()
+
+
+def downgrade() -> None:
+    """Fold the partitions back into a single ticket_history table; archived partitions are not restored."""
+    _rename_old_table("partitioned")
+
+    op.execute(f"CREATE TABLE ticket_history ({COLUMNS}, PRIMARY KEY (id))")
+    op.execute(f"INSERT INTO ticket_history ({COLUMN_NAMES}) SELECT {COLUMN_NAMES} FROM ticket_history_partitioned")
+    op.execute("DROP TABLE ticket_history_partitioned CASCADE")
+    _create_indexes()
@@ -0,0 +1,34 @@
+"""add cache versions
+
+Revision ID: b6d2f8e4a913
+Revises: a5d3e9c1b746
+Create Date: 2025-07-12 10:21:37.514208
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6d2f8e4a913'
+down_revision: Union[str, None] = 'a5d3e9c1b746'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add the version counters that invalidate the per-process caches."""
+    op.create_table(
+        'cache_versions',
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('version', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('name')
+    )
+    op.execute("INSERT INTO cache_versions (name, version) VALUES ('categories', 0)")
+
+
+def downgrade() -> None:
+    """Drop the cache version counters."""
+    op.drop_table('cache_versions')
@@ -0,0 +1,48 @@
+"""add hot query indexes
+
+Revision ID: c3e57d0a8f26
+Revises: 4f8a6b2d91c7
+Create Date: 2025-07-04 09:27:51.840117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3e57d0a8f26'
+down_revision: Union[str, None] = '4f8a6b2d91c7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# users(username) is already covered by the users_username_key unique index and
+# ticket_history(user_id, created_at) by idx_ticket_history_user_created_at_id.
+
+
+def upgrade() -> None:
+    """Add indexes for the board listing, drag-drop and ticket history lookups."""
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tickets_category_position
+            ON tickets (category_id, position, id)
+        """)
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_categories_position_active
+            ON categories (position) WHERE is_deleted = false
+        """)
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_ticket_history_ticket_created_at
+            ON ticket_history (ticket_id, created_at DESC)
+        """)
+        # Superseded by idx_ticket_history_ticket_created_at
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_ticket_history_ticket_id")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_ticket_history_ticket_id ON ticket_history (ticket_id)")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_ticket_history_ticket_created_at")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_categories_position_active")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_tickets_category_position")
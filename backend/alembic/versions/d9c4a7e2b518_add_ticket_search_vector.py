@@ -0,0 +1,41 @@
+"""add ticket search vector
+
+Revision ID: d9c4a7e2b518
+Revises: b6d2f8e4a913
+Create Date: 2025-07-14 11:05:42.381907
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9c4a7e2b518'
+down_revision: Union[str, None] = 'b6d2f8e4a913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must match the Computed expression of Ticket.search_vector
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('english'::regconfig, coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(description, '')), 'B')"
+)
+
+
+def upgrade() -> None:
+    """Add the generated full-text search column on tickets and its GIN index."""
+    # Rewrites tickets once to fill the stored column
+    op.execute(f"ALTER TABLE tickets ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ({SEARCH_VECTOR}) STORED")
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tickets_search_vector
+            ON tickets USING gin (search_vector)
+        """)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_tickets_search_vector")
+    op.drop_column('tickets', 'search_vector')
@@ -0,0 +1,106 @@
+"""move profile pictures to avatar store
+
+Revision ID: e7b2a95c4d10
+Revises: c3e57d0a8f26
+Create Date: 2025-07-08 16:03:27.115942
+
+"""
+from typing import Sequence, Union
+from io import BytesIO
+import base64
+import binascii
+import hashlib
+
+from alembic import op
+import sqlalchemy as sa
+from PIL import Image, UnidentifiedImageError
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7b2a95c4d10'
+down_revision: Union[str, None] = 'c3e57d0a8f26'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Mirrors services.avatar_service at the time of writing
+THUMBNAIL_SIZE = (128, 128)
+AVATAR_CONTENT_TYPES = {"image/png", "image/jpeg", "image/gif", "image/webp"}
+
+
+def _decode(data_url):
+    # The declared type is ignored; the stored one is detected by Pillow
+    payload = data_url.partition(",")[2] if data_url.startswith("data:") else data_url
+    return base64.b64decode(payload, validate=True)
+
+
+def _thumbnail(data):
+    """PNG thumbnail and the detected content type of the original"""
+    image = Image.open(BytesIO(data))
+    content_type = Image.MIME.get(image.format)
+    if content_type not in AVATAR_CONTENT_TYPES:
+        raise ValueError(f"Unsupported avatar type {content_type}")
+    image.thumbnail(THUMBNAIL_SIZE)
+    output = BytesIO()
+    image.convert("RGBA").save(output, format="PNG", optimize=True)
+    return output.getvalue(), content_type
+
+
+def upgrade() -> None:
+    """Move base64 profile pictures out of users into the content-addressed avatars table."""
+    op.create_table(
+        'avatars',
+        sa.Column('hash', sa.String(64), primary_key=True),
+        sa.Column('content_type', sa.String(50), nullable=False),
+        sa.Column('data', sa.LargeBinary, nullable=False),
+        sa.Column('thumbnail', sa.LargeBinary, nullable=False),
+        sa.Column('thumbnail_content_type', sa.String(50), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.add_column('users', sa.Column('avatar_hash', sa.String(64), nullable=True))
+    op.create_foreign_key('fk_users_avatar_hash', 'users', 'avatars', ['avatar_hash'], ['hash'], ondelete='SET NULL')
+
+    conn = op.get_bind()
+    avatars = sa.table(
+        'avatars',
+        sa.column('hash'), sa.column('content_type'), sa.column('data'),
+        sa.column('thumbnail'), sa.column('thumbnail_content_type'),
+    )
+    stored = set()
+
+    rows = conn.execute(sa.text("SELECT id, profile_picture FROM users WHERE profile_picture IS NOT NULL AND profile_picture <> ''"))
+    for user_id, picture in rows.fetchall():
+        try:
+            data = _decode(picture)
+            thumbnail, content_type = _thumbnail(data)
+        except (binascii.Error, ValueError, UnidentifiedImageError, OSError):
+            # Unreadable images are dropped; the user falls back to initials
+            continue
+
+        digest = hashlib.sha256(data).hexdigest()
+        if digest not in stored:
+            conn.execute(avatars.insert().values(
+                hash=digest, content_type=content_type, data=data,
+                thumbnail=thumbnail, thumbnail_content_type="image/png",
+            ))
+            stored.add(digest)
+
+        conn.execute(sa.text("UPDATE users SET avatar_hash = :hash WHERE id = :id"), {"hash": digest, "id": user_id})
+
+    op.drop_column('users', 'profile_picture')
+
+
+def downgrade() -> None:
+    op.add_column('users', sa.Column('profile_picture', sa.Text(), nullable=True))
+
+    conn = op.get_bind()
+    rows = conn.execute(sa.text("""
+        SELECT u.id, a.content_type, a.data
+        FROM users u JOIN avatars a ON a.hash = u.avatar_hash
+    """))
+    for user_id, content_type, data in rows.fetchall():
+        picture = f"data:{content_type};base64,{base64.b64encode(bytes(data)).decode()}"
+        conn.execute(sa.text("UPDATE users SET profile_picture = :picture WHERE id = :id"), {"picture": picture, "id": user_id})
+
+    op.drop_constraint('fk_users_avatar_hash', 'users', type_='foreignkey')
+    op.drop_column('users', 'avatar_hash')
+    op.drop_table('avatars')
@@ -0,0 +1,98 @@
+"""compact ticket history to diffs
+
+Revision ID: f1a9c3d57e28
+Revises: e7b2a95c4d10
+Create Date: 2025-07-10 11:26:53.604171
+
+"""
+from typing import Sequence, Union
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1a9c3d57e28'
+down_revision: Union[str, None] = 'e7b2a95c4d10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Keep in sync with utils.history_diff
+CHECKPOINT_INTERVAL = 20
+
+VALUES_SIZE = "SELECT coalesce(sum(coalesce(pg_column_size(old_values), 0) + coalesce(pg_column_size(new_values), 0)), 0) FROM ticket_history"
+
+
+def _report(before, after):
+    saved = before - after
+    percent = saved * 100 / before if before else 0
+    print(f"ticket_history values: {before} -> {after} bytes, saved {saved} bytes ({percent:.1f}%)")
+
+
+def upgrade() -> None:
+    """Store updates and moves as changed keys only, keeping every CHECKPOINT_INTERVAL-th row per ticket in full."""
+    op.add_column('ticket_history', sa.Column('is_checkpoint', sa.Boolean(), nullable=False, server_default=sa.true()))
+    op.add_column('tickets', sa.Column('history_seq', sa.Integer(), nullable=False, server_default='0'))
+
+    conn = op.get_bind()
+    before = conn.execute(sa.text(VALUES_SIZE)).scalar()
+
+    op.execute(f"""
+        UPDATE ticket_history h
+        SET old_values = coalesce((
+                SELECT jsonb_object_agg(o.key, o.value) FROM jsonb_each(h.old_values) o
+                WHERE (h.new_values -> o.key) IS DISTINCT FROM o.value
+            ), '{{}}'::jsonb),
+            new_values = coalesce((
+                SELECT jsonb_object_agg(n.key, n.value) FROM jsonb_each(h.new_values) n
+                WHERE (h.old_values -> n.key) IS DISTINCT FROM n.value
+            ), '{{}}'::jsonb),
+            is_checkpoint = false
+        FROM (
+            SELECT id, row_number() OVER (PARTITION BY ticket_id ORDER BY created_at, id) AS seq
+            FROM ticket_history
+        ) numbered
+        WHERE h.id = numbered.id
+          AND h.action_type IN ('updated', 'moved')
+          AND numbered.seq % {CHECKPOINT_INTERVAL} <> 0
+          AND jsonb_typeof(h.old_values) = 'object'
+          AND jsonb_typeof(h.new_values) = 'object'
+    """)
+
+    op.execute("""
+        UPDATE tickets t
+        SET history_seq = counted.rows
+        FROM (SELECT ticket_id, count(*) AS rows FROM ticket_history GROUP BY ticket_id) counted
+        WHERE t.id = counted.ticket_id
+    """)
+
+    _report(before, conn.execute(sa.text(VALUES_SIZE)).scalar())
+
+
+def downgrade() -> None:
+    """Expand diff rows back into full before/after snapshots."""
+    conn = op.get_bind()
+    rows = conn.execute(sa.text("""
+        SELECT id, ticket_id, is_checkpoint, old_values, new_values
+        FROM ticket_history
+        ORDER BY ticket_id, created_at, id
+    """))
+
+    ticket_id = state = None
+    for history_id, row_ticket_id, is_checkpoint, old_values, new_values in rows.fetchall():
+        if row_ticket_id != ticket_id:
+            ticket_id, state = row_ticket_id, None
+
+        if not is_checkpoint and state is not None:
+            old_values = {**state, **(old_values or {})}
+            new_values = {**state, **(new_values or {})}
+            conn.execute(
+                sa.text("UPDATE ticket_history SET old_values = CAST(:old AS jsonb), new_values = CAST(:new AS jsonb) WHERE id = :id"),
+                {"old": json.dumps(old_values), "new": json.dumps(new_values), "id": history_id}
+            )
+
+        state = new_values if new_values is not None else old_values
+
+    op.drop_column('tickets', 'history_seq')
+    op.drop_column('ticket_history', 'is_checkpoint')
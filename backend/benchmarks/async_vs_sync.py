@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Sync vs async database mode throughput benchmark for ADPM (Advanced Project Management)
+Starts the API under uvicorn once per DB_ASYNC_MODE, logs in as a seeded user and
+drives the read endpoints with a fixed number of concurrent clients, then prints
+requests per second for both modes side by side.
+
+Needs a migrated and seeded database and the packages in benchmarks/requirements.txt:
+    python -m benchmarks.async_vs_sync --concurrency 50 500
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENDPOINTS = [
+    "/board",
+    "/tickets/?page_size=50&cursor=",
+    "/categories/",
+    "/tickets/history/all?cursor=",
+]
+
+
+def start_server(async_mode: bool, port: int) -> subprocess.Popen:
+    env = {**os.environ, "DB_ASYNC_MODE": "true" if async_mode else "false"}
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env=env,
+    )
+
+
+async def wait_until_ready(base_url: str, timeout: float = 30.0):
+    deadline = time.perf_counter() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.perf_counter() < deadline:
+            try:
+                await client.get("/health")
+                return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} did not start")
+
+
+async def login(base_url: str, username: str, password: str) -> Dict[str, str]:
+    """Log in and return a Cookie header; the auth cookies are Secure, so httpx won't replay them over http."""
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        response = await client.post("/auth/login", json={"username": username, "password": password})
+        response.raise_for_status()
+        cookies = "; ".join(f"{cookie.name}={cookie.value}" for cookie in response.cookies.jar)
+    return {"Cookie": cookies}
+
+
+async def drive(base_url: str, headers: Dict[str, str], concurrency: int, duration: float) -> Tuple[float, int]:
+    """Run `concurrency` clients in a closed loop for `duration` seconds; returns (requests/s, errors)."""
+    completed = 0
+    errors = 0
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, headers=headers, limits=limits, timeout=60.0) as client:
+        deadline = time.perf_counter() + duration
+
+        async def client_loop(offset: int):
+            nonlocal completed, errors
+            i = offset
+            while time.perf_counter() < deadline:
+                try:
+                    response = await client.get(ENDPOINTS[i % len(ENDPOINTS)])
+                    if response.status_code == 200:
+                        completed += 1
+                    else:
+                        errors += 1
+                except httpx.TransportError:
+                    errors += 1
+                i += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(client_loop(n) for n in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return completed / elapsed, errors
+
+
+async def benchmark_mode(async_mode: bool, args) -> List[Tuple[float, int]]:
+    base_url = f"http://127.0.0.1:{args.port}"
+    server = start_server(async_mode, args.port)
+    try:
+        await wait_until_ready(base_url)
+        headers = await login(base_url, args.username, args.password)
+        await drive(base_url, headers, min(args.concurrency), args.warmup)
+        return [await drive(base_url, headers, clients, args.duration) for clients in args.concurrency]
+    finally:
+        server.terminate()
+        server.wait()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[50, 500])
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds per concurrency level")
+    parser.add_argument("--warmup", type=float, default=3.0)
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--username", default="adnan")
+    parser.add_argument("--password", default="password123")
+    args = parser.parse_args()
+
+    sync_results = await benchmark_mode(False, args)
+    async_results = await benchmark_mode(True, args)
+
+    print(f"{'clients':>8} {'sync req/s':>12} {'async req/s':>12} {'sync err':>9} {'async err':>9}")
+    for clients, (sync_rps, sync_err), (async_rps, async_err) in zip(args.concurrency, sync_results, async_results):
+        print(f"{clients:>8} {sync_rps:>12.1f} {async_rps:>12.1f} {sync_err:>9} {async_err:>9}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+API load test for ADPM (Advanced Project Management)
+Runs scripted user sessions (board loads, opening tickets, drag-drops, edits,
+activity feed, search, login) against main:app in process through the httpx ASGI
+transport, then reports p50/p95/p99 latency, requests per second and SQL
+statements per request for every endpoint. Results are written as JSON so runs
+can be compared; --compare exits non-zero when an endpoint regressed.
+
+Needs a migrated database with a generated dataset (see seed_data.py --tickets),
+which --seed-scale creates, replacing the current data:
+    python -m benchmarks.load_test --seed-scale 100k
+    python -m benchmarks.load_test --users 20 --duration 60 --output results/100k.json
+    python -m benchmarks.load_test --compare results/100k.json --max-regression 0.2
+"""
+
+import argparse
+import asyncio
+import contextvars
+import json
+import logging
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from sqlalchemy import event, func, select, text
+
+from core.database import DB_ASYNC_MODE, SessionLocal, engine, async_engine
+from models.category import Category
+from models.ticket import Ticket
+from seed_data import SCALE_PASSWORD, seed_scale
+from main import app
+
+SCALES = {
+    "10k": {"tickets": 10_000, "users": 50, "categories": 8},
+    "100k": {"tickets": 100_000, "users": 200, "categories": 10},
+    "1m": {"tickets": 1_000_000, "users": 1000, "categories": 12},
+}
+SEARCH_TERMS = ["login", "invoice", "cache timeout", "export report", "webhook -email"]
+
+# Statements of the request being sent; set per request, read by the engine hook
+request_statements: contextvars.ContextVar[Optional[List[int]]] = contextvars.ContextVar("request_statements", default=None)
+
+
+def count_statement(conn, cursor, statement, parameters, context, executemany):
+    counter = request_statements.get()
+    if counter is not None:
+        counter[0] += 1
+
+
+@dataclass
+class EndpointStats:
+    latencies: List[float] = field(default_factory=list)
+    statements: List[int] = field(default_factory=list)
+    errors: int = 0
+
+    def summary(self, elapsed: float) -> Dict[str, Any]:
+        latencies = sorted(self.latencies)
+        percentiles = statistics.quantiles(latencies, n=100, method="inclusive") if len(latencies) > 1 else latencies * 99
+        return {
+            "requests": len(latencies),
+            "errors": self.errors,
+            "rps": round(len(latencies) / elapsed, 2),
+            "mean_ms": round(statistics.fmean(latencies), 2) if latencies else None,
+            "p50_ms": round(percentiles[49], 2) if latencies else None,
+            "p95_ms": round(percentiles[94], 2) if latencies else None,
+            "p99_ms": round(percentiles[98], 2) if latencies else None,
+            "sql_per_request": round(statistics.fmean(self.statements), 2) if self.statements else None,
+            "sql_max": max(self.statements) if self.statements else None,
+        }
+
+
+class Recorder:
+    def __init__(self):
+        self.endpoints: Dict[str, EndpointStats] = {}
+        self.recording = False
+
+    async def request(self, client: httpx.AsyncClient, name: str, method: str, url: str, **kwargs) -> httpx.Response:
+        counter = [0]
+        token = request_statements.set(counter)
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        finally:
+            request_statements.reset(token)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        if self.recording:
+            stats = self.endpoints.setdefault(name, EndpointStats())
+            stats.latencies.append(elapsed_ms)
+            stats.statements.append(counter[0])
+            if response.status_code >= 400:
+                stats.errors += 1
+        return response
+
+
+@dataclass
+class Dataset:
+    usernames: List[str]
+    category_ids: List[str]
+    ticket_ids: List[str]
+    ticket_count: int
+
+
+def load_dataset(sample: int, seed: int) -> Dataset:
+    db = SessionLocal()
+    try:
+        usernames = db.execute(text("SELECT username FROM users WHERE username LIKE 'user%' ORDER BY username")).scalars().all()
+        category_ids = db.execute(
+            select(Category.id).where(Category.is_deleted == False).order_by(Category.position)
+        ).scalars().all()
+        # A seeded shuffle: ordering by a hash of the id samples the same tickets on every
+        # run with the same --seed, whatever the rows' physical order or the query plan
+        ticket_ids = db.execute(
+            select(Ticket.id).order_by(func.md5(func.concat(Ticket.id, f":{seed}")), Ticket.id).limit(sample)
+        ).scalars().all()
+        ticket_count = db.scalar(select(func.count(Ticket.id)))
+    finally:
+        db.close()
+
+    if not usernames or not category_ids or not ticket_ids:
+        raise SystemExit("No generated dataset. Run seed_data.py --tickets N or pass --seed-scale.")
+    return Dataset(usernames, [str(id) for id in category_ids], [str(id) for id in ticket_ids], ticket_count)
+
+
+class VirtualUser:
+    """One signed-in client running weighted scenarios in a closed loop"""
+
+    def __init__(self, client: httpx.AsyncClient, recorder: Recorder, dataset: Dataset, rng: random.Random, username: str):
+        self.client = client
+        self.recorder = recorder
+        self.dataset = dataset
+        self.rng = rng
+        self.username = username
+        self.categories_etag: Optional[str] = None
+        self.scenarios = [
+            (self.load_board, 30),
+            (self.open_ticket, 20),
+            (self.drag_drop, 15),
+            (self.activity_feed, 15),
+            (self.edit_ticket, 10),
+            (self.search, 5),
+            (self.login, 5),
+        ]
+
+    def request(self, name: str, method: str, url: str, **kwargs):
+        return self.recorder.request(self.client, name, method, url, **kwargs)
+
+    async def login(self):
+        response = await self.request("POST /auth/login", "POST", "/auth/login",
+                                      json={"username": self.username, "password": SCALE_PASSWORD})
+        response.raise_for_status()
+
+    async def load_board(self):
+        headers = {"If-None-Match": self.categories_etag} if self.categories_etag else {}
+        response = await self.request("GET /categories/", "GET", "/categories/", headers=headers)
+        self.categories_etag = response.headers.get("etag", self.categories_etag)
+
+        for category_id in self.dataset.category_ids:
+            await self.request("GET /tickets/?view=card (first page of a column)", "GET", "/tickets/", params={
+                "category_id": category_id, "view": "card", "cursor": "", "page_size": 50
+            })
+
+    async def open_ticket(self):
+        ticket_id = self.rng.choice(self.dataset.ticket_ids)
+        await self.request("GET /tickets/{id}", "GET", f"/tickets/{ticket_id}")
+
+    async def drag_drop(self):
+        await self.request("PUT /tickets/drag-drop", "PUT", "/tickets/drag-drop", json={
+            "ticket_id": self.rng.choice(self.dataset.ticket_ids),
+            "target_category_id": self.rng.choice(self.dataset.category_ids),
+            "target_position": self.rng.randint(0, 20),
+        })
+
+    async def edit_ticket(self):
+        ticket_id = self.rng.choice(self.dataset.ticket_ids)
+        await self.request("PUT /tickets/{id}", "PUT", f"/tickets/{ticket_id}", json={
+            "description": f"Edited by load test run {self.rng.random():.6f}"
+        })
+
+    async def activity_feed(self):
+        response = await self.request("GET /tickets/history/all", "GET", "/tickets/history/all", params={"cursor": ""})
+        next_cursor = response.json().get("next_cursor") if response.status_code == 200 else None
+        if next_cursor and self.rng.random() < 0.3:
+            await self.request("GET /tickets/history/all", "GET", "/tickets/history/all", params={"cursor": next_cursor})
+
+    async def search(self):
+        await self.request("GET /tickets/search", "GET", "/tickets/search", params={"q": self.rng.choice(SEARCH_TERMS)})
+
+    async def run(self, deadline: float):
+        scenarios, weights = zip(*self.scenarios)
+        while time.perf_counter() < deadline:
+            await self.rng.choices(scenarios, weights)[0]()
+
+
+async def run_load(args, dataset: Dataset) -> Dict[str, Any]:
+    recorder = Recorder()
+    transport = httpx.ASGITransport(app=app)
+    # https so the Secure auth cookies are sent back
+    clients = [httpx.AsyncClient(transport=transport, base_url="https://adpm.test", timeout=120.0)
+               for _ in range(args.users)]
+    try:
+        users = []
+        for n, client in enumerate(clients):
+            user = VirtualUser(client, recorder, dataset, random.Random(args.seed + n),
+                               dataset.usernames[n % len(dataset.usernames)])
+            await user.login()
+            users.append(user)
+
+        if args.warmup:
+            deadline = time.perf_counter() + args.warmup
+            await asyncio.gather(*(user.run(deadline) for user in users))
+
+        recorder.recording = True
+        started = time.perf_counter()
+        deadline = started + args.duration
+        await asyncio.gather(*(user.run(deadline) for user in users))
+        elapsed = time.perf_counter() - started
+    finally:
+        for client in clients:
+            await client.aclose()
+
+    endpoints = {name: stats.summary(elapsed) for name, stats in sorted(recorder.endpoints.items())}
+    total = EndpointStats()
+    for stats in recorder.endpoints.values():
+        total.latencies.extend(stats.latencies)
+        total.statements.extend(stats.statements)
+        total.errors += stats.errors
+    return {"elapsed_s": round(elapsed, 2), "total": total.summary(elapsed), "endpoints": endpoints}
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(result: Dict[str, Any]):
+    print(f"{'endpoint':<52} {'req':>6} {'err':>4} {'rps':>7} {'p50':>8} {'p95':>8} {'p99':>8} {'sql':>6}")
+    for name, row in [*result["endpoints"].items(), ("TOTAL", result["total"])]:
+        print(f"{name:<52} {row['requests']:>6} {row['errors']:>4} {row['rps']:>7.1f} {row['p50_ms']:>8.1f} "
+              f"{row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f} {row['sql_per_request']:>6.1f}")
+
+
+def compare(result: Dict[str, Any], baseline: Dict[str, Any], max_regression: float) -> bool:
+    """Print p95 and SQL count changes against a baseline run; False if anything regressed"""
+    ok = True
+    print(f"\n{'endpoint':<52} {'p95 base':>9} {'p95 now':>9} {'change':>8} {'sql base':>9} {'sql now':>8}")
+    for name, row in result["endpoints"].items():
+        base = baseline["endpoints"].get(name)
+        if not base or not base["p95_ms"]:
+            continue
+
+        change = row["p95_ms"] / base["p95_ms"] - 1
+        slower = change > max_regression
+        more_sql = (row["sql_per_request"] or 0) > (base["sql_per_request"] or 0) + 0.5
+        flag = "  REGRESSED" if slower or more_sql else ""
+        ok = ok and not flag
+        print(f"{name:<52} {base['p95_ms']:>9.1f} {row['p95_ms']:>9.1f} {change:>+7.0%} "
+              f"{base['sql_per_request']:>9.1f} {row['sql_per_request']:>8.1f}{flag}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed-scale", choices=SCALES, help="generate this dataset first, replacing the current data")
+    parser.add_argument("--users", type=int, default=20, help="concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=60.0, help="seconds of recorded load")
+    parser.add_argument("--warmup", type=float, default=5.0)
+    parser.add_argument("--seed", type=int, default=42, help="seeds the dataset and every user's scenario choices")
+    parser.add_argument("--sample", type=int, default=2000, help="tickets the users pick from")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON from an earlier run")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="allowed p95 increase, 0.2 = 20%%")
+    args = parser.parse_args()
+
+    # Request logging would dominate the measurements
+    logging.getLogger("app").setLevel(logging.WARNING)
+
+    if args.seed_scale:
+        seed_scale(**SCALES[args.seed_scale], seed=args.seed, reset=True, processes=os.cpu_count() or 1)
+
+    dataset = load_dataset(args.sample, args.seed)
+    engines = [engine] + ([async_engine.sync_engine] if async_engine is not None else [])
+    for target in engines:
+        event.listen(target, "before_cursor_execute", count_statement)
+
+    result = asyncio.run(run_load(args, dataset))
+    result["meta"] = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "commit": git_commit(),
+        "db_async_mode": DB_ASYNC_MODE,
+        "tickets": dataset.ticket_count,
+        "users": args.users,
+        "duration_s": args.duration,
+        "seed": args.seed,
+    }
+
+    print_report(result)
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as output:
+            json.dump(result, output, indent=2)
+        print(f"\nWrote {args.output}")
+
+    if args.compare:
+        with open(args.compare) as baseline:
+            if not compare(result, json.load(baseline), args.max_regression):
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
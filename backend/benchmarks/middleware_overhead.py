@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Per-request overhead of AuthMiddleware for ADPM (Advanced Project Management)
+Calls the ASGI stack directly with synthetic requests, no server or database
+involved, and prints the average cost per request of each layer:
+    python -m benchmarks.middleware_overhead --requests 50000
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from core.auth import create_access_token
+from core.middleware import AuthMiddleware
+
+
+async def endpoint(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-length", b"2")]})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+class PassthroughMiddleware(BaseHTTPMiddleware):
+    """Reference point: a BaseHTTPMiddleware that does nothing but call the app"""
+
+    async def dispatch(self, request, call_next):
+        return await call_next(request)
+
+
+def make_scope(path: str, cookie: bytes) -> dict:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"testserver"), (b"cookie", cookie)],
+        "client": ("127.0.0.1", 1234),
+        "server": ("testserver", 80),
+    }
+
+
+async def receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def send(message):
+    pass
+
+
+async def per_request_us(app, path: str, cookie: bytes, requests: int) -> float:
+    for _ in range(min(requests, 1000)):
+        await app(make_scope(path, cookie), receive, send)
+
+    started = time.perf_counter()
+    for _ in range(requests):
+        await app(make_scope(path, cookie), receive, send)
+    return (time.perf_counter() - started) / requests * 1e6
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=50000)
+    args = parser.parse_args()
+
+    cookie = f"access_token={create_access_token({'sub': 'benchmark'})}".encode()
+
+    cases = [
+        ("bare endpoint", endpoint, "/tickets/"),
+        ("AuthMiddleware, public route", AuthMiddleware(endpoint), "/auth/login"),
+        ("AuthMiddleware, access token", AuthMiddleware(endpoint), "/tickets/"),
+        ("BaseHTTPMiddleware passthrough", PassthroughMiddleware(endpoint), "/tickets/"),
+    ]
+
+    baseline = None
+    print(f"{'stack':<32} {'us/request':>12} {'overhead':>10}")
+    for name, app, path in cases:
+        cost = await per_request_us(app, path, cookie, args.requests)
+        baseline = cost if baseline is None else baseline
+        print(f"{name:<32} {cost:>12.2f} {cost - baseline:>10.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
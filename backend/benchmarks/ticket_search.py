@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Full-text ticket search benchmark for ADPM (Advanced Project Management)
+Fills a "Search benchmark" category with generated tickets up to --tickets (kept
+between runs, generated deterministically in SQL), then times the first and
+second page of GET /tickets/search for a set of queries and checks that matching
+goes through the GIN index:
+    python -m benchmarks.ticket_search --tickets 1000000
+    python -m benchmarks.ticket_search --drop
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from typing import List
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import delete, func, select, text
+from sqlalchemy.orm import Session
+
+from core.database import SessionLocal
+from models.category import Category
+from models.ticket import Ticket
+from models.user import User
+from services.ticket_service import TicketService
+from utils.positions import POSITION_GAP
+
+CATEGORY_NAME = "Search benchmark"
+BATCH_SIZE = 100_000
+
+# Drawn with a skew towards the start of the list, so early words are common and late ones rare
+WORDS = [
+    "fix", "update", "add", "the", "page", "user", "error", "api", "test", "build",
+    "login", "dashboard", "report", "release", "review", "bug", "feature", "deploy", "config", "database",
+    "migration", "timeout", "cache", "search", "export", "import", "email", "notification", "permission", "session",
+    "refactor", "cleanup", "latency", "memory", "upload", "invoice", "payment", "webhook", "staging", "production",
+    "kubernetes", "terraform", "grafana", "sentry", "oauth", "pagination", "websocket", "accessibility", "localization", "postgres",
+]
+
+QUERIES = [
+    "fix",
+    "login timeout",
+    '"database migration"',
+    "deploy -staging",
+    "refactor or cleanup",
+    "kubernetes",
+    "accessibility localization",
+]
+
+FILL_SQL = text("""
+    INSERT INTO tickets (id, title, description, position, category_id, user_id, history_seq)
+    SELECT gen_random_uuid(),
+           (SELECT string_agg(w.words[1 + floor(w.n * power(random(), 3))::int], ' ')
+            FROM generate_series(1, 6) WHERE g > 0),
+           (SELECT string_agg(w.words[1 + floor(w.n * power(random(), 3))::int], ' ')
+            FROM generate_series(1, 40) WHERE g > 0),
+           g * :gap, :category_id, :user_id, 0
+    FROM generate_series(:start, :stop) AS g,
+         (SELECT CAST(:words AS text[]) AS words, cardinality(CAST(:words AS text[])) AS n) AS w
+""")
+
+
+def benchmark_category(db: Session) -> Category:
+    category = db.query(Category).filter(Category.name == CATEGORY_NAME).first()
+    if category:
+        return category
+
+    user = db.query(User).filter(User.is_active == True).first()
+    if not user:
+        raise SystemExit("No user to own the benchmark category. Run seed_data.py first.")
+    category = Category(name=CATEGORY_NAME, position=1000, user_id=user.id)
+    db.add(category)
+    db.commit()
+    return category
+
+
+def fill(db: Session, category: Category, target: int):
+    """Generate tickets in the benchmark category until it holds `target`"""
+    existing = db.scalar(select(func.count(Ticket.id)).where(Ticket.category_id == category.id))
+    if existing >= target:
+        return
+
+    db.execute(text("SELECT setseed(0.42)"))
+    for start in range(existing + 1, target + 1, BATCH_SIZE):
+        stop = min(start + BATCH_SIZE - 1, target)
+        db.execute(FILL_SQL, {
+            "gap": POSITION_GAP, "category_id": category.id, "user_id": category.user_id,
+            "start": start, "stop": stop, "words": WORDS
+        })
+        db.commit()
+        print(f"  generated {stop:,}/{target:,} tickets", flush=True)
+
+    db.execute(text("ANALYZE tickets"))
+    db.commit()
+
+
+def uses_gin_index(db: Session, q: str) -> bool:
+    plan = db.execute(text("""
+        EXPLAIN SELECT id FROM tickets
+        WHERE search_vector @@ websearch_to_tsquery('english'::regconfig, :q)
+    """), {"q": q}).scalars().all()
+    return any("idx_tickets_search_vector" in line for line in plan)
+
+
+def timings_ms(run, repeat: int) -> List[float]:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tickets", type=int, default=1_000_000, help="tickets in the benchmark category")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--drop", action="store_true", help="delete the benchmark category and its tickets")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        category = benchmark_category(db)
+        if args.drop:
+            # Core delete: the ORM would load every ticket to cascade; the foreign keys do it instead
+            db.execute(delete(Category.__table__).where(Category.__table__.c.id == category.id))
+            db.commit()
+            print(f"Dropped {CATEGORY_NAME}")
+            return
+
+        fill(db, category, args.tickets)
+        service = TicketService(db)
+
+        print(f"{'query':<30} {'matches':>9} {'index':>6} {'p50 ms':>8} {'p95 ms':>8} {'page 2 p50':>11}")
+        for q in QUERIES:
+            matches = db.scalar(select(func.count(Ticket.id)).where(
+                Ticket.search_vector.op("@@")(func.websearch_to_tsquery(text("'english'::regconfig"), q))
+            ))
+            first = timings_ms(lambda: service.search_tickets(q, page_size=args.page_size), args.repeat)
+
+            cursor = service.search_tickets(q, page_size=args.page_size)["next_cursor"]
+            second = timings_ms(lambda: service.search_tickets(q, cursor=cursor, page_size=args.page_size),
+                                args.repeat) if cursor else [0.0]
+
+            p95 = statistics.quantiles(first, n=20)[-1] if len(first) > 1 else first[0]
+            print(f"{q:<30} {matches:>9,} {'yes' if uses_gin_index(db, q) else 'NO':>6} "
+                  f"{statistics.median(first):>8.1f} {p95:>8.1f} {statistics.median(second):>11.1f}")
+            db.rollback()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
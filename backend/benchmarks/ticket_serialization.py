@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Unpaged ticket listing serialisation benchmark for ADPM (Advanced Project Management)
+Compares the two ways of producing the GET /tickets/?page_size=0 body: ORM objects
+validated into PaginatedTicketOut and encoded with the stdlib json module, against
+Core rows mapped to dicts and encoded with orjson. The tickets are inserted into a
+scratch category inside a transaction that is rolled back at the end.
+
+Needs a migrated and seeded database:
+    python -m benchmarks.ticket_serialization --sizes 1000 10000 50000
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Tuple
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pydantic import TypeAdapter
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from core.database import SessionLocal
+from models.category import Category
+from models.ticket import Ticket, ticket_users
+from models.user import User
+from schemas import PaginatedTicketOut
+from services.ticket_service import TicketService
+from utils.json_response import ORJSONResponse
+from utils.positions import POSITION_GAP
+
+paginated_adapter = TypeAdapter(PaginatedTicketOut)
+
+
+def orm_path(db: Session, category_id: uuid.UUID) -> bytes:
+    """What the route did before: ORM listing, from_attributes validation, stdlib json"""
+    result = TicketService(db).get_tickets(category_id, 1, 0)
+    content = paginated_adapter.dump_python(paginated_adapter.validate_python(result, from_attributes=True), mode="json")
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def core_path(db: Session, category_id: uuid.UUID) -> bytes:
+    return ORJSONResponse(TicketService(db).get_ticket_listing(category_id)).body
+
+
+def insert_tickets(db: Session, size: int) -> uuid.UUID:
+    users = db.query(User).filter(User.is_active == True).limit(3).all()
+    if not users:
+        raise SystemExit("No users to own the tickets. Run seed_data.py first.")
+
+    category_id = uuid.uuid4()
+    db.execute(insert(Category.__table__), [{
+        "id": category_id, "name": f"Benchmark {size}", "color": "#3B82F6", "position": 1000, "user_id": users[0].id
+    }])
+
+    now = datetime.now(timezone.utc)
+    tickets, assignments = [], []
+    for n in range(size):
+        ticket_id = uuid.uuid4()
+        tickets.append({
+            "id": ticket_id,
+            "title": f"Benchmark ticket {n}",
+            "description": "Ticket inserted by benchmarks/ticket_serialization.py " * 3,
+            "expiry_date": now + timedelta(days=n % 30) if n % 2 else None,
+            "position": (n + 1) * POSITION_GAP,
+            "category_id": category_id,
+            "user_id": users[n % len(users)].id,
+            "history_seq": 0,
+        })
+        for user in users[:1 + n % 2]:
+            assignments.append({"ticket_id": ticket_id, "user_id": user.id})
+
+    db.execute(insert(Ticket.__table__), tickets)
+    db.execute(insert(ticket_users), assignments)
+    db.flush()
+    return category_id
+
+
+def best_of(repeat: int, db: Session, run: Callable[[], bytes]) -> Tuple[float, int]:
+    """Fastest of `repeat` runs in seconds, and the body size"""
+    timings = []
+    for _ in range(repeat):
+        db.expunge_all()
+        started = time.perf_counter()
+        body = run()
+        timings.append(time.perf_counter() - started)
+    return min(timings), len(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'tickets':>8} {'orm ms':>10} {'core ms':>10} {'speedup':>8} {'body KiB':>9}")
+    for size in args.sizes:
+        db = SessionLocal()
+        try:
+            category_id = insert_tickets(db, size)
+            orm_seconds, _ = best_of(args.repeat, db, lambda: orm_path(db, category_id))
+            core_seconds, core_bytes = best_of(args.repeat, db, lambda: core_path(db, category_id))
+            print(f"{size:>8} {orm_seconds * 1000:>10.1f} {core_seconds * 1000:>10.1f} "
+                  f"{orm_seconds / core_seconds:>7.1f}x {core_bytes / 1024:>9.0f}")
+        finally:
+            db.rollback()
+            db.close()
+
+
+if __name__ == "__main__":
+    main()
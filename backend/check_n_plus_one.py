@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+N+1 query check for ADPM (Advanced Project Management)
+Calls every HTTP route of the app in process (httpx ASGI transport) as a freshly
+registered user, on scratch categories holding more tickets than the threshold,
+and fails if any request runs the same statement shape more than --threshold
+times, or if a route in routes/ has no check here. Everything the check creates
+is deleted at the end. Needs a migrated database; run it in both modes:
+    python check_n_plus_one.py
+    DB_ASYNC_MODE=true python check_n_plus_one.py
+"""
+
+import argparse
+import asyncio
+import base64
+import io
+import os
+import sys
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Tuple
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# The check tracks every request itself
+os.environ["N_PLUS_ONE_DETECTION"] = "off"
+
+import httpx
+from fastapi.routing import APIRoute
+from PIL import Image
+from sqlalchemy import delete, exists, select
+
+from core.database import SessionLocal
+from core.query_detector import N_PLUS_ONE_THRESHOLD, track_queries
+from models.avatar import Avatar
+from models.user import User
+from services.board_service import board_version
+from services.category_service import category_cache
+from main import app
+
+PASSWORD = "n+1-check-password"
+# Tickets in the scratch column; more than the threshold so per-row queries show up
+TICKETS = 12
+
+Context = Dict[str, Any]
+# (method, route path, request for the context, optional hook storing ids from the JSON response)
+Check = Tuple[str, str, Callable[[Context], Dict[str, Any]], Optional[Callable[[Context, Any], None]]]
+
+
+def avatar_data_url() -> str:
+    image = io.BytesIO()
+    Image.new("RGB", (64, 64), "#3B82F6").save(image, "PNG")
+    return "data:image/png;base64," + base64.b64encode(image.getvalue()).decode()
+
+
+CHECKS: List[Check] = [
+    ("POST", "/auth/register", lambda ctx: {"url": "/auth/register", "json": {
+        "username": ctx["username"], "email": f"{ctx['username']}@example.com", "password": PASSWORD
+    }}, lambda ctx, body: ctx.update(user_id=body["id"])),
+    ("POST", "/auth/login", lambda ctx: {"url": "/auth/login", "json": {
+        "username": ctx["username"], "password": PASSWORD
+    }}, None),
+    ("GET", "/auth/me", lambda ctx: {"url": "/auth/me"}, None),
+    ("PUT", "/auth/me", lambda ctx: {"url": "/auth/me", "json": {
+        "first_name": "N+1", "last_name": "Check", "profile_picture": avatar_data_url()
+    }}, None),
+    ("GET", "/users/{user_id}/avatar", lambda ctx: {"url": f"/users/{ctx['user_id']}/avatar"}, None),
+    ("GET", "/auth/users", lambda ctx: {"url": "/auth/users"}, None),
+
+    ("POST", "/categories/", lambda ctx: {"url": "/categories/", "json": {"name": "N+1 check", "position": 1000}},
+     lambda ctx, body: ctx.update(category_id=body["id"])),
+    ("POST", "/categories/", lambda ctx: {"url": "/categories/", "json": {"name": "N+1 check 2", "position": 1001}},
+     lambda ctx, body: ctx.update(other_category_id=body["id"])),
+    ("GET", "/categories/", lambda ctx: {"url": "/categories/"}, None),
+    ("PUT", "/categories/reorder", lambda ctx: {"url": "/categories/reorder", "json": [
+        {"id": ctx["other_category_id"], "position": 1000}, {"id": ctx["category_id"], "position": 1001}
+    ]}, None),
+    ("PUT", "/categories/{category_id}", lambda ctx: {"url": f"/categories/{ctx['category_id']}",
+                                                      "json": {"color": "#10B981"}}, None),
+
+    ("POST", "/tickets/", lambda ctx: {"url": "/tickets/", "json": {
+        "title": "N+1 check ticket", "category_id": ctx["category_id"], "assigned_user_ids": [ctx["user_id"]]
+    }}, lambda ctx, body: ctx.update(ticket_id=body["id"])),
+    ("POST", "/tickets/bulk", lambda ctx: {"url": "/tickets/bulk", "json": {"operations": [
+        {"op": "create", "title": f"N+1 check bulk {n}", "description": "checkable words",
+         "category_id": ctx["category_id"], "assigned_user_ids": [ctx["user_id"]]}
+        for n in range(TICKETS)
+    ]}}, None),
+    ("GET", "/tickets/", lambda ctx: {"url": "/tickets/", "params": {"category_id": ctx["category_id"], "page_size": 0}}, None),
+    ("GET", "/tickets/", lambda ctx: {"url": "/tickets/", "params": {"category_id": ctx["category_id"], "page_size": 50}}, None),
+    ("GET", "/tickets/", lambda ctx: {"url": "/tickets/", "params": {
+        "category_id": ctx["category_id"], "cursor": "", "page_size": 50
+    }}, None),
+    ("GET", "/tickets/", lambda ctx: {"url": "/tickets/", "params": {
+        "category_id": ctx["category_id"], "cursor": "", "page_size": 50, "view": "card"
+    }}, None),
+    ("GET", "/categories/{category_id}", lambda ctx: {"url": f"/categories/{ctx['category_id']}"}, None),
+    ("GET", "/board", lambda ctx: {"url": "/board"}, None),
+    ("GET", "/tickets/search", lambda ctx: {"url": "/tickets/search", "params": {
+        "q": "checkable", "category_id": ctx["category_id"]
+    }}, None),
+    ("PUT", "/tickets/{ticket_id}", lambda ctx: {"url": f"/tickets/{ctx['ticket_id']}",
+                                                 "json": {"description": "Edited by the N+1 check"}}, None),
+    ("PUT", "/tickets/drag-drop", lambda ctx: {"url": "/tickets/drag-drop", "json": {
+        "ticket_id": ctx["ticket_id"], "target_category_id": ctx["other_category_id"], "target_position": 0
+    }}, None),
+    ("GET", "/tickets/{ticket_id}", lambda ctx: {"url": f"/tickets/{ctx['ticket_id']}"}, None),
+    ("GET", "/tickets/history/all", lambda ctx: {"url": "/tickets/history/all"}, None),
+    ("GET", "/tickets/history/all", lambda ctx: {"url": "/tickets/history/all", "params": {"cursor": ""}}, None),
+    ("DELETE", "/tickets/{ticket_id}", lambda ctx: {"url": f"/tickets/{ctx['ticket_id']}"}, None),
+    ("DELETE", "/categories/{category_id}", lambda ctx: {"url": f"/categories/{ctx['other_category_id']}"}, None),
+    ("GET", "/metrics", lambda ctx: {"url": "/metrics"}, None),
+    ("GET", "/health", lambda ctx: {"url": "/health"}, None),
+    ("POST", "/auth/logout", lambda ctx: {"url": "/auth/logout"}, None),
+]
+
+
+def app_routes() -> List[Tuple[str, str]]:
+    return [(method, route.path) for route in app.routes if isinstance(route, APIRoute) for method in sorted(route.methods)]
+
+
+def unchecked_routes() -> List[str]:
+    """HTTP routes of the app without an entry in CHECKS"""
+    checked = {(method, path) for method, path, _, _ in CHECKS}
+    return [f"{method} {path}" for method, path in app_routes() if (method, path) not in checked]
+
+
+async def run_checks(threshold: int) -> bool:
+    ctx: Context = {"username": f"n1check{uuid.uuid4().hex[:8]}"}
+    # Routes that are switched off (e.g. /metrics with METRICS_ENABLED=false) are skipped
+    routes = set(app_routes())
+    ok = True
+
+    # https so the Secure auth cookies are sent back
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="https://adpm.test")
+    try:
+        for method, path, build, store in CHECKS:
+            if (method, path) not in routes:
+                continue
+
+            request = build(ctx)
+            with track_queries(f"{method} {path}", threshold, mode="collect") as tracker:
+                response = await client.request(method, **request)
+
+            repeated = tracker.repeated()
+            failed = response.status_code >= 400
+            status = f"HTTP {response.status_code}" if failed else "N+1" if repeated else "OK"
+            params = f"?{httpx.QueryParams(request['params'])}" if request.get("params") else ""
+            print(f"{status:<10} {sum(tracker.counts.values()):>4} statements  {method} {path}{params}")
+
+            for shape, count, location in repeated:
+                print(f"    {count}x from {location}\n        {shape}")
+            if failed:
+                print(f"    {response.text[:300]}")
+                if store:
+                    # Later checks need what this one should have created
+                    return False
+            elif store:
+                store(ctx, response.json())
+            ok = ok and status == "OK"
+    finally:
+        await client.aclose()
+        cleanup(ctx["username"])
+
+    return ok
+
+
+def cleanup(username: str):
+    """Delete the check's user; its categories, tickets and history cascade with it"""
+    db = SessionLocal()
+    try:
+        avatar_hash = db.scalar(select(User.avatar_hash).where(User.username == username))
+        db.execute(delete(User.__table__).where(User.__table__.c.username == username))
+        if avatar_hash:
+            db.execute(delete(Avatar.__table__).where(
+                Avatar.__table__.c.hash == avatar_hash, ~exists().where(User.avatar_hash == avatar_hash)
+            ))
+        category_cache.bump(db)
+        board_version.bump(db)
+        db.commit()
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threshold", type=int, default=N_PLUS_ONE_THRESHOLD,
+                        help="runs of one statement shape allowed per request")
+    args = parser.parse_args()
+
+    missing = unchecked_routes()
+    for route in missing:
+        print(f"NO CHECK   {route}")
+
+    ok = asyncio.run(run_checks(args.threshold))
+    sys.exit(0 if ok and not missing else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,17 @@
 from fastapi import HTTPException, Request, status, Depends, Response
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timedelta
 from jose import JWTError, jwt
+import hashlib
 import os
+import time
 
-from .database import get_db
+from models.user import User
+from .cache import TTLCache
+from .database import DB_ASYNC_MODE, get_db, get_async_db
+from .principal import Principal, principal_cache, cache_principal, get_principal
 
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-here")
 ALGORITHM = "HS256"
@@ -23,24 +30,39 @@ def create_refresh_token(data: dict):
     to_encode.update({"exp": expire, "type": "refresh"})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
+# Verified tokens keyed by digest, so a cookie replayed on every request is only
+# verified once per process. Entries never outlive the token's exp claim.
+token_cache = TTLCache(
+    maxsize=int(os.getenv("TOKEN_CACHE_SIZE", 4096)),
+    ttl=float(os.getenv("TOKEN_CACHE_TTL", ACCESS_TOKEN_EXPIRE_MINUTES * 60))
+)
+
 def decode_token(token: str):
+    digest = hashlib.sha256(token.encode()).digest()
+
+    payload = token_cache.get(digest)
+    if payload and payload["exp"] > time.time():
+        return dict(payload)
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
     except JWTError:
         return None
 
-def get_current_user(request: Request, db: Session = Depends(get_db)):
-    """Get current user - middleware handles token refresh"""
-    from models.user import User
-    
-    if hasattr(request.state, 'validated_user') and request.state.validated_user:
-        username = request.state.validated_user
-        user = db.query(User).filter(User.username == username).first()
-        
-        if user:
-            return user
-    
+    expires_in = payload.get("exp", 0) - time.time()
+    if expires_in > 0:
+        token_cache.set(digest, dict(payload), ttl=expires_in)
+
+    return payload
+
+def token_cache_stats() -> dict:
+    return {"hits": token_cache.hits, "misses": token_cache.misses, "size": len(token_cache)}
+
+def _username_from_request(request: Request) -> str:
+    username = getattr(request.state, 'validated_user', None)
+    if username:
+        return username
+
     access_token = request.cookies.get("access_token")
     
     if not access_token:
@@ -50,13 +72,42 @@ def get_current_user(request: Request, db: Session = Depends(get_db)):
     if not payload or payload.get("type") != "access":
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
     
-    username = payload.get("sub")
-    user = db.query(User).filter(User.username == username).first()
+    return payload.get("sub")
+
+def get_current_user(request: Request, db: Session = Depends(get_db)) -> Principal:
+    """Get current user - middleware handles token refresh and may already have resolved the principal"""
+    principal = getattr(request.state, 'principal', None)
+    if principal:
+        return principal
+
+    principal = get_principal(db, _username_from_request(request))
+    
+    if not principal:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
     
+    return principal
+
+async def get_current_user_async(request: Request, db: AsyncSession = Depends(get_async_db)) -> Principal:
+    """Async variant of get_current_user for DB_ASYNC_MODE routes"""
+    principal = getattr(request.state, 'principal', None)
+    if principal:
+        return principal
+
+    username = _username_from_request(request)
+    principal = principal_cache.get(username)
+    if principal:
+        return principal
+
+    result = await db.execute(select(User).where(User.username == username))
+    user = result.scalars().first()
+
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
-    
-    return user
+
+    return cache_principal(user)
+
+# The current user dependency sharing the request's get_session session
+get_session_user = get_current_user_async if DB_ASYNC_MODE else get_current_user
 
 def set_auth_cookies(response: Response, username: str):
     """Set both access and refresh tokens as cookies"""
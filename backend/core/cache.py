@@ -0,0 +1,160 @@
+from collections import OrderedDict
+from sqlalchemy import event, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from threading import Lock
+from typing import Any, Callable, Dict, Hashable, Optional
+import time
+
+from models.cache_version import CacheVersion
+
+# Versions read by a session, so a transaction looks each counter up once
+SESSION_VERSIONS_KEY = "cache_versions"
+# Caches bumped by a session's pending transaction
+SESSION_BUMPS_KEY = "cache_bumps"
+
+
+class TTLCache:
+    """Small thread-safe LRU cache whose entries also expire after a TTL.
+
+    `ttl` is the default lifetime in seconds; `set` can shorten it per entry.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        lifetime = self.ttl if ttl is None else min(ttl, self.ttl)
+        if lifetime <= 0:
+            return
+
+        with self._lock:
+            self._data[key] = (time.monotonic() + lifetime, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, key: Hashable):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class VersionedCache:
+    """Process-local read-through cache invalidated by a counter in cache_versions.
+
+    Writers bump the counter in their own transaction, so every worker drops its
+    entries as soon as it reads the new version. A session reads the version once
+    per transaction; with `max_staleness` set, a process rereads it at most that
+    often and may serve entries up to that many seconds old written by another
+    process. Its own writes are always seen immediately.
+    """
+
+    registry: Dict[str, "VersionedCache"] = {}
+
+    def __init__(self, name: str, maxsize: int = 256, max_staleness: float = 0.0):
+        self.name = name
+        self.maxsize = maxsize
+        self.max_staleness = max_staleness
+        self.version: Optional[int] = None
+        self.checked_at = float("-inf")
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = Lock()
+        VersionedCache.registry[name] = self
+
+    def current_version(self, db: Session) -> int:
+        versions = db.info.setdefault(SESSION_VERSIONS_KEY, {})
+        if self.name in versions:
+            return versions[self.name]
+
+        now = time.monotonic()
+        if self.version is not None and now - self.checked_at < self.max_staleness:
+            version = self.version
+        else:
+            version = db.execute(
+                select(CacheVersion.version).where(CacheVersion.name == self.name)
+            ).scalar() or 0
+            with self._lock:
+                # A reader on an older snapshot must not roll the cache back
+                if self.version is None or version > self.version:
+                    self._data.clear()
+                    self.version = version
+                if version == self.version:
+                    self.checked_at = now
+
+        versions[self.name] = version
+        return version
+
+    def get(self, db: Session, key: Hashable, load: Callable[[], Any]) -> Any:
+        """Cached value for `key` at the current version, calling `load` on a miss"""
+        version = self.current_version(db)
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] == version:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        value = load()
+        with self._lock:
+            if version == self.version:
+                self._data[key] = (version, value)
+                self._data.move_to_end(key)
+                while len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+        return value
+
+    def bump(self, db: Session):
+        """Invalidate the cache everywhere once `db`'s transaction commits"""
+        db.execute(
+            insert(CacheVersion).values(name=self.name, version=1).on_conflict_do_update(
+                index_elements=[CacheVersion.name], set_={"version": CacheVersion.version + 1}
+            )
+        )
+        db.info.get(SESSION_VERSIONS_KEY, {}).pop(self.name, None)
+        db.info.setdefault(SESSION_BUMPS_KEY, set()).add(self.name)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"version": self.version, "entries": len(self._data), "hits": self.hits, "misses": self.misses}
+
+
+@event.listens_for(Session, "after_commit")
+def _expire_bumped_caches(session: Session):
+    session.info.pop(SESSION_VERSIONS_KEY, None)
+    for name in session.info.pop(SESSION_BUMPS_KEY, ()):
+        # Force the next read in this process to fetch the new version
+        VersionedCache.registry[name].checked_at = float("-inf")
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_versions(session: Session):
+    session.info.pop(SESSION_VERSIONS_KEY, None)
+    session.info.pop(SESSION_BUMPS_KEY, None)
@@ -0,0 +1,201 @@
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from threading import Lock, Thread
+from typing import Any, Dict, List, Optional, Set
+import asyncio
+import json
+import logging
+import os
+import select
+import time
+
+from .database import engine
+
+logger = logging.getLogger("app")
+
+# Board change feed. Services queue compact change events on their session and
+# they are published when the transaction commits:
+#   memory:   delivered straight to this process's subscribers after the commit
+#             (single worker, or tests).
+#   postgres: sent with pg_notify inside the transaction, so they go out only if
+#             it commits; every worker LISTENs on the channel with one connection
+#             and fans the events out to its own subscribers.
+CHANGE_FEED_BACKEND = os.getenv("CHANGE_FEED_BACKEND", "memory").lower()
+CHANGE_FEED_CHANNEL = os.getenv("CHANGE_FEED_CHANNEL", "board_changes")
+CHANGE_FEED_QUEUE_SIZE = int(os.getenv("CHANGE_FEED_QUEUE_SIZE", 100))
+
+EVENTS_KEY = "change_events"
+# NOTIFY payloads must stay under 8000 bytes
+MAX_NOTIFY_PAYLOAD = 7900
+RESYNC = {"type": "resync"}
+
+
+def publish_change(db: Session, event_type: str, **fields: Any):
+    """Queue a change event on the session; it is published if the transaction commits"""
+    change = {"type": event_type, **fields, "at": datetime.now(timezone.utc)}
+    db.info.setdefault(EVENTS_KEY, []).append(change)
+
+
+def encode_change(change: Dict[str, Any]) -> str:
+    return json.dumps(change, default=str, separators=(",", ":"))
+
+
+class Subscription:
+    """One connection's bounded event queue.
+
+    A client that falls CHANGE_FEED_QUEUE_SIZE events behind loses its backlog and
+    gets a single resync event instead, so a slow reader costs bounded memory and
+    never holds up the other subscribers.
+    """
+
+    def __init__(self, maxsize: int):
+        self.queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue(maxsize)
+
+    def offer(self, change: Dict[str, Any]):
+        if self.queue.full():
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            change = RESYNC
+        self.queue.put_nowait(change)
+
+    async def get(self) -> Dict[str, Any]:
+        return await self.queue.get()
+
+
+class ChangeHub:
+    """Fans events out to this process's subscribers on the event loop"""
+
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self.subscribers: Set[Subscription] = set()
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.delivered = 0
+
+    @asynccontextmanager
+    async def subscribe(self):
+        self.loop = asyncio.get_running_loop()
+        get_bus().start()
+
+        subscription = Subscription(self.queue_size)
+        self.subscribers.add(subscription)
+        try:
+            yield subscription
+        finally:
+            self.subscribers.discard(subscription)
+
+    def _dispatch(self, changes: List[Dict[str, Any]]):
+        for subscription in list(self.subscribers):
+            for change in changes:
+                subscription.offer(change)
+        self.delivered += len(changes)
+
+    def publish_threadsafe(self, changes: List[Dict[str, Any]]):
+        """Hand events to the loop from any thread; dropped while nobody is subscribed"""
+        if self.loop is None or not self.subscribers or self.loop.is_closed():
+            return
+        self.loop.call_soon_threadsafe(self._dispatch, changes)
+
+
+change_hub = ChangeHub(CHANGE_FEED_QUEUE_SIZE)
+
+
+class MemoryBus:
+    def start(self):
+        pass
+
+    def publish(self, session: Session, changes: List[Dict[str, Any]]):
+        change_hub.publish_threadsafe(changes)
+
+
+class PostgresBus:
+    """pg_notify on commit; a single LISTEN connection per process feeds the hub"""
+
+    def __init__(self, channel: str):
+        self.channel = channel
+        self._thread: Optional[Thread] = None
+        self._lock = Lock()
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = Thread(target=self._listen_forever, name="change-feed-listener", daemon=True)
+                self._thread.start()
+
+    def publish(self, session: Session, changes: List[Dict[str, Any]]):
+        payload = "[" + ",".join(encode_change(change) for change in changes) + "]"
+        if len(payload.encode()) > MAX_NOTIFY_PAYLOAD:
+            payload = "[" + encode_change(RESYNC) + "]"
+        session.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": self.channel, "payload": payload})
+
+    def _listen_forever(self):
+        backoff = 1
+        while True:
+            try:
+                self._listen()
+            except Exception:
+                logger.exception("Change feed listener lost its connection; retrying in %ds", backoff)
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 30)
+                # Events may have been missed while disconnected
+                change_hub.publish_threadsafe([RESYNC])
+
+    def _listen(self):
+        connection = engine.raw_connection().detach()
+        try:
+            dbapi_connection = connection.driver_connection
+            dbapi_connection.autocommit = True
+            with dbapi_connection.cursor() as cursor:
+                cursor.execute(f'LISTEN "{self.channel}"')
+
+            while True:
+                if select.select([dbapi_connection], [], [], 30) == ([], [], []):
+                    continue
+                dbapi_connection.poll()
+                changes = []
+                while dbapi_connection.notifies:
+                    changes.extend(json.loads(dbapi_connection.notifies.pop(0).payload))
+                if changes:
+                    change_hub.publish_threadsafe(changes)
+        finally:
+            connection.close()
+
+
+_bus = None
+_bus_lock = Lock()
+
+
+def get_bus():
+    global _bus
+    with _bus_lock:
+        if _bus is None:
+            _bus = PostgresBus(CHANGE_FEED_CHANNEL) if CHANGE_FEED_BACKEND == "postgres" else MemoryBus()
+        return _bus
+
+
+def change_feed_stats() -> Dict[str, Any]:
+    return {
+        "backend": CHANGE_FEED_BACKEND,
+        "subscribers": len(change_hub.subscribers),
+        "delivered": change_hub.delivered,
+    }
+
+
+@event.listens_for(Session, "before_commit")
+def _notify_changes(session: Session):
+    changes = session.info.get(EVENTS_KEY)
+    if changes and CHANGE_FEED_BACKEND == "postgres":
+        get_bus().publish(session, session.info.pop(EVENTS_KEY))
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_changes(session: Session):
+    changes = session.info.pop(EVENTS_KEY, None)
+    if changes:
+        get_bus().publish(session, changes)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changes(session: Session):
+    session.info.pop(EVENTS_KEY, None)
@@ -0,0 +1,286 @@
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.routing import Match, Router
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import anyio.to_thread
+import os
+import time
+
+from .database import engine, async_engine, pool_wait_observers
+
+# Request metrics served by GET /metrics in the Prometheus text format.
+# Everything is recorded by MetricsMiddleware on the event loop thread, and
+# /metrics renders on that thread too, so the hot path takes no locks. SQL
+# counts and timings are first gathered on the request's own RequestStats,
+# whichever thread runs the handler, and folded in when the response is done.
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+# When set, scrapes must send "Authorization: Bearer <token>". Without a token the
+# endpoint needs a logged-in user, unless METRICS_PUBLIC opts in to open scrapes.
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+METRICS_PUBLIC = os.getenv("METRICS_PUBLIC", "false").lower() == "true"
+# Threadpool peaks cover the current and the previous window of this many seconds,
+# so they don't depend on how often, or by how many scrapers, /metrics is read
+METRICS_PEAK_WINDOW = float(os.getenv("METRICS_PEAK_WINDOW", 60))
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+POOL_WAIT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+METHODS = {"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"}
+# Requests matching no route share one label so scanners can't create series
+UNMATCHED_ROUTE = "unmatched"
+
+
+class Histogram:
+    """Cumulative-bucket histogram; only observed from the event loop thread"""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class RequestStats:
+    """SQL work done for one request"""
+    __slots__ = ("statements", "db_seconds", "pool_wait_seconds")
+
+    def __init__(self):
+        self.statements = 0
+        self.db_seconds = 0.0
+        self.pool_wait_seconds = 0.0
+
+
+class RouteMetrics:
+    def __init__(self):
+        self.in_flight = 0
+        self.responses: Dict[int, int] = {}
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.statements = Histogram(STATEMENT_BUCKETS)
+        self.db_seconds = Histogram(LATENCY_BUCKETS)
+        self.pool_wait = Histogram(POOL_WAIT_BUCKETS)
+
+    def observe(self, seconds: float, status_code: int, stats: RequestStats):
+        self.responses[status_code] = self.responses.get(status_code, 0) + 1
+        self.latency.observe(seconds)
+        self.statements.observe(stats.statements)
+        self.db_seconds.observe(stats.db_seconds)
+        self.pool_wait.observe(stats.pool_wait_seconds)
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.routes: Dict[Tuple[str, str], RouteMetrics] = {}
+        # Busiest the threadpool was seen by a request, as (busy, waiting), in the
+        # current peak window and in the one before it
+        self.window_started = time.monotonic()
+        self.threadpool_peaks = (0, 0)
+        self.previous_threadpool_peaks = (0, 0)
+
+    def route(self, method: str, path: str) -> RouteMetrics:
+        metrics = self.routes.get((method, path))
+        if metrics is None:
+            metrics = self.routes[(method, path)] = RouteMetrics()
+        return metrics
+
+    def _roll_window(self):
+        now = time.monotonic()
+        elapsed = now - self.window_started
+        if elapsed < METRICS_PEAK_WINDOW:
+            return
+        # A window with no requests at all leaves nothing to carry over
+        self.previous_threadpool_peaks = self.threadpool_peaks if elapsed < 2 * METRICS_PEAK_WINDOW else (0, 0)
+        self.threadpool_peaks = (0, 0)
+        self.window_started = now
+
+    def sample_threadpool(self):
+        self._roll_window()
+        limiter = anyio.to_thread.current_default_thread_limiter()
+        busy, waiting = self.threadpool_peaks
+        self.threadpool_peaks = (max(busy, limiter.borrowed_tokens),
+                                 max(waiting, limiter.statistics().tasks_waiting))
+
+    def threadpool_peak(self) -> Tuple[int, int]:
+        """(busy, waiting) peaks over the last one to two windows; reading them resets nothing"""
+        self._roll_window()
+        return (max(self.threadpool_peaks[0], self.previous_threadpool_peaks[0]),
+                max(self.threadpool_peaks[1], self.previous_threadpool_peaks[1]))
+
+
+registry = MetricsRegistry()
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.statements += 1
+        context._metrics_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _request_stats.get()
+    started = getattr(context, "_metrics_started", None)
+    if stats is not None and started is not None:
+        stats.db_seconds += time.perf_counter() - started
+
+
+def _record_pool_wait(seconds: float):
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.pool_wait_seconds += seconds
+
+
+def instrument_engine(target: Engine):
+    event.listen(target, "before_cursor_execute", _before_cursor_execute)
+    event.listen(target, "after_cursor_execute", _after_cursor_execute)
+
+
+if METRICS_ENABLED:
+    pool_wait_observers.append(_record_pool_wait)
+    instrument_engine(engine)
+    if async_engine is not None:
+        instrument_engine(async_engine.sync_engine)
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording latency, in-flight requests and SQL work per route.
+
+    The route is resolved up front against the app's router, so in-flight gauges
+    carry the route template (/tickets/{ticket_id}) rather than the raw path.
+    """
+
+    def __init__(self, app: ASGIApp, router: Router):
+        self.app = app
+        self.router = router
+
+    def _route(self, scope: Scope) -> str:
+        partial = None
+        for route in self.router.routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return route.path
+            if match == Match.PARTIAL and partial is None:
+                partial = route.path
+        return partial or UNMATCHED_ROUTE
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"] if scope["method"] in METHODS else "OTHER"
+        metrics = registry.route(method, self._route(scope))
+        registry.sample_threadpool()
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        status_code = 500
+
+        async def send_with_status(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        metrics.in_flight += 1
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            metrics.in_flight -= 1
+            metrics.observe(time.perf_counter() - started, status_code, stats)
+            _request_stats.reset(token)
+
+
+def pool_stats() -> Dict[str, Dict[str, int]]:
+    pools = {"sync": engine.pool}
+    if async_engine is not None:
+        pools["async"] = async_engine.pool
+
+    return {
+        name: {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            # Connections opened beyond the pool size; QueuePool counts up from -size
+            "overflow": max(pool.overflow(), 0),
+        }
+        for name, pool in pools.items() if hasattr(pool, "checkedout")
+    }
+
+
+def threadpool_stats() -> Dict[str, int]:
+    """Worker threads for sync routes; call on the event loop"""
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    busy_peak, waiting_peak = registry.threadpool_peak()
+    return {
+        "limit": int(limiter.total_tokens),
+        "busy": limiter.borrowed_tokens,
+        "waiting": limiter.statistics().tasks_waiting,
+        "busy_peak": busy_peak,
+        "waiting_peak": waiting_peak,
+    }
+
+
+def _labels(**labels: Any) -> str:
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for value in labels.values())
+    return ",".join(f'{name}="{value}"' for name, value in zip(labels, escaped))
+
+
+def _histogram_lines(lines: List[str], name: str, labels: str, histogram: Histogram):
+    cumulative = 0
+    for bound, count in zip((*histogram.buckets, "+Inf"), histogram.counts):
+        cumulative += count
+        lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+    lines.append(f"{name}_sum{{{labels}}} {histogram.sum}")
+    lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+
+
+def render_metrics(components: Dict[str, Dict[str, Any]]) -> str:
+    """Prometheus text exposition of the request metrics, pool and threadpool
+    gauges, and `components`: stats dicts exported as adpm_<component>_<key>
+    gauges (string values become labels of adpm_<component>_info)."""
+    lines: List[str] = []
+    routes = sorted(registry.routes.items())
+
+    lines.append("# TYPE adpm_http_requests_total counter")
+    for (method, route), metrics in routes:
+        for status_code, count in sorted(metrics.responses.items()):
+            lines.append(f"adpm_http_requests_total{{{_labels(method=method, route=route, status=status_code)}}} {count}")
+
+    lines.append("# TYPE adpm_http_requests_in_flight gauge")
+    for (method, route), metrics in routes:
+        lines.append(f"adpm_http_requests_in_flight{{{_labels(method=method, route=route)}}} {metrics.in_flight}")
+
+    for name, attribute in (("adpm_http_request_duration_seconds", "latency"),
+                            ("adpm_http_request_sql_statements", "statements"),
+                            ("adpm_http_request_db_seconds", "db_seconds"),
+                            ("adpm_http_request_pool_wait_seconds", "pool_wait")):
+        lines.append(f"# TYPE {name} histogram")
+        for (method, route), metrics in routes:
+            _histogram_lines(lines, name, _labels(method=method, route=route), getattr(metrics, attribute))
+
+    for pool, stats in pool_stats().items():
+        for key, value in stats.items():
+            lines.append(f"adpm_db_pool_{key}{{{_labels(pool=pool)}}} {value}")
+
+    for key, value in threadpool_stats().items():
+        lines.append(f"adpm_threadpool_{key} {value}")
+
+    for component, stats in components.items():
+        info = {key: value for key, value in stats.items() if isinstance(value, str)}
+        if info:
+            lines.append(f"adpm_{component}_info{{{_labels(**info)}}} 1")
+        for key, value in stats.items():
+            if isinstance(value, (int, float)):
+                lines.append(f"adpm_{component}_{key} {int(value) if isinstance(value, bool) else value}")
+
+    return "\n".join(lines) + "\n"
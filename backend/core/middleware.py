@@ -1,95 +1,135 @@
-from fastapi import Request, Response, HTTPException, status
+from fastapi import Response, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
-from sqlalchemy.orm import Session
-from typing import Optional
-from models.user import User
+from starlette.datastructures import MutableHeaders
+from starlette.requests import cookie_parser
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from starlette.websockets import WebSocketClose
+from typing import Dict
 import re
 
-from .database import SessionLocal
+from .database import db_session
 from .auth import decode_token, create_access_token, ACCESS_TOKEN_EXPIRE_MINUTES
+from .principal import principal_cache, get_principal
+from .metrics import METRICS_PUBLIC, METRICS_TOKEN
 
+# Routes that don't require authentication, matched with a single precompiled pattern
+PUBLIC_ROUTES = re.compile(r'^(?:/auth/login|/auth/register|/openapi\.json|/)$|^/(?:docs|redoc)')
+# Scrapers don't log in: /metrics skips cookie auth when its own route checks
+# METRICS_TOKEN, or when open scrapes are explicitly allowed
+METRICS_ROUTE = "/metrics"
+METRICS_SKIPS_LOGIN = bool(METRICS_TOKEN) or METRICS_PUBLIC
 
-class AuthMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app):
-        super().__init__(app)
-        # Routes that don't require authentication
-        self.public_routes = [
-            r'^/auth/login$',
-            r'^/auth/register$',
-            r'^/docs.*',
-            r'^/openapi\.json$',
-            r'^/redoc.*',
-            r'^/$'
-        ]
+
+class AuthMiddleware:
+    """Pure ASGI authentication middleware.
+
+    Validates the access token cookie, falls back to the refresh token (issuing a
+    new access token cookie on the response) and exposes the username to handlers
+    as `request.state.validated_user`, along with the cached principal in
+    `request.state.principal` when it is already known. WebSocket handshakes are
+    authenticated the same way but can't receive a refreshed cookie.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
 
     def is_public_route(self, path: str) -> bool:
         """Check if the route is public (doesn't require authentication)"""
-        for pattern in self.public_routes:
-            if re.match(pattern, path):
-                return True
-        return False
-
-    async def dispatch(self, request: Request, call_next):
-        if request.method == "OPTIONS":
-            return await call_next(request)
-            
-        if self.is_public_route(request.url.path):
-            return await call_next(request)
-
-        access_token = request.cookies.get("access_token")
-        refresh_token = request.cookies.get("refresh_token")
-
-        if not access_token and not refresh_token:
-            return JSONResponse(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                content={"detail": "Not authenticated"}
-            )
-
-        valid_user = None
-        new_access_token = None
+        if path == METRICS_ROUTE:
+            return METRICS_SKIPS_LOGIN
+        return PUBLIC_ROUTES.match(path) is not None
+
+    @staticmethod
+    def _cookies(scope: Scope) -> Dict[str, str]:
+        for name, value in scope["headers"]:
+            if name == b"cookie":
+                return cookie_parser(value.decode("latin-1"))
+        return {}
+
+    @staticmethod
+    def _load_principal(username: str):
+        with db_session() as db:
+            return get_principal(db, username)
+
+    async def _resolve_user(self, cookies: Dict[str, str]):
+        """Return (username, principal, new_access_token) for the request's cookies"""
+        access_token = cookies.get("access_token")
+        refresh_token = cookies.get("refresh_token")
 
         if access_token:
             payload = decode_token(access_token)
 
             if payload and payload.get("type") == "access":
-                valid_user = payload.get("sub")
+                username = payload.get("sub")
+                return username, principal_cache.get(username), None
 
-        if not valid_user and refresh_token:
+        if refresh_token:
             payload = decode_token(refresh_token)
 
             if payload and payload.get("type") == "refresh":
                 username = payload.get("sub")
-                db = SessionLocal()
+                principal = principal_cache.get(username) or await run_in_threadpool(self._load_principal, username)
 
-                try:
-                    user = db.query(User).filter(User.username == username).first()
+                if principal:
+                    return username, principal, create_access_token({"sub": username})
 
-                    if user:
-                        valid_user = username
-                        new_access_token = create_access_token({"sub": username})
-                finally:
-                    db.close()
+        return None, None, None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] == "websocket":
+            await self._authenticate_websocket(scope, receive, send)
+            return
+
+        if scope["type"] != "http" or scope["method"] == "OPTIONS" or self.is_public_route(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        valid_user, principal, new_access_token = await self._resolve_user(self._cookies(scope))
 
         if not valid_user:
-            return JSONResponse(
+            response = JSONResponse(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 content={"detail": "Not authenticated"}
             )
+            await response(scope, receive, send)
+            return
+
+        state = scope.setdefault("state", {})
+        state["validated_user"] = valid_user
+        state["principal"] = principal
+        state["token_refreshed"] = bool(new_access_token)
+
+        if not new_access_token:
+            await self.app(scope, receive, send)
+            return
+
+        cookie = Response()
+        cookie.set_cookie(
+            key="access_token",
+            value=new_access_token,
+            max_age=ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+            httponly=True,
+            secure=True,
+            samesite="lax"
+        )
+        set_cookie_header = cookie.headers["set-cookie"]
+
+        async def send_with_cookie(message: Message):
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("set-cookie", set_cookie_header)
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
+
+    async def _authenticate_websocket(self, scope: Scope, receive: Receive, send: Send):
+        valid_user, principal, _ = await self._resolve_user(self._cookies(scope))
 
-        request.state.validated_user = valid_user
-        request.state.token_refreshed = bool(new_access_token)
-
-        response = await call_next(request)
-
-        if new_access_token:
-            response.set_cookie(
-                key="access_token",
-                value=new_access_token,
-                max_age=ACCESS_TOKEN_EXPIRE_MINUTES * 60,
-                httponly=True,
-                secure=True,
-                samesite="lax"
-            )
+        if not valid_user:
+            await WebSocketClose(code=status.WS_1008_POLICY_VIOLATION)(scope, receive, send)
+            return
 
-        return response
+        state = scope.setdefault("state", {})
+        state["validated_user"] = valid_user
+        state["principal"] = principal
+        await self.app(scope, receive, send)
@@ -0,0 +1,58 @@
+from dataclasses import dataclass
+from sqlalchemy.orm import Session
+from typing import Optional
+import os
+import uuid
+
+from models.user import User
+from .cache import TTLCache
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Immutable snapshot of the authenticated user, safe to share between requests"""
+    id: uuid.UUID
+    username: str
+    email: str
+    first_name: Optional[str]
+    last_name: Optional[str]
+    avatar_hash: Optional[str]
+    is_active: bool
+
+
+principal_cache = TTLCache(
+    maxsize=int(os.getenv("PRINCIPAL_CACHE_SIZE", 1024)),
+    ttl=float(os.getenv("PRINCIPAL_CACHE_TTL", 60))
+)
+
+
+def principal_from_user(user: User) -> Principal:
+    return Principal(
+        id=user.id,
+        username=user.username,
+        email=user.email,
+        first_name=user.first_name,
+        last_name=user.last_name,
+        avatar_hash=user.avatar_hash,
+        is_active=bool(user.is_active)
+    )
+
+
+def cache_principal(user: User) -> Principal:
+    principal = principal_from_user(user)
+    principal_cache.set(user.username, principal)
+    return principal
+
+
+def get_principal(db: Session, username: str) -> Optional[Principal]:
+    """Cached principal for a username, loading it from the users table on a miss"""
+    principal = principal_cache.get(username)
+    if principal:
+        return principal
+
+    user = db.query(User).filter(User.username == username).first()
+    return cache_principal(user) if user else None
+
+
+def invalidate_principal(username: str):
+    principal_cache.invalidate(username)
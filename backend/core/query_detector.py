@@ -0,0 +1,160 @@
+from sqlalchemy import event
+from starlette.types import ASGIApp, Receive, Scope, Send
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from threading import Lock
+from typing import Dict, Iterator, List, Optional, Tuple
+import logging
+import os
+import re
+import traceback
+
+from .database import engine, async_engine
+
+logger = logging.getLogger("app")
+
+# N+1 query detection for development and test runs. Statements run while a
+# request is tracked are grouped by shape (the SQL with literals and bind
+# parameters stripped), and a shape running more than N_PLUS_ONE_THRESHOLD times
+# in one request is reported with the route and the app code that issued it:
+#   off:   no tracking (the default; nothing is hooked into the engines)
+#   log:   warn once per shape and request
+#   raise: fail the statement with RepeatedQueryError, so the request returns 500
+N_PLUS_ONE_DETECTION = os.getenv("N_PLUS_ONE_DETECTION", "off").lower()
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", 5))
+
+APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# App frames reported for a repeated statement, innermost first
+STACK_DEPTH = 3
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_PARAMETER = re.compile(r"%\(\w+\)s|%s|\$\d+")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_VALUE_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+class RepeatedQueryError(RuntimeError):
+    pass
+
+
+@lru_cache(maxsize=2048)
+def statement_shape(statement: str) -> str:
+    """The statement with values replaced by ? and IN lists collapsed to (?)"""
+    shape = _STRING.sub("?", statement)
+    shape = _PARAMETER.sub("?", shape)
+    shape = _NUMBER.sub("?", shape)
+    shape = _VALUE_LIST.sub("(?)", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+def app_location() -> str:
+    """The innermost app frames of the current stack (skipping libraries and this module)"""
+    frames = []
+    for frame in reversed(traceback.extract_stack()):
+        if (frame.filename.startswith(APP_ROOT) and frame.filename != __file__
+                and "site-packages" not in frame.filename):
+            frames.append(f"{os.path.relpath(frame.filename, APP_ROOT)}:{frame.lineno} in {frame.name}")
+            if len(frames) == STACK_DEPTH:
+                break
+    return " <- ".join(frames) or "unknown"
+
+
+class QueryTracker:
+    """Statement shapes run for one request or tracked block"""
+
+    def __init__(self, label: str, threshold: int, mode: str, scope: Optional[Scope] = None):
+        self.label = label
+        self.threshold = threshold
+        self.mode = mode
+        self.scope = scope
+        self.counts: Dict[str, int] = {}
+        self.locations: Dict[str, str] = {}
+
+    @property
+    def route(self) -> str:
+        # FastAPI stores the matched route in the scope once routing is done
+        route = self.scope.get("route") if self.scope else None
+        return f"{self.scope['method']} {route.path}" if route else self.label
+
+    def record(self, statement: str):
+        shape = statement_shape(statement)
+        count = self.counts.get(shape, 0) + 1
+        self.counts[shape] = count
+        if count != self.threshold + 1:
+            return
+
+        self.locations[shape] = app_location()
+        message = (f"N+1 query: {self.route} ran this statement more than {self.threshold} times, "
+                   f"from {self.locations[shape]}: {shape}")
+        if self.mode == "raise":
+            raise RepeatedQueryError(message)
+        if self.mode == "log":
+            logger.warning(message)
+
+    def repeated(self) -> List[Tuple[str, int, str]]:
+        """(shape, count, location) of every shape that ran more than the threshold"""
+        return sorted(
+            ((shape, count, self.locations[shape]) for shape, count in self.counts.items() if count > self.threshold),
+            key=lambda item: -item[1]
+        )
+
+
+_tracker: ContextVar[Optional[QueryTracker]] = ContextVar("query_tracker", default=None)
+_installed = False
+_install_lock = Lock()
+
+
+def _record_statement(conn, cursor, statement, parameters, context, executemany):
+    tracker = _tracker.get()
+    if tracker is not None:
+        tracker.record(statement)
+
+
+def install():
+    """Hook the sync engine, and the async engine when enabled; safe to call repeatedly"""
+    global _installed
+    with _install_lock:
+        if _installed:
+            return
+        event.listen(engine, "before_cursor_execute", _record_statement)
+        if async_engine is not None:
+            event.listen(async_engine.sync_engine, "before_cursor_execute", _record_statement)
+        _installed = True
+
+
+@contextmanager
+def track_queries(label: str, threshold: int = N_PLUS_ONE_THRESHOLD, mode: str = "log",
+                  scope: Optional[Scope] = None) -> Iterator[QueryTracker]:
+    """Track the statements run inside the block, e.g. from a test fixture:
+
+        with track_queries("GET /tickets/", mode="raise"):
+            client.get("/tickets/")
+
+    mode is log, raise, or collect to only gather the counts for tracker.repeated().
+    """
+    install()
+    tracker = QueryTracker(label, threshold, mode, scope)
+    token = _tracker.set(tracker)
+    try:
+        yield tracker
+    finally:
+        _tracker.reset(token)
+
+
+class QueryDetectorMiddleware:
+    """Pure ASGI middleware tracking every HTTP request when N_PLUS_ONE_DETECTION is on"""
+
+    def __init__(self, app: ASGIApp, threshold: int = N_PLUS_ONE_THRESHOLD, mode: str = N_PLUS_ONE_DETECTION):
+        self.app = app
+        self.threshold = threshold
+        self.mode = mode
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries(f"{scope['method']} {scope['path']}", self.threshold, self.mode, scope):
+            await self.app(scope, receive, send)
@@ -1,9 +1,15 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from core.middleware import AuthMiddleware
+from core.metrics import METRICS_ENABLED, MetricsMiddleware
+from core.query_detector import N_PLUS_ONE_DETECTION, QueryDetectorMiddleware
+from routes.users import router as users_router
+from routes.events import router as events_router
+from routes.metrics import router as metrics_router
 from routes.auth import router as auth_router
 from routes.categories import router as categories_router
 from routes.tickets import router as tickets_router
-from core.middleware import AuthMiddleware
+from routes.board import router as board_router
 
 app = FastAPI()
 
@@ -21,9 +27,22 @@ app.add_middleware(
 
 app.add_middleware(AuthMiddleware)
 
+if N_PLUS_ONE_DETECTION in ("log", "raise"):
+    app.add_middleware(QueryDetectorMiddleware)
+
+# Added last so it is outermost and its timings include authentication
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware, router=app.router)
+
 app.include_router(auth_router)
 app.include_router(categories_router)
 app.include_router(tickets_router)
+app.include_router(board_router)
+app.include_router(users_router)
+app.include_router(events_router)
+
+if METRICS_ENABLED:
+    app.include_router(metrics_router)
 
 @app.get("/health")
 def health():
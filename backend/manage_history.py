@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Ticket history partition maintenance for ADPM (Advanced Project Management)
+Creates the upcoming monthly partitions of ticket_history and applies the
+retention policy. Meant to run daily from cron or a scheduler:
+    python manage_history.py maintain
+    python manage_history.py partitions --months-ahead 6
+    python manage_history.py retain --keep-months 12 --archive-dir /var/backups/adpm
+"""
+
+import argparse
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.database import SessionLocal
+from services.history_partitions import (
+    HISTORY_PARTITION_MONTHS_AHEAD, HISTORY_RETENTION_MONTHS, HISTORY_ARCHIVE_DIR,
+    ensure_partitions, apply_retention, list_partitions
+)
+
+
+def create_partitions(db, args):
+    created = ensure_partitions(db, args.months_ahead)
+    print(f"Created {len(created)} partition(s): {', '.join(created) or '-'}")
+
+
+def retain(db, args):
+    archived = apply_retention(db, args.keep_months, args.archive_dir, drop=not args.keep_detached)
+    print(f"Archived {len(archived)} partition(s): {', '.join(archived) or '-'}")
+
+
+def maintain(db, args):
+    create_partitions(db, args)
+    retain(db, args)
+
+
+def show(db, args):
+    for month, name in sorted(list_partitions(db).items()):
+        print(f"{month:%Y-%m}  {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["maintain", "partitions", "retain", "list"])
+    parser.add_argument("--months-ahead", type=int, default=HISTORY_PARTITION_MONTHS_AHEAD)
+    parser.add_argument("--keep-months", type=int, default=HISTORY_RETENTION_MONTHS,
+                        help="Archive partitions older than this many months; 0 disables retention")
+    parser.add_argument("--archive-dir", default=HISTORY_ARCHIVE_DIR)
+    parser.add_argument("--keep-detached", action="store_true", help="Detach archived partitions without dropping them")
+    args = parser.parse_args()
+
+    commands = {"maintain": maintain, "partitions": create_partitions, "retain": retain, "list": show}
+
+    db = SessionLocal()
+    try:
+        commands[args.command](db, args)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, String, DateTime, LargeBinary
+from sqlalchemy.sql import func
+
+from core.database import Base
+
+class Avatar(Base):
+    """Content-addressed profile image store, keyed by the SHA-256 of the original bytes"""
+    __tablename__ = "avatars"
+
+    hash = Column(String(64), primary_key=True)
+    content_type = Column(String(50), nullable=False)
+    data = Column(LargeBinary, nullable=False)
+    thumbnail = Column(LargeBinary, nullable=False)
+    thumbnail_content_type = Column(String(50), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,10 @@
+from sqlalchemy import Column, String, BigInteger
+
+from core.database import Base
+
+class CacheVersion(Base):
+    """Version counter of a process-local cache; writers bump it to invalidate every worker's copy"""
+    __tablename__ = "cache_versions"
+
+    name = Column(String(50), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
@@ -19,7 +19,7 @@ class Category(Base):
 
     # Relationships
     user = relationship("User", back_populates="categories")
-    tickets = relationship("Ticket", back_populates="category", cascade="all, delete-orphan")
+    tickets = relationship("Ticket", back_populates="category", cascade="all, delete-orphan", order_by="[Ticket.position, Ticket.id]")
 
     def __repr__(self):
         return f"<Category(id={self.id}, name='{self.name}', user_id={self.user_id})>"
@@ -1,7 +1,7 @@
 import uuid
-from sqlalchemy import Column, String, Text, Integer, DateTime, ForeignKey, Table
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, Text, Integer, BigInteger, DateTime, ForeignKey, Table, Computed
+from sqlalchemy.dialects.postgresql import UUID, TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
 from core.database import Base
 
@@ -20,11 +20,18 @@ class Ticket(Base):
     title = Column(String(255), nullable=False)
     description = Column(Text)
     expiry_date = Column(DateTime(timezone=True), nullable=True)
-    position = Column(Integer, nullable=False, default=0)
+    position = Column(BigInteger, nullable=False, default=0)  # sparse, see utils/positions.py
+    history_seq = Column(Integer, nullable=False, default=0, server_default="0")  # history rows written so far
     category_id = Column(UUID(as_uuid=True), ForeignKey("categories.id", ondelete="CASCADE"), nullable=False)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    # Full-text search document, maintained by Postgres; only search queries read it
+    search_vector = deferred(Column(TSVECTOR, Computed(
+        "setweight(to_tsvector('english'::regconfig, coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('english'::regconfig, coalesce(description, '')), 'B')",
+        persisted=True
+    )))
 
     # Relationships
     user = relationship("User", back_populates="tickets")
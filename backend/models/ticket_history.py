@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Text
+from sqlalchemy import Column, String, DateTime, ForeignKey, Text, Boolean, true
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -8,6 +8,8 @@ from core.database import Base
 
 class TicketHistory(Base):
     __tablename__ = "ticket_history"
+    # Range partitioned by month; partitions are managed by manage_history.py
+    __table_args__ = {"postgresql_partition_by": "RANGE (created_at)"}
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     ticket_id = Column(UUID(as_uuid=True), ForeignKey("tickets.id", ondelete="CASCADE"), nullable=False)
@@ -17,7 +19,9 @@ class TicketHistory(Base):
     new_values = Column(JSONB, nullable=True)
     from_category_name = Column(String(100), nullable=True)
     to_category_name = Column(String(100), nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    # False: old_values/new_values hold only the changed keys (see utils.history_diff)
+    is_checkpoint = Column(Boolean, nullable=False, server_default=true())
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), primary_key=True)
 
     # Relationships
     ticket = relationship("Ticket", back_populates="history")
@@ -1,44 +1,51 @@
 from fastapi import APIRouter, Depends, HTTPException, Response, Request, status
-from sqlalchemy.orm import Session
+from fastapi.concurrency import run_in_threadpool
 from typing import List
 from schemas import UserCreate, UserOut, UserLogin
 from schemas import Token
 from schemas.user import UserAssigned, UserUpdate
-from core.database import get_db
-from core.auth import get_current_user, set_auth_cookies, clear_auth_cookies
-from services.auth_service import create_user, authenticate_user
-from services.user_service import UserService
+from core.database import DbSession, get_session
+from core.auth import get_session_user, set_auth_cookies, clear_auth_cookies
+from services.auth_service import get_user_by_username, get_user_by_email, add_user
+from services.async_services import AsyncUserService, run_session
 from models.user import User
+from utils.security import verify_password, get_password_hash
 from utils.logger import log_request
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
+# bcrypt is CPU bound, so hashing and verification go to the threadpool rather
+# than running on the event loop.
+
 @router.post("/register", response_model=UserOut)
-def register(request: Request, user: UserCreate, db: Session = Depends(get_db)):
+async def register(request: Request, user: UserCreate, db: DbSession = Depends(get_session)):
     log_request(request, user.dict())
 
-    created = create_user(db, user.email, user.username, user.password)
-
-    if not created:
+    taken = await run_session(
+        db, lambda s: get_user_by_username(s, user.username) or get_user_by_email(s, user.email)
+    )
+    if taken:
         raise HTTPException(status_code=400, detail="Username or email already registered")
-    
-    return created
+
+    hashed_password = await run_in_threadpool(get_password_hash, user.password)
+
+    return await run_session(db, lambda s: add_user(s, user.email, user.username, hashed_password), UserOut)
 
 @router.post("/login", response_model=Token)
-def login(request: Request, response: Response, user: UserLogin, db: Session = Depends(get_db)):
+async def login(request: Request, response: Response, user: UserLogin, db: DbSession = Depends(get_session)):
     log_request(request, user.dict())
 
-    user_obj = authenticate_user(db, user.username, user.password)
+    user_obj = await run_session(db, lambda s: get_user_by_username(s, user.username))
 
-    if not user_obj:
+    if not user_obj or not await run_in_threadpool(verify_password, user.password, user_obj.hashed_password):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Incorrect username or password")
-    
+
     set_auth_cookies(response, user_obj.username)
 
     return {"access_token": "set_in_cookie", "token_type": "bearer"}
 
 @router.post("/logout")
-def logout(request: Request, response: Response):
+async def logout(request: Request, response: Response):
     log_request(request, {})
 
     clear_auth_cookies(response)
@@ -46,36 +53,41 @@ def logout(request: Request, response: Response):
     return {"message": "Logged out"}
 
 @router.get("/me", response_model=UserOut)
-def get_me(request: Request, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+async def get_me(request: Request, current_user: User = Depends(get_session_user)):
     log_request(request, {})
     return current_user
 
 @router.put("/me", response_model=UserOut)
-def update_me(
+async def update_me(
     request: Request,
     user_update: UserUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: DbSession = Depends(get_session),
+    current_user: User = Depends(get_session_user)
 ):
     """Update current user profile"""
     log_request(request, user_update.model_dump(exclude_unset=True))
-    
-    user_service = UserService(db)
-    updated_user = user_service.update_user(current_user.id, user_update)
-    
+
+    user_service = AsyncUserService(db)
+    try:
+        updated_user = await user_service.update_user(current_user.id, user_update)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
     if not updated_user:
         raise HTTPException(status_code=404, detail="User not found")
-    
+
     return updated_user
 
 @router.get("/users", response_model=List[UserAssigned])
-def get_all_users(
+async def get_all_users(
     request: Request,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: DbSession = Depends(get_session),
+    current_user: User = Depends(get_session_user)
 ):
     """Get all users for assignment purposes"""
     log_request(request, {})
-    
-    users = db.query(User).filter(User.is_active == True).all()
-    return users 
\ No newline at end of file
+
+    return await run_session(
+        db, lambda s: s.query(User).filter(User.is_active == True).all(), List[UserAssigned]
+    )
+
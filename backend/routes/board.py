@@ -0,0 +1,33 @@
+from fastapi import APIRouter, Depends, Request, Response
+
+from schemas import BoardOut
+from core.database import DbSession, get_session
+from core.auth import get_session_user
+from services.async_services import AsyncBoardService
+from models.user import User
+from utils.http_cache import make_etag, etag_matches
+from utils.logger import log_request
+
+router = APIRouter(prefix="/board", tags=["board"])
+
+@router.get("", response_model=BoardOut)
+async def get_board(
+    request: Request,
+    response: Response,
+    db: DbSession = Depends(get_session),
+    current_user: User = Depends(get_session_user)
+):
+    """Get all categories with their tickets and assignees in one round trip"""
+    log_request(request, {})
+
+    board_service = AsyncBoardService(db)
+    version = await board_service.get_version()
+    etag = make_etag(version)
+
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+
+    return await board_service.get_board(version)
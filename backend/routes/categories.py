@@ -1,72 +1,91 @@
-from fastapi import APIRouter, Depends, HTTPException, Request, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from typing import List, Optional
 import uuid
 
 from schemas import CategoryCreate, CategoryUpdate, CategoryOut, CategoryWithTickets, CategoryReorder
-from core.database import get_db
-from core.auth import get_current_user
-from services.category_service import CategoryService
+from core.database import DbSession, get_session
+from core.auth import get_session_user
+from services.async_services import AsyncCategoryService
 from models.user import User
+from services.ticket_service import resolve_ticket_fields
+from utils.http_cache import make_etag, etag_matches
+from utils.json_response import ORJSONResponse
 from utils.logger import log_request
 
 router = APIRouter(prefix="/categories", tags=["categories"])
 
 @router.post("/", response_model=CategoryOut)
-def create_category(
+async def create_category(
     request: Request, 
     category: CategoryCreate, 
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: DbSession = Depends(get_session),
+    current_user: User = Depends(get_session_user)
 ):
     log_request(request, category.model_dump())
     
-    category_service = CategoryService(db)
-    created_category = category_service.create_category(category, current_user.id)
+    category_service = AsyncCategoryService(db)
+    created_category = await category_service.create_category(category, current_user.id)
     
     return created_category
 
 @router.get("/", response_model=List[CategoryOut])
-def get_categories(
+async def get_categories(
     request: Request,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    response: Response,
+    db: DbSession = Depends(get_session),
+    current_user: User = Depends(get_session_user)
 ):
     log_request(request, {})
     
-    category_service = CategoryService(db)
-    categories = category_service.get_categories(current_user.id)
+    category_service = AsyncCategoryService(db)
+    version = await category_service.get_version()
+    etag = make_etag(f"categories-{version}")
+
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+
+    categories = await category_service.get_categories(current_user.id)
     
     return categories
 
 @router.get("/{category_id}", response_model=CategoryWithTickets)
-def get_category(
+async def get_category(
     request: Request,
     category_id: uuid.UUID,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    view: str = Query("full", pattern="^(card|full)$", description="card: only the fields a board card shows"),
+    fields: Optional[str] = Query(None, description="Comma-separated ticket fields to return; overrides view"),
+    db: DbSession = Depends(get_session),
+    current_user: User = Depends(get_session_user)
 ):
-    log_request(request, {"category_id": str(category_id)})
+    log_request(request, {"category_id": str(category_id), "view": view, "fields": fields})
+
+    try:
+        selected_fields = resolve_ticket_fields(view, fields)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
     
-    category_service = CategoryService(db)
-    category = category_service.get_category(category_id)
+    category_service = AsyncCategoryService(db)
+    category = await category_service.get_category(category_id, selected_fields)
     
     if not category:
         raise HTTPException(status_code=404, detail="Category not found")
     
-    return category
+    return category if selected_fields is None else ORJSONResponse(category)
 
 @router.put("/reorder")
-def reorder_categories(
+async def reorder_categories(
     request: Request,
     category_positions: List[CategoryReorder],
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: DbSession = Depends(get_session),
+    current_user: User = Depends(get_session_user)
 ):
     log_request(request, {"category_positions": category_positions})
     
-    category_service = CategoryService(db)
-    success = category_service.reorder_categories(category_positions)
+    category_service = AsyncCategoryService(db)
+    success = await category_service.reorder_categories(category_positions)
     
     if not success:
         raise HTTPException(status_code=400, detail="Failed to reorder categories")
@@ -74,17 +93,17 @@ def reorder_categories(
     return {"message": "Categories reordered successfully"}
 
 @router.put("/{category_id}", response_model=CategoryOut)
-def update_category(
+async def update_category(
     request: Request,
     category_id: uuid.UUID,
     category_update: CategoryUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: DbSession = Depends(get_session),
+    current_user: User = Depends(get_session_user)
 ):
     log_request(request, {"category_id": str(category_id), **category_update.model_dump()})
     
-    category_service = CategoryService(db)
-    updated_category = category_service.update_category(category_id, category_update)
+    category_service = AsyncCategoryService(db)
+    updated_category = await category_service.update_category(category_id, category_update)
     
     if not updated_category:
         raise HTTPException(status_code=404, detail="Category not found")
@@ -92,16 +111,16 @@ def update_category(
     return updated_category
 
 @router.delete("/{category_id}")
-def delete_category(
+async def delete_category(
     request: Request,
     category_id: uuid.UUID,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: DbSession = Depends(get_session),
+    current_user: User = Depends(get_session_user)
 ):
     log_request(request, {"category_id": str(category_id)})
     
-    category_service = CategoryService(db)
-    result = category_service.delete_category(category_id)
+    category_service = AsyncCategoryService(db)
+    result = await category_service.delete_category(category_id)
     
     if not result["success"]:
         if "not found" in result["error"]:
@@ -0,0 +1,62 @@
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+import asyncio
+import logging
+import os
+
+from core.events import Subscription, change_hub, encode_change
+
+logger = logging.getLogger("app")
+
+# Seconds without events before a ping is sent, so proxies keep idle connections open
+CHANGE_FEED_HEARTBEAT = float(os.getenv("CHANGE_FEED_HEARTBEAT", 30))
+
+router = APIRouter(prefix="/ws", tags=["events"])
+
+async def _send_changes(websocket: WebSocket, subscription: Subscription):
+    while True:
+        try:
+            change = await asyncio.wait_for(subscription.get(), CHANGE_FEED_HEARTBEAT)
+        except asyncio.TimeoutError:
+            # Keeps proxies from closing an idle connection
+            change = {"type": "ping"}
+        try:
+            await websocket.send_text(encode_change(change))
+        except (WebSocketDisconnect, RuntimeError):
+            # The socket closed between the receiver noticing and this task being cancelled
+            return
+
+
+async def _receive_until_disconnect(websocket: WebSocket):
+    """Drain client frames until the client goes away, so a close is seen right away
+    rather than at the next send"""
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            return
+
+
+@router.websocket("/board")
+async def board_changes(websocket: WebSocket):
+    """Stream board change events; authenticated by AuthMiddleware from the session cookies.
+
+    Holds no database session, so an idle connection costs one queue and two tasks:
+    one sending changes and one receiving, whose disconnect cancels the sender.
+    """
+    await websocket.accept()
+    username = websocket.state.validated_user
+    logger.info(f"Change feed subscribed: {username}")
+
+    async with change_hub.subscribe() as subscription:
+        sender = asyncio.create_task(_send_changes(websocket, subscription))
+        receiver = asyncio.create_task(_receive_until_disconnect(websocket))
+        try:
+            await asyncio.wait({sender, receiver}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            sender.cancel()
+            receiver.cancel()
+            results = await asyncio.gather(sender, receiver, return_exceptions=True)
+
+    for result in results:
+        if isinstance(result, Exception) and not isinstance(result, WebSocketDisconnect):
+            logger.error(f"Change feed failed for {username}", exc_info=result)
+    logger.info(f"Change feed closed: {username}")
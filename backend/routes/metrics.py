@@ -0,0 +1,27 @@
+from fastapi import APIRouter, HTTPException, Request, Response, status
+
+from core.auth import token_cache_stats
+from core.cache import VersionedCache
+from core.events import change_feed_stats
+from core.metrics import CONTENT_TYPE, METRICS_TOKEN, render_metrics
+from services.history_writer import history_writer_stats
+
+router = APIRouter(tags=["metrics"])
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics(request: Request):
+    """Prometheus scrape endpoint; async so gauges are read on the event loop.
+
+    With METRICS_TOKEN set the bearer token is required; otherwise AuthMiddleware
+    has already required a login, unless METRICS_PUBLIC is on.
+    """
+    if METRICS_TOKEN and request.headers.get("authorization") != f"Bearer {METRICS_TOKEN}":
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid metrics token")
+
+    components = {
+        "history_writer": history_writer_stats(),
+        "token_cache": token_cache_stats(),
+        "change_feed": change_feed_stats(),
+        **{f"cache_{name}": cache.stats() for name, cache in VersionedCache.registry.items()},
+    }
+    return Response(render_metrics(components), media_type=CONTENT_TYPE)
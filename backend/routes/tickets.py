@@ -1,66 +1,117 @@
-from fastapi import APIRouter, Depends, HTTPException, Request, Query, status
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, Query, status
+from fastapi.encoders import jsonable_encoder
+from typing import List, Optional, Union
 import uuid
 
-from schemas import TicketCreate, TicketUpdate, TicketOut, DragDropRequest, TicketWithCategoryAndHistory, PaginatedTicketOut
-from schemas.ticket_history import TicketHistoryOut
-from core.database import get_db
-from core.auth import get_current_user
-from services.ticket_service import TicketService
+from schemas import TicketCreate, TicketUpdate, TicketOut, DragDropRequest, BulkTicketRequest, BulkTicketResult, TicketWithCategoryAndHistory, PaginatedTicketOut, CursorPaginatedTicketOut
+from schemas.ticket import TicketSearchPage
+from schemas.ticket_history import TicketHistoryOut, ActivityLogPage
+from core.database import DbSession, get_session
+from core.auth import get_session_user
+from services.async_services import AsyncTicketService
+from services.ticket_service import rebalance_category_positions, resolve_ticket_fields
 from models.user import User
+from utils.json_response import ORJSONResponse
 from utils.logger import log_request
 
 router = APIRouter(prefix="/tickets", tags=["tickets"])
 
 @router.post("/", response_model=TicketOut)
-def create_ticket(
+async def create_ticket(
     request: Request,
     ticket: TicketCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: DbSession = Depends(get_session),
+    current_user: User = Depends(get_session_user)
 ):
     log_request(request, ticket.model_dump())
     
-    ticket_service = TicketService(db)
-    created_ticket = ticket_service.create_ticket(ticket, current_user.id)
+    ticket_service = AsyncTicketService(db)
+    created_ticket = await ticket_service.create_ticket(ticket, current_user.id)
     
     if not created_ticket:
         raise HTTPException(status_code=400, detail="Invalid category or category not found")
     
     return created_ticket
 
-@router.get("/", response_model=PaginatedTicketOut)
-def get_tickets(
+@router.post("/bulk", response_model=BulkTicketResult)
+async def bulk_tickets(
+    request: Request,
+    bulk: BulkTicketRequest,
+    db: DbSession = Depends(get_session),
+    current_user: User = Depends(get_session_user)
+):
+    """Create, update, move and delete many tickets in one transaction"""
+    log_request(request, {"operations": len(bulk.operations), "atomic": bulk.atomic})
+    
+    ticket_service = AsyncTicketService(db)
+    result = await ticket_service.bulk_tickets(bulk.operations, current_user.id, bulk.atomic)
+    
+    if not result["committed"]:
+        raise HTTPException(status_code=400, detail=jsonable_encoder(result))
+    
+    return result
+
+@router.get("/", response_model=Union[PaginatedTicketOut, CursorPaginatedTicketOut])
+async def get_tickets(
     request: Request,
     category_id: Optional[uuid.UUID] = Query(None),
     page: int = Query(1, ge=1),
     page_size: int = Query(0, ge=0),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    cursor: Optional[str] = Query(None, description="Keyset cursor; send an empty value for the first page"),
+    with_total: Optional[str] = Query(None, pattern="^(exact|approximate)$", description="Include a total in cursor mode"),
+    view: str = Query("full", pattern="^(card|full)$", description="card: only the fields a board card shows"),
+    fields: Optional[str] = Query(None, description="Comma-separated ticket fields to return; overrides view"),
+    db: DbSession = Depends(get_session),
+    current_user: User = Depends(get_session_user)
 ):
     log_request(request, {
         "category_id": str(category_id) if category_id else None,
         "page": page,
-        "page_size": page_size
+        "page_size": page_size,
+        "cursor": cursor,
+        "with_total": with_total,
+        "view": view,
+        "fields": fields
     })
+
+    try:
+        selected_fields = resolve_ticket_fields(view, fields)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
     
-    ticket_service = TicketService(db)
-    result = ticket_service.get_tickets(category_id, page, page_size)
+    ticket_service = AsyncTicketService(db)
+
+    if cursor is not None:
+        try:
+            result = await ticket_service.get_tickets_after(category_id, cursor, page_size, with_total, selected_fields)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        # Sparse items don't match the response model
+        return result if selected_fields is None else ORJSONResponse(result)
+
+    if selected_fields is not None:
+        return ORJSONResponse(await ticket_service.get_tickets(category_id, page, page_size, selected_fields))
+
+    if page_size == 0:
+        # The whole board: Core rows straight to orjson, skipping ORM objects and validation
+        return ORJSONResponse(await ticket_service.get_ticket_listing(category_id))
+
+    result = await ticket_service.get_tickets(category_id, page, page_size)
     
     return result
 
 @router.put("/drag-drop", response_model=TicketOut)
-def drag_drop_ticket(
+async def drag_drop_ticket(
     request: Request,
     drag_data: DragDropRequest,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    background_tasks: BackgroundTasks,
+    db: DbSession = Depends(get_session),
+    current_user: User = Depends(get_session_user)
 ):
     log_request(request, drag_data.model_dump())
     
-    ticket_service = TicketService(db)
-    updated_ticket = ticket_service.drag_drop_ticket(
+    ticket_service = AsyncTicketService(db)
+    updated_ticket = await ticket_service.drag_drop_ticket(
         uuid.UUID(drag_data.ticket_id),
         uuid.UUID(drag_data.target_category_id),
         drag_data.target_position,
@@ -69,26 +120,51 @@ def drag_drop_ticket(
     
     if not updated_ticket:
         raise HTTPException(status_code=404, detail="Ticket not found or invalid category")
+
+    for category_id in ticket_service.pending_rebalance:
+        background_tasks.add_task(rebalance_category_positions, category_id)
     
     return updated_ticket
 
+# Declared before /{ticket_id} so "search" isn't taken for a ticket id
+@router.get("/search", response_model=TicketSearchPage)
+async def search_tickets(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=200, description="Words, \"quoted phrases\", -excluded words, OR"),
+    category_id: Optional[uuid.UUID] = Query(None),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    page_size: int = Query(20, ge=1, le=100),
+    db: DbSession = Depends(get_session),
+    current_user: User = Depends(get_session_user)
+):
+    """Full-text search over ticket titles and descriptions, best match first"""
+    log_request(request, {
+        "q": q,
+        "category_id": str(category_id) if category_id else None,
+        "cursor": cursor,
+        "page_size": page_size
+    })
+    
+    ticket_service = AsyncTicketService(db)
+
+    try:
+        return await ticket_service.search_tickets(q, category_id, cursor, page_size)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
 @router.get("/{ticket_id}", response_model=TicketWithCategoryAndHistory)
-def get_ticket(
+async def get_ticket(
     request: Request,
     ticket_id: uuid.UUID,
     include_history: bool = Query(True, description="Include ticket history"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    full_values: bool = Query(False, description="Rebuild complete old/new values for rows stored as diffs"),
+    db: DbSession = Depends(get_session),
+    current_user: User = Depends(get_session_user)
 ):
-    log_request(request, {"ticket_id": str(ticket_id), "include_history": include_history})
+    log_request(request, {"ticket_id": str(ticket_id), "include_history": include_history, "full_values": full_values})
     
-    ticket_service = TicketService(db)
-    
-    if include_history:
-        ticket = ticket_service.get_ticket_with_history(ticket_id)
-    else:
-        ticket = ticket_service.get_ticket(ticket_id)
-        ticket.history = []
+    ticket_service = AsyncTicketService(db)
+    ticket = await ticket_service.get_ticket(ticket_id, include_history, full_values)
     
     if not ticket:
         raise HTTPException(status_code=404, detail="Ticket not found")
@@ -96,17 +172,17 @@ def get_ticket(
     return ticket
 
 @router.put("/{ticket_id}", response_model=TicketOut)
-def update_ticket(
+async def update_ticket(
     request: Request,
     ticket_id: uuid.UUID,
     ticket_update: TicketUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: DbSession = Depends(get_session),
+    current_user: User = Depends(get_session_user)
 ):
     log_request(request, {"ticket_id": str(ticket_id), **ticket_update.model_dump()})
     
-    ticket_service = TicketService(db)
-    updated_ticket = ticket_service.update_ticket(ticket_id, ticket_update, current_user.id)
+    ticket_service = AsyncTicketService(db)
+    updated_ticket = await ticket_service.update_ticket(ticket_id, ticket_update, current_user.id)
     
     if not updated_ticket:
         raise HTTPException(status_code=404, detail="Ticket not found or invalid category")
@@ -114,35 +190,45 @@ def update_ticket(
     return updated_ticket
 
 @router.delete("/{ticket_id}")
-def delete_ticket(
+async def delete_ticket(
     request: Request,
     ticket_id: uuid.UUID,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: DbSession = Depends(get_session),
+    current_user: User = Depends(get_session_user)
 ):
     log_request(request, {"ticket_id": str(ticket_id)})
     
-    ticket_service = TicketService(db)
-    deleted = ticket_service.delete_ticket(ticket_id, current_user.id)
+    ticket_service = AsyncTicketService(db)
+    deleted = await ticket_service.delete_ticket(ticket_id, current_user.id)
     
     if not deleted:
         raise HTTPException(status_code=404, detail="Ticket not found")
     
     return {"message": "Ticket deleted successfully"}
 
-@router.get("/history/all", response_model=List[TicketHistoryOut])
-def get_all_activity_logs(
+@router.get("/history/all", response_model=Union[List[TicketHistoryOut], ActivityLogPage])
+async def get_all_activity_logs(
     request: Request,
     page: int = Query(1, ge=1),
     page_size: int = Query(50, ge=1, le=100),
     only_by_me: bool = Query(False, description="Show only activities by current user"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    cursor: Optional[str] = Query(None, description="Keyset cursor; send an empty value for the first page"),
+    full_values: bool = Query(False, description="Rebuild complete old/new values for rows stored as diffs"),
+    db: DbSession = Depends(get_session),
+    current_user: User = Depends(get_session_user)
 ):
     """Get all activity logs across all tickets"""
-    log_request(request, {"page": page, "page_size": page_size, "only_by_me": only_by_me})
+    log_request(request, {"page": page, "page_size": page_size, "only_by_me": only_by_me, "cursor": cursor, "full_values": full_values})
     
-    ticket_service = TicketService(db)
-    activity_logs = ticket_service.get_all_activity_logs(page, page_size, current_user.id if only_by_me else None)
+    ticket_service = AsyncTicketService(db)
+    filter_user_id = current_user.id if only_by_me else None
+
+    if cursor is not None:
+        try:
+            return await ticket_service.get_activity_logs_before(cursor, page_size, filter_user_id, full_values)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    activity_logs = await ticket_service.get_all_activity_logs(page, page_size, filter_user_id, full_values)
     
     return activity_logs
@@ -0,0 +1,47 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, Query
+import uuid
+
+from core.database import DbSession, get_session
+from core.auth import get_session_user
+from services.async_services import run_service
+from services.avatar_service import AVATAR_CONTENT_TYPES, AvatarService
+from services.user_service import UserService
+from models.user import User
+from utils.http_cache import make_etag, etag_matches
+
+router = APIRouter(prefix="/users", tags=["users"])
+
+# Avatar URLs carry the content hash, so a response never changes for a given URL
+AVATAR_CACHE_CONTROL = "private, max-age=31536000, immutable"
+
+@router.get("/{user_id}/avatar")
+async def get_avatar(
+    request: Request,
+    user_id: uuid.UUID,
+    size: str = Query("thumb", pattern="^(thumb|full)$"),
+    db: DbSession = Depends(get_session),
+    current_user: User = Depends(get_session_user)
+):
+    user = await run_service(db, UserService, lambda s: s.get_user_by_id(user_id))
+    if not user or not user.avatar_hash:
+        raise HTTPException(status_code=404, detail="Avatar not found")
+
+    etag = make_etag(f"{user.avatar_hash}-{size}")
+    # nosniff: browsers must not render the bytes as anything but the declared image type
+    headers = {"ETag": etag, "Cache-Control": AVATAR_CACHE_CONTROL, "X-Content-Type-Options": "nosniff"}
+
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+
+    avatar = await run_service(db, AvatarService, lambda s: s.get_avatar(user.avatar_hash))
+    if not avatar:
+        raise HTTPException(status_code=404, detail="Avatar not found")
+
+    if size == "full":
+        # Rows stored before types were detected may carry a client-declared type
+        if avatar.content_type not in AVATAR_CONTENT_TYPES:
+            return Response(content=avatar.data, media_type="application/octet-stream",
+                            headers={**headers, "Content-Disposition": "attachment"})
+        return Response(content=avatar.data, media_type=avatar.content_type, headers=headers)
+
+    return Response(content=avatar.thumbnail, media_type=avatar.thumbnail_content_type, headers=headers)
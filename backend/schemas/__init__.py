@@ -1,13 +1,14 @@
 from .auth import Token, TokenData
 from .user import UserBase, UserCreate, UserOut, UserLogin
 from .category import CategoryBase, CategoryCreate, CategoryUpdate, CategoryOut, CategoryReorder
-from .ticket import TicketBase, TicketCreate, TicketUpdate, TicketOut, DragDropRequest
-from .combined import CategoryWithTickets, TicketWithCategory, TicketWithCategoryAndHistory, PaginatedTicketOut
+from .ticket import TicketBase, TicketCreate, TicketUpdate, TicketOut, DragDropRequest, BulkTicketRequest, BulkTicketResult
+from .combined import BoardOut, CategoryWithTickets, TicketWithCategory, TicketWithCategoryAndHistory, PaginatedTicketOut, CursorPaginatedTicketOut
 
 __all__ = [
     "Token", "TokenData", 
     "UserBase", "UserCreate", "UserOut", "UserLogin",
     "CategoryBase", "CategoryCreate", "CategoryUpdate", "CategoryOut", "CategoryReorder",
-    "TicketBase", "TicketCreate", "TicketUpdate", "TicketOut", "DragDropRequest",
-    "CategoryWithTickets", "TicketWithCategory", "TicketWithCategoryAndHistory", "PaginatedTicketOut"
+    "TicketBase", "TicketCreate", "TicketUpdate", "TicketOut", "DragDropRequest", "BulkTicketRequest", "BulkTicketResult",
+    "BoardOut", "CategoryWithTickets", "TicketWithCategory", "TicketWithCategoryAndHistory", "PaginatedTicketOut",
+    "CursorPaginatedTicketOut"
 ]
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List
+from typing import List, Optional
 
 from .category import CategoryOut
 from .ticket import TicketOut
@@ -14,9 +14,20 @@ class TicketWithCategory(TicketOut):
 class TicketWithCategoryAndHistory(TicketWithCategory):
     history: List[TicketHistoryOut] = []
 
+class BoardOut(BaseModel):
+    version: str
+    categories: List[CategoryWithTickets]
+
 class PaginatedTicketOut(BaseModel):
     items: List[TicketWithCategory]
     total: int
     page: int
     page_size: int
-    total_pages: int 
\ No newline at end of file
+    total_pages: int
+
+class CursorPaginatedTicketOut(BaseModel):
+    items: List[TicketWithCategory]
+    next_cursor: Optional[str]
+    page_size: int
+    total: Optional[int] = None
+    total_is_approximate: bool = False
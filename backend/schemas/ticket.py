@@ -1,5 +1,5 @@
-from pydantic import BaseModel, field_validator
-from typing import Optional, List, Union
+from pydantic import BaseModel, Field, field_validator
+from typing import Annotated, Literal, Optional, List, Union
 import uuid
 from datetime import datetime
 
@@ -53,3 +53,67 @@ class DragDropRequest(BaseModel):
     ticket_id: str
     target_category_id: str
     target_position: int
+
+class BulkTicketCreate(TicketCreate):
+    op: Literal["create"]
+
+class BulkTicketUpdate(BaseModel):
+    op: Literal["update"]
+    ticket_id: uuid.UUID
+    title: Optional[str] = None
+    description: Optional[str] = None
+    expiry_date: Optional[datetime] = None
+    category_id: Optional[uuid.UUID] = None  # a category change appends the ticket to the new column
+    assigned_user_ids: Optional[List[uuid.UUID]] = None
+
+    @field_validator('expiry_date', mode='before')
+    @classmethod
+    def validate_expiry_date(cls, v):
+        if v == "" or v is None:
+            return None
+        return v
+
+class BulkTicketMove(BaseModel):
+    op: Literal["move"]
+    ticket_id: uuid.UUID
+    target_category_id: uuid.UUID
+    target_position: int  # index in the target column, like DragDropRequest
+
+class BulkTicketDelete(BaseModel):
+    op: Literal["delete"]
+    ticket_id: uuid.UUID
+
+BulkTicketOperation = Annotated[
+    Union[BulkTicketCreate, BulkTicketUpdate, BulkTicketMove, BulkTicketDelete],
+    Field(discriminator="op")
+]
+
+class BulkTicketRequest(BaseModel):
+    operations: List[BulkTicketOperation] = Field(..., min_length=1, max_length=5000)
+    atomic: bool = False  # apply nothing if any operation fails
+
+class BulkTicketItemResult(BaseModel):
+    index: int
+    op: str
+    ok: bool
+    ticket_id: Optional[uuid.UUID] = None
+    error: Optional[str] = None
+
+class BulkTicketResult(BaseModel):
+    committed: bool
+    succeeded: int
+    failed: int
+    results: List[BulkTicketItemResult]
+
+class TicketSearchHit(BaseModel):
+    id: uuid.UUID
+    category_id: uuid.UUID
+    title: str
+    position: int
+    rank: float
+    title_highlight: str  # HTML-escaped, matches wrapped in <mark>
+    snippet: str  # fragments of the description, highlighted the same way
+
+class TicketSearchPage(BaseModel):
+    items: List[TicketSearchHit]
+    next_cursor: Optional[str]
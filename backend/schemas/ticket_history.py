@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 import uuid
 
 class TicketHistoryBase(BaseModel):
@@ -20,6 +20,11 @@ class TicketHistoryOut(TicketHistoryBase):
     user_id: uuid.UUID
     created_at: datetime
     ticket_title: Optional[str] = None
+    is_checkpoint: bool = True  # False: the values only hold changed keys unless full_values was requested
 
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True
+
+class ActivityLogPage(BaseModel):
+    items: List[TicketHistoryOut]
+    next_cursor: Optional[str]
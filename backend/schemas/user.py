@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, computed_field
 from typing import Optional
 import uuid
 
@@ -15,14 +15,23 @@ class UserLogin(UserBase):
 class UserUpdate(BaseModel):
     first_name: Optional[str] = None
     last_name: Optional[str] = None
-    profile_picture: Optional[str] = None  # Base64 encoded image
+    profile_picture: Optional[str] = None  # Base64 encoded image; empty removes it
+
+def avatar_url(user_id: uuid.UUID, avatar_hash: Optional[str]) -> Optional[str]:
+    return f"/users/{user_id}/avatar?v={avatar_hash[:16]}" if avatar_hash else None
 
 class UserOut(UserBase):
     email: str
     id: uuid.UUID
     first_name: Optional[str] = None
     last_name: Optional[str] = None
-    profile_picture: Optional[str] = None
+    avatar_hash: Optional[str] = Field(None, exclude=True)
+
+    @computed_field
+    @property
+    def profile_picture(self) -> Optional[str]:
+        """Avatar URL; the image itself is served by GET /users/{id}/avatar"""
+        return avatar_url(self.id, self.avatar_hash)
     
     class Config:
         orm_mode = True 
@@ -30,7 +39,12 @@ class UserOut(UserBase):
 class UserAssigned(BaseModel):
     id: uuid.UUID
     username: str
-    profile_picture: Optional[str] = None
+    avatar_hash: Optional[str] = Field(None, exclude=True)
+
+    @computed_field
+    @property
+    def profile_picture(self) -> Optional[str]:
+        return avatar_url(self.id, self.avatar_hash)
     
     class Config:
         from_attributes = True 
\ No newline at end of file
@@ -2,22 +2,42 @@
 """
 Database seeding script for ADPM (Advanced Project Management)
 Creates realistic dummy data for all models including many-to-many relationships.
+
+With --tickets it generates a synthetic dataset of that size instead, for
+benchmarks and load tests (every generated user's password is password123).
+Rows are streamed into Postgres with COPY; the same --seed and --anchor always
+produce the same rows, whatever --processes is:
+    python seed_data.py --tickets 1000000 --history-per-ticket 20 --processes 8 --reset
 """
 
+import argparse
+import collections
+import io
+import json
+import multiprocessing
+import multiprocessing.pool
 import os
 import sys
 import random
-from datetime import datetime, timedelta
-from typing import List
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+from sqlalchemy import text
 from sqlalchemy.orm import Session
 from core.database import get_db
 from models.user import User
 from models.category import Category
 from models.ticket import Ticket, ticket_users
 from models.ticket_history import TicketHistory
+from services.board_service import board_version
+from services.category_service import category_cache
+from services.history_partitions import ensure_partitions
 from utils.security import get_password_hash
+from utils.positions import POSITION_GAP
+from utils.history_diff import is_checkpoint, diff_values
 
 USERS_DATA = [
     {
@@ -201,6 +221,7 @@ def create_categories(db: Session, users: List[User]) -> List[Category]:
         db.add(category)
         categories.append(category)
     
+    category_cache.bump(db)
     db.commit()
     return categories
 
@@ -225,9 +246,11 @@ def create_tickets(db: Session, users: List[User], categories: List[Category]) -
             title=ticket_data["title"],
             description=ticket_data["description"],
             expiry_date=expiry_date,
-            position=i,
+            position=(i + 1) * POSITION_GAP,
             category_id=category.id,
-            user_id=main_user.id
+            user_id=main_user.id,
+            # Older than any seeded history entry (those go back up to 31 days)
+            created_at=datetime.now() - timedelta(days=32)
         )
         db.add(ticket)
         tickets.append(ticket)
@@ -259,6 +282,7 @@ def assign_users_to_tickets(db: Session, users: List[User], tickets: List[Ticket
                     )
                 )
     
+    board_version.bump(db)
     db.commit()
 
 
@@ -352,5 +376,307 @@ def seed_database():
         db.close()
 
 
+# Synthetic datasets ---------------------------------------------------------
+
+SCALE_PASSWORD = "password123"
+# Tickets per generated chunk: one COPY per table and one commit per chunk
+SCALE_CHUNK_SIZE = 10_000
+# Chunks generated ahead of the loader, per process; bounds memory when COPY is the bottleneck
+SCALE_CHUNKS_AHEAD = 2
+# Tickets are created this long before the anchor; their history runs up to it
+SCALE_HISTORY_DAYS = 32
+SCALE_COLORS = [category["color"] for category in CATEGORIES_DATA]
+SCALE_WORDS = [
+    "api", "login", "dashboard", "report", "export", "cache", "search", "email", "billing", "invoice",
+    "webhook", "session", "upload", "mobile", "layout", "timeout", "migration", "permissions", "audit", "metrics",
+]
+
+USER_COLUMNS = ("id", "email", "username", "first_name", "last_name", "hashed_password", "is_active")
+CATEGORY_COLUMNS = ("id", "name", "color", "position", "user_id", "is_deleted")
+TICKET_COLUMNS = ("id", "title", "description", "expiry_date", "position", "category_id", "user_id",
+                  "history_seq", "created_at", "updated_at")
+ASSIGNMENT_COLUMNS = ("ticket_id", "user_id")
+HISTORY_COLUMNS = ("id", "ticket_id", "user_id", "action_type", "old_values", "new_values",
+                   "from_category_name", "to_category_name", "is_checkpoint", "created_at")
+
+COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def copy_field(value: Any) -> str:
+    """One value in COPY text format; None is SQL NULL"""
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    elif isinstance(value, (dict, list)):
+        value = json.dumps(value, separators=(",", ":"))
+    return str(value).translate(COPY_ESCAPES)
+
+
+def copy_text(rows: Iterable[Dict[str, Any]], columns: Sequence[str]) -> str:
+    return "".join("\t".join(copy_field(row[column]) for column in columns) + "\n" for row in rows)
+
+
+def copy_into(db: Session, table: str, columns: Sequence[str], data: str):
+    """COPY rows in text format into `table` within the session's transaction"""
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN", io.StringIO(data))
+    finally:
+        cursor.close()
+
+
+def scale_uuid(rng: random.Random) -> uuid.UUID:
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def scale_sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(SCALE_WORDS) for _ in range(words)).capitalize()
+
+
+def scale_users(rng: random.Random, count: int, hashed_password: str) -> List[Dict[str, Any]]:
+    return [{
+        "id": scale_uuid(rng),
+        "email": f"user{n:05d}@example.com",
+        "username": f"user{n:05d}",
+        "first_name": "User",
+        "last_name": f"{n:05d}",
+        "hashed_password": hashed_password,
+        "is_active": True,
+    } for n in range(1, count + 1)]
+
+
+def scale_categories(rng: random.Random, count: int, owner_id: uuid.UUID) -> List[Dict[str, Any]]:
+    return [{
+        "id": scale_uuid(rng),
+        "name": f"Column {n + 1}",
+        "color": SCALE_COLORS[n % len(SCALE_COLORS)],
+        "position": n,
+        "user_id": owner_id,
+        "is_deleted": False,
+    } for n in range(count)]
+
+
+def scale_tickets(rng: random.Random, first_number: int, category_indexes: Sequence[int], ranks: List[int],
+                  categories: List[Dict[str, Any]], users: List[Dict[str, Any]], history_per_ticket: int,
+                  created_at: datetime) -> Iterator[Dict[str, Any]]:
+    """Tickets in the given categories. `ranks` holds each category's last rank so far
+    and is advanced, so positions stay dense: rank 1, 2, 3... times POSITION_GAP."""
+    for offset, category_index in enumerate(category_indexes):
+        ranks[category_index] += 1
+        yield {
+            "id": scale_uuid(rng),
+            "title": f"{scale_sentence(rng, 4)} #{first_number + offset}",
+            "description": scale_sentence(rng, rng.randint(8, 40)),
+            "expiry_date": created_at + timedelta(days=rng.randint(30, 90)) if rng.random() < 0.5 else None,
+            "position": ranks[category_index] * POSITION_GAP,
+            "category_id": categories[category_index]["id"],
+            "user_id": rng.choice(users)["id"],
+            "history_seq": history_per_ticket,
+            "created_at": created_at,
+            "updated_at": created_at,
+        }
+
+
+def scale_history(rng: random.Random, ticket: Dict[str, Any], assignees: List[Dict[str, Any]],
+                  categories: List[Dict[str, Any]], users: List[Dict[str, Any]], count: int,
+                  now: datetime) -> Iterator[Dict[str, Any]]:
+    """A created row, updates and a final move into the ticket's column, stored as checkpoints and
+    diffs like the app does. Replaying them ends at the ticket's current values."""
+    names = {category["id"]: category["name"] for category in categories}
+    column = names[ticket["category_id"]]
+    moves = count > 1 and len(categories) > 1
+    last_update = count - 1 if moves else count
+
+    state = {
+        "title": ticket["title"],
+        "description": ticket["description"] if last_update < 2 else scale_sentence(rng, rng.randint(8, 40)),
+        "expiry_date": ticket["expiry_date"].isoformat() if ticket["expiry_date"] else None,
+        "position": ticket["position"],
+        "category": rng.choice([name for name in names.values() if name != column]) if moves else column,
+        "assigned_users": [user["username"] for user in assignees],
+    }
+    step = (now - ticket["created_at"]) / (count + 1)
+
+    for sequence in range(1, count + 1):
+        row = {
+            "id": scale_uuid(rng),
+            "ticket_id": ticket["id"],
+            "user_id": rng.choice(users)["id"],
+            "from_category_name": None,
+            "to_category_name": None,
+            "created_at": ticket["created_at"] + step * sequence,
+        }
+
+        if sequence == 1:
+            action_type, old_values, new_values = "created", None, dict(state)
+            row["to_category_name"] = state["category"]
+        else:
+            old_state = dict(state)
+            if moves and sequence == count:
+                action_type = "moved"
+                state["category"] = column
+                row["from_category_name"], row["to_category_name"] = old_state["category"], column
+            else:
+                action_type = "updated"
+                state["description"] = (
+                    ticket["description"] if sequence == last_update else scale_sentence(rng, rng.randint(8, 40))
+                )
+
+            if is_checkpoint(action_type, sequence):
+                old_values, new_values = old_state, dict(state)
+            else:
+                old_values, new_values = diff_values(old_state, state)
+
+        yield {**row, "action_type": action_type, "old_values": old_values, "new_values": new_values,
+               "is_checkpoint": is_checkpoint(action_type, sequence)}
+
+
+# What every chunk needs besides its own slice; set once per worker process
+_scale_context: Dict[str, Any] = {}
+
+
+def _init_scale_worker(context: Dict[str, Any]):
+    _scale_context.update(context)
+
+
+def generate_chunk(chunk: Tuple[int, Sequence[int], List[int]]) -> Dict[str, str]:
+    """COPY data for one chunk of tickets with their assignments and history.
+
+    The chunk's random stream is derived from the seed and the chunk number only,
+    so chunks can be generated in any process and in any order.
+    """
+    number, category_indexes, ranks = chunk
+    context = _scale_context
+    rng = random.Random(f"{context['seed']}:{number}")
+    users, categories = context["users"], context["categories"]
+
+    tickets, assignments, history = [], [], []
+    for ticket in scale_tickets(rng, number * SCALE_CHUNK_SIZE + 1, category_indexes, ranks, categories, users,
+                                context["history_per_ticket"], context["created_at"]):
+        assignees = rng.sample(users, rng.randint(1, min(3, len(users))))
+        tickets.append(ticket)
+        assignments.extend({"ticket_id": ticket["id"], "user_id": user["id"]} for user in assignees)
+        history.extend(scale_history(rng, ticket, assignees, categories, users,
+                                     context["history_per_ticket"], context["now"]))
+
+    return {
+        "tickets": copy_text(tickets, TICKET_COLUMNS),
+        "ticket_users": copy_text(assignments, ASSIGNMENT_COLUMNS),
+        "ticket_history": copy_text(history, HISTORY_COLUMNS),
+    }
+
+
+def generate_in_order(pool: multiprocessing.pool.Pool, chunks: Iterable[Tuple[int, List[int], List[int]]],
+                      window: int) -> Iterator[Dict[str, str]]:
+    """generate_chunk over `chunks` in `pool`, yielded in chunk order, with at most
+    `window` chunks generated or waiting to be loaded at any time"""
+    pending = collections.deque()
+    for chunk in chunks:
+        if len(pending) == window:
+            yield pending.popleft().get()
+        pending.append(pool.apply_async(generate_chunk, (chunk,)))
+    while pending:
+        yield pending.popleft().get()
+
+
+def scale_chunks(rng: random.Random, tickets: int, categories: int) -> Iterator[Tuple[int, List[int], List[int]]]:
+    """Each chunk's category choices plus the per-category ranks it starts from"""
+    ranks = [0] * categories
+    for number, start in enumerate(range(0, tickets, SCALE_CHUNK_SIZE)):
+        category_indexes = [rng.randrange(categories) for _ in range(min(SCALE_CHUNK_SIZE, tickets - start))]
+        yield number, category_indexes, list(ranks)
+        for category_index in category_indexes:
+            ranks[category_index] += 1
+
+
+def seed_scale(tickets: int, users: int = 50, categories: int = 8, history_per_ticket: int = 5,
+               seed: int = 42, reset: bool = False, processes: int = 1, anchor: Optional[datetime] = None):
+    """Generate a synthetic dataset: users, categories, tickets, assignments and history.
+
+    Timestamps are laid out relative to `anchor`, by default the start of the
+    current UTC day, so the data always looks recent to the activity feed.
+    """
+    rng = random.Random(seed)
+    now = anchor or datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    created_at = now - timedelta(days=SCALE_HISTORY_DAYS)
+    db = next(get_db())
+
+    try:
+        if reset:
+            db.execute(text("TRUNCATE ticket_history, ticket_users, tickets, categories, users CASCADE"))
+        elif db.query(User).filter(User.username == "user00001").first():
+            raise SystemExit("A generated dataset already exists. Pass --reset to replace it.")
+
+        # Monthly history partitions for the generated span rather than the default partition
+        ensure_partitions(db, (now.year - created_at.year) * 12 + now.month - created_at.month,
+                          today=created_at.date())
+
+        # One bcrypt hash shared by every user
+        user_rows = scale_users(rng, users, get_password_hash(SCALE_PASSWORD))
+        category_rows = scale_categories(rng, categories, user_rows[0]["id"])
+        copy_into(db, "users", USER_COLUMNS, copy_text(user_rows, USER_COLUMNS))
+        copy_into(db, "categories", CATEGORY_COLUMNS, copy_text(category_rows, CATEGORY_COLUMNS))
+        category_cache.bump(db)
+        db.commit()
+
+        context = {"seed": seed, "users": user_rows, "categories": category_rows,
+                   "history_per_ticket": history_per_ticket, "created_at": created_at, "now": now}
+        chunks = scale_chunks(rng, tickets, categories)
+        pool = multiprocessing.Pool(processes, _init_scale_worker, (context,)) if processes > 1 else None
+        if pool is None:
+            _init_scale_worker(context)
+        started = time.perf_counter()
+
+        try:
+            # Chunks are loaded in order, so rows land in the same order however many processes generate them
+            generated = (generate_in_order(pool, chunks, processes * SCALE_CHUNKS_AHEAD) if pool
+                         else map(generate_chunk, chunks))
+            loaded = 0
+            for data in generated:
+                copy_into(db, "tickets", TICKET_COLUMNS, data["tickets"])
+                copy_into(db, "ticket_users", ASSIGNMENT_COLUMNS, data["ticket_users"])
+                copy_into(db, "ticket_history", HISTORY_COLUMNS, data["ticket_history"])
+                db.commit()
+                loaded = min(loaded + SCALE_CHUNK_SIZE, tickets)
+                print(f"  {loaded:,}/{tickets:,} tickets ({loaded / (time.perf_counter() - started):,.0f}/s)",
+                      flush=True)
+        finally:
+            if pool:
+                pool.terminate()
+
+        db.execute(text("ANALYZE"))
+        board_version.bump(db)
+        db.commit()
+        print(f"Seeded: {users} users, {categories} categories, {tickets:,} tickets, "
+              f"{tickets * history_per_ticket:,} history rows in {time.perf_counter() - started:.0f}s")
+        print(f"Login: user00001 / {SCALE_PASSWORD}")
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
 if __name__ == "__main__":
-    seed_database()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tickets", type=int, default=0, help="generate this many tickets instead of the demo data")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--categories", type=int, default=8)
+    parser.add_argument("--history-per-ticket", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42, help="the same seed generates the same rows")
+    parser.add_argument("--anchor", type=datetime.fromisoformat,
+                        help="timestamp the generated history ends at (default: start of today, UTC)")
+    parser.add_argument("--processes", type=int, default=1, help="processes generating rows")
+    parser.add_argument("--reset", action="store_true", help="empty users, categories, tickets and history first")
+    args = parser.parse_args()
+
+    if args.tickets:
+        if args.anchor and args.anchor.tzinfo is None:
+            args.anchor = args.anchor.replace(tzinfo=timezone.utc)
+        seed_scale(args.tickets, args.users, args.categories, args.history_per_ticket, args.seed,
+                   args.reset, args.processes, args.anchor)
+    else:
+        seed_database()
@@ -0,0 +1,192 @@
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from pydantic import TypeAdapter
+from functools import lru_cache
+from typing import Any, Callable, List, Optional, Set, Tuple
+import uuid
+
+from core.database import DbSession
+from schemas import (
+    TicketOut, TicketWithCategoryAndHistory, PaginatedTicketOut, CursorPaginatedTicketOut,
+    CategoryOut, CategoryWithTickets, BoardOut
+)
+from schemas.ticket import TicketCreate, TicketUpdate, TicketSearchPage
+from schemas.ticket_history import TicketHistoryOut, ActivityLogPage
+from schemas.category import CategoryCreate, CategoryUpdate, CategoryReorder
+from schemas.user import UserOut, UserUpdate
+from services.ticket_service import TicketService
+from services.bulk_ticket_service import BulkTicketService
+from services.category_service import CategoryService
+from services.user_service import UserService
+from services.board_service import BoardService
+
+# Awaitable adapters over the sync services, used by the routes in both modes. With
+# an AsyncSession (DB_ASYNC_MODE) the service code runs through AsyncSession.run_sync:
+# the statements go out over asyncpg on the session's greenlet, so a request waiting
+# on the database only suspends a coroutine instead of blocking a threadpool thread.
+# With a plain Session it runs in the threadpool, as sync routes would.
+# Results are converted to schemas before returning because lazy loads can't happen
+# once control is back on the event loop.
+
+
+@lru_cache(maxsize=None)
+def _adapter(schema: Any) -> TypeAdapter:
+    return TypeAdapter(schema)
+
+
+async def run_session(db: DbSession, call: Callable[[Session], Any], schema: Any = None):
+    """Run `call(session)` off the event loop and serialise the result to `schema`"""
+    def run(session: Session):
+        result = call(session)
+        if schema is None or result is None:
+            return result
+        return _adapter(schema).validate_python(result, from_attributes=True)
+
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(run)
+    return await run_in_threadpool(run, db)
+
+
+async def run_service(db: DbSession, service_class, call: Callable, schema: Any = None):
+    """Run `call(service_class(session))` on the request's session and serialise the result to `schema`"""
+    return await run_session(db, lambda session: call(service_class(session)), schema)
+
+
+class AsyncTicketService:
+    def __init__(self, db: DbSession):
+        self.db = db
+        self.pending_rebalance: Set[uuid.UUID] = set()
+
+    async def create_ticket(self, ticket_data: TicketCreate, user_id: uuid.UUID) -> Optional[TicketOut]:
+        return await run_service(self.db, TicketService, lambda s: s.create_ticket(ticket_data, user_id), TicketOut)
+
+    async def get_tickets(self, category_id: Optional[uuid.UUID] = None, page: int = 0, page_size: int = 0,
+                          fields: Optional[Tuple[str, ...]] = None) -> PaginatedTicketOut:
+        return await run_service(
+            self.db, TicketService,
+            lambda s: s.get_tickets(category_id, page, page_size, fields),
+            PaginatedTicketOut if fields is None else None
+        )
+
+    async def get_ticket_listing(self, category_id: Optional[uuid.UUID] = None) -> dict:
+        return await run_service(self.db, TicketService, lambda s: s.get_ticket_listing(category_id))
+
+    async def get_tickets_after(self, category_id: Optional[uuid.UUID] = None, cursor: Optional[str] = None,
+                                page_size: int = 0, with_total: Optional[str] = None,
+                                fields: Optional[Tuple[str, ...]] = None) -> CursorPaginatedTicketOut:
+        return await run_service(
+            self.db, TicketService,
+            lambda s: s.get_tickets_after(category_id, cursor, page_size, with_total, fields),
+            CursorPaginatedTicketOut if fields is None else None
+        )
+
+    async def search_tickets(self, q: str, category_id: Optional[uuid.UUID] = None, cursor: Optional[str] = None,
+                             page_size: int = 0) -> TicketSearchPage:
+        return await run_service(
+            self.db, TicketService, lambda s: s.search_tickets(q, category_id, cursor, page_size), TicketSearchPage
+        )
+
+    async def get_ticket(self, ticket_id: uuid.UUID, include_history: bool = True,
+                         full_values: bool = False) -> Optional[TicketWithCategoryAndHistory]:
+        def call(service: TicketService):
+            if include_history:
+                return service.get_ticket_with_history(ticket_id, full_values)
+
+            ticket = service.get_ticket(ticket_id)
+            if ticket:
+                ticket.history = []
+            return ticket
+
+        return await run_service(self.db, TicketService, call, TicketWithCategoryAndHistory)
+
+    async def update_ticket(self, ticket_id: uuid.UUID, ticket_data: TicketUpdate, user_id: uuid.UUID) -> Optional[TicketOut]:
+        return await run_service(self.db, TicketService, lambda s: s.update_ticket(ticket_id, ticket_data, user_id), TicketOut)
+
+    async def delete_ticket(self, ticket_id: uuid.UUID, user_id: uuid.UUID) -> bool:
+        return await run_service(self.db, TicketService, lambda s: s.delete_ticket(ticket_id, user_id))
+
+    async def drag_drop_ticket(self, ticket_id: uuid.UUID, target_category_id: uuid.UUID, target_position: int,
+                               user_id: uuid.UUID) -> Optional[TicketOut]:
+        def call(service: TicketService):
+            ticket = service.drag_drop_ticket(ticket_id, target_category_id, target_position, user_id)
+            self.pending_rebalance |= service.pending_rebalance
+            return ticket
+
+        return await run_service(self.db, TicketService, call, TicketOut)
+
+    async def bulk_tickets(self, operations: List[Any], user_id: uuid.UUID, atomic: bool = False) -> dict:
+        return await run_service(self.db, BulkTicketService, lambda s: s.apply(operations, user_id, atomic))
+
+    async def get_all_activity_logs(self, page: int = 1, page_size: int = 50, filter_user_id: Optional[uuid.UUID] = None,
+                                    full_values: bool = False) -> List[TicketHistoryOut]:
+        return await run_service(
+            self.db, TicketService,
+            lambda s: s.get_all_activity_logs(page, page_size, filter_user_id, full_values),
+            List[TicketHistoryOut]
+        )
+
+    async def get_activity_logs_before(self, cursor: Optional[str] = None, page_size: int = 50,
+                                       filter_user_id: Optional[uuid.UUID] = None, full_values: bool = False) -> ActivityLogPage:
+        return await run_service(
+            self.db, TicketService,
+            lambda s: s.get_activity_logs_before(cursor, page_size, filter_user_id, full_values),
+            ActivityLogPage
+        )
+
+
+class AsyncCategoryService:
+    def __init__(self, db: DbSession):
+        self.db = db
+
+    async def create_category(self, category_data: CategoryCreate, user_id: uuid.UUID) -> CategoryOut:
+        return await run_service(self.db, CategoryService, lambda s: s.create_category(category_data, user_id), CategoryOut)
+
+    async def get_version(self) -> int:
+        return await run_service(self.db, CategoryService, lambda s: s.get_version())
+
+    async def get_categories(self, user_id: uuid.UUID) -> List[CategoryOut]:
+        return await run_service(self.db, CategoryService, lambda s: s.get_categories(user_id), List[CategoryOut])
+
+    async def get_category(self, category_id: uuid.UUID,
+                           fields: Optional[Tuple[str, ...]] = None) -> Optional[CategoryWithTickets]:
+        return await run_service(
+            self.db, CategoryService,
+            lambda s: s.get_category_detail(category_id, fields),
+            CategoryWithTickets if fields is None else None
+        )
+
+    async def update_category(self, category_id: uuid.UUID, category_data: CategoryUpdate) -> Optional[CategoryOut]:
+        return await run_service(self.db, CategoryService, lambda s: s.update_category(category_id, category_data), CategoryOut)
+
+    async def delete_category(self, category_id: uuid.UUID) -> dict:
+        return await run_service(self.db, CategoryService, lambda s: s.delete_category(category_id))
+
+    async def reorder_categories(self, category_positions: List[CategoryReorder]) -> bool:
+        return await run_service(self.db, CategoryService, lambda s: s.reorder_categories(category_positions))
+
+
+class AsyncUserService:
+    def __init__(self, db: DbSession):
+        self.db = db
+
+    async def get_user_by_id(self, user_id: uuid.UUID) -> Optional[UserOut]:
+        return await run_service(self.db, UserService, lambda s: s.get_user_by_id(user_id), UserOut)
+
+    async def update_user(self, user_id: uuid.UUID, user_update: UserUpdate) -> Optional[UserOut]:
+        return await run_service(self.db, UserService, lambda s: s.update_user(user_id, user_update), UserOut)
+
+
+class AsyncBoardService:
+    def __init__(self, db: DbSession):
+        self.db = db
+
+    async def get_version(self) -> str:
+        return await run_service(self.db, BoardService, lambda s: s.get_version())
+
+    async def get_board(self, version: str) -> BoardOut:
+        return await run_service(
+            self.db, BoardService,
+            lambda s: {"version": version, "categories": s.get_board()},
+            BoardOut
+        )
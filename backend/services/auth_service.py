@@ -12,8 +12,9 @@ def create_user(db: Session, email: str, username: str, password: str):
     if get_user_by_username(db, username) or get_user_by_email(db, email):
         return None
     
-    hashed_password = get_password_hash(password)
+    return add_user(db, email, username, get_password_hash(password))
 
+def add_user(db: Session, email: str, username: str, hashed_password: str):
     user = User(email=email, username=username, hashed_password=hashed_password)
     db.add(user)
     db.commit()
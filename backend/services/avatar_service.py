@@ -0,0 +1,68 @@
+from sqlalchemy.orm import Session
+from typing import Optional, Tuple
+from io import BytesIO
+import base64
+import binascii
+import hashlib
+
+from PIL import Image, UnidentifiedImageError
+
+from models.avatar import Avatar
+
+MAX_AVATAR_BYTES = 5 * 1024 * 1024
+THUMBNAIL_SIZE = (128, 128)
+# Stored and served content types; always taken from what Pillow detects, never from the upload
+AVATAR_CONTENT_TYPES = {"image/png", "image/jpeg", "image/gif", "image/webp"}
+
+class AvatarService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _decode(self, data_url: str) -> bytes:
+        """Raw bytes of a base64 data URL (or bare base64); the declared type is ignored"""
+        payload = data_url.partition(",")[2] if data_url.startswith("data:") else data_url
+
+        try:
+            data = base64.b64decode(payload, validate=True)
+        except (binascii.Error, ValueError) as exc:
+            raise ValueError("Profile picture is not valid base64") from exc
+
+        if len(data) > MAX_AVATAR_BYTES:
+            raise ValueError("Profile picture must be under 5MB")
+
+        return data
+
+    def _thumbnail(self, data: bytes) -> Tuple[bytes, str, str]:
+        """PNG thumbnail, its content type, and the detected content type of the original"""
+        try:
+            image = Image.open(BytesIO(data))
+            content_type = Image.MIME.get(image.format)
+            if content_type not in AVATAR_CONTENT_TYPES:
+                raise ValueError("Profile picture must be a PNG, JPEG, GIF or WebP image")
+            image.thumbnail(THUMBNAIL_SIZE)
+        except (UnidentifiedImageError, OSError) as exc:
+            raise ValueError("Profile picture is not a supported image") from exc
+
+        output = BytesIO()
+        image.convert("RGBA").save(output, format="PNG", optimize=True)
+        return output.getvalue(), "image/png", content_type
+
+    def store(self, data_url: str) -> str:
+        """Store an uploaded image and return its content hash; identical uploads share one row"""
+        data = self._decode(data_url)
+        digest = hashlib.sha256(data).hexdigest()
+
+        if self.db.get(Avatar, digest) is None:
+            thumbnail, thumbnail_content_type, content_type = self._thumbnail(data)
+            self.db.add(Avatar(
+                hash=digest,
+                content_type=content_type,
+                data=data,
+                thumbnail=thumbnail,
+                thumbnail_content_type=thumbnail_content_type
+            ))
+
+        return digest
+
+    def get_avatar(self, avatar_hash: str) -> Optional[Avatar]:
+        return self.db.get(Avatar, avatar_hash)
@@ -0,0 +1,27 @@
+from sqlalchemy.orm import Session, selectinload
+from typing import List
+
+from core.cache import VersionedCache
+from models.category import Category
+from models.ticket import Ticket
+
+# Version of everything the board shows. Every write that changes the board bumps it
+# in its own transaction, just before committing: the bump takes the counter's row
+# lock, so the new version becomes visible exactly when the write does, whenever
+# that transaction started. Nothing is cached under it; it only backs the ETag.
+board_version = VersionedCache("board", maxsize=0)
+
+class BoardService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_version(self) -> str:
+        return str(board_version.current_version(self.db))
+
+    def get_board(self) -> List[Category]:
+        """All active categories with their ordered tickets and assignees, in three queries"""
+        return self.db.query(Category).options(
+            selectinload(Category.tickets).selectinload(Ticket.assigned_users)
+        ).filter(
+            Category.is_deleted == False
+        ).order_by(Category.position).all()
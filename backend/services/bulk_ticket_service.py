@@ -0,0 +1,394 @@
+from sqlalchemy import BigInteger, Integer, String, DateTime, cast, column, delete, insert, or_, select, update, values
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import joinedload
+from typing import Any, Dict, List, Optional, Set
+import uuid
+
+from core.events import publish_change
+from models.category import Category
+from models.ticket import Ticket, ticket_users
+from models.user import User
+from schemas.ticket import BulkTicketCreate, BulkTicketUpdate, BulkTicketMove, BulkTicketDelete
+from services.board_service import board_version
+from services.ticket_service import TicketService
+from utils.positions import POSITION_GAP
+
+tickets_table = Ticket.__table__
+
+# Columns written by UPDATE ... FROM (VALUES ...), with the types their values are cast to
+UPDATED_COLUMNS = {
+    "id": UUID(as_uuid=True),
+    "title": String(),
+    "description": String(),
+    "expiry_date": DateTime(timezone=True),
+    "category_id": UUID(as_uuid=True),
+    "position": BigInteger(),
+    "history_seq": Integer(),
+}
+RENUMBERED_COLUMNS = {"id": UUID(as_uuid=True), "position": BigInteger()}
+MAX_TITLE_LENGTH = tickets_table.c.title.type.length
+
+
+def update_from_values(types: Dict[str, Any], rows: List[Dict[str, Any]], only_changed_position: bool = False):
+    """One UPDATE of tickets joined to a VALUES list holding a row per ticket"""
+    changes = values(*(column(name, type_) for name, type_ in types.items()), name="changes").data(
+        [tuple(row[name] for name in types) for row in rows]
+    )
+    # VALUES columns are typed by Postgres from their literals, so cast them back explicitly
+    typed = {name: cast(changes.c[name], type_) for name, type_ in types.items()}
+
+    statement = update(tickets_table).where(tickets_table.c.id == typed.pop("id"))
+    if only_changed_position:
+        statement = statement.where(tickets_table.c.position != typed["position"])
+    return statement.values(typed)
+
+
+class BulkTicketService(TicketService):
+    """Applies a batch of ticket operations in one transaction with set-based SQL.
+
+    The operations are validated and played against an in-memory copy of the
+    tickets they touch; the outcome is then written with one INSERT, one batched
+    UPDATE and one DELETE on tickets, one DELETE/INSERT pair on ticket_users and one
+    history INSERT. Every touched category is renumbered POSITION_GAP apart, so the
+    tickets and the columns it touches are row-locked before they are read.
+
+    An operation that fails validation is reported and skipped, or voids the whole
+    batch in atomic mode. A database error aborts the batch either way.
+    """
+
+    def apply(self, operations: List[Any], user_id: uuid.UUID, atomic: bool = False) -> dict:
+        self._lock_rows(operations)
+        self.tickets = self._load_tickets(operations)
+        self.categories = self._load_categories(operations)
+        self.users = self._load_users(operations)
+        self.columns = self._load_columns(operations)
+        self.deleted: Set[uuid.UUID] = set()
+        self.history: List[Dict[str, Any]] = []
+
+        handlers = {
+            "create": self._create,
+            "update": self._update,
+            "move": self._move,
+            "delete": self._delete,
+        }
+
+        results = []
+        for index, operation in enumerate(operations):
+            try:
+                ticket_id = handlers[operation.op](operation, user_id)
+                results.append({"index": index, "op": operation.op, "ok": True, "ticket_id": ticket_id})
+            except ValueError as exc:
+                results.append({
+                    "index": index, "op": operation.op, "ok": False,
+                    "ticket_id": getattr(operation, "ticket_id", None), "error": str(exc)
+                })
+
+        failed = sum(1 for result in results if not result["ok"])
+        committed = not (atomic and failed)
+        if committed:
+            self._write()
+
+        return {
+            "committed": committed,
+            "succeeded": 0 if not committed else len(results) - failed,
+            "failed": failed,
+            "results": results,
+        }
+
+    def _lock_rows(self, operations):
+        """Lock the batch's tickets and every ticket of the columns it touches.
+
+        The batch writes back what it read, so a move, edit or rebalance committed in
+        between would otherwise be overwritten. Rows are locked in (category_id,
+        position, id) order, as rebalance_positions locks a column, and the columns of
+        tickets that turn out to sit outside the locked ones are locked next.
+        """
+        ticket_ids = {operation.ticket_id for operation in operations if operation.op != "create"}
+        columns = {
+            getattr(operation, "target_category_id", None) or getattr(operation, "category_id", None)
+            for operation in operations
+        } - {None}
+        locked: Set[uuid.UUID] = set()
+
+        while ticket_ids or columns - locked:
+            rows = self.db.execute(
+                select(Ticket.id, Ticket.category_id)
+                .where(or_(Ticket.category_id.in_(columns - locked), Ticket.id.in_(ticket_ids)))
+                .order_by(Ticket.category_id, Ticket.position, Ticket.id)
+                .with_for_update()
+            ).all()
+            locked |= columns
+            # Locked tickets can't change column any more, so this settles in two rounds
+            columns |= {category_id for ticket_id, category_id in rows if ticket_id in ticket_ids}
+            if columns <= locked:
+                break
+
+    def _load_tickets(self, operations) -> Dict[uuid.UUID, Dict[str, Any]]:
+        ticket_ids = {operation.ticket_id for operation in operations if operation.op != "create"}
+        if not ticket_ids:
+            return {}
+
+        loaded = self.db.query(Ticket).options(
+            joinedload(Ticket.category),
+            joinedload(Ticket.assigned_users)
+        ).filter(Ticket.id.in_(ticket_ids)).all()
+
+        return {
+            ticket.id: {
+                "new": False,
+                "changed": False,
+                "reassigned": False,
+                "title": ticket.title,
+                "description": ticket.description,
+                "expiry_date": ticket.expiry_date,
+                "category_id": ticket.category_id,
+                "position": ticket.position,
+                "history_seq": ticket.history_seq,
+                "assigned": list(ticket.assigned_users),
+                "original": (ticket.category_id, ticket.position),
+                "category": ticket.category,
+            }
+            for ticket in loaded
+        }
+
+    def _load_categories(self, operations) -> Dict[uuid.UUID, Category]:
+        categories = {state["category_id"]: state.pop("category") for state in self.tickets.values()}
+        wanted = {
+            getattr(operation, "target_category_id", None) or getattr(operation, "category_id", None)
+            for operation in operations
+        } - set(categories) - {None}
+
+        if wanted:
+            for category in self.db.query(Category).filter(Category.id.in_(wanted)).all():
+                categories[category.id] = category
+        return categories
+
+    def _load_users(self, operations) -> Dict[uuid.UUID, User]:
+        user_ids = {
+            assigned_id
+            for operation in operations
+            for assigned_id in (getattr(operation, "assigned_user_ids", None) or [])
+        }
+        if not user_ids:
+            return {}
+        return {user.id: user for user in self.db.query(User).filter(User.id.in_(user_ids)).all()}
+
+    def _load_columns(self, operations) -> Dict[uuid.UUID, List[uuid.UUID]]:
+        """Current ticket order of every category the batch touches"""
+        touched = {state["category_id"] for state in self.tickets.values()}
+        touched |= {category_id for category_id in self.categories}
+
+        columns = {category_id: [] for category_id in touched}
+        if touched:
+            rows = self.db.execute(
+                select(Ticket.id, Ticket.category_id)
+                .where(Ticket.category_id.in_(touched))
+                .order_by(Ticket.category_id, Ticket.position, Ticket.id)
+            ).all()
+            for ticket_id, category_id in rows:
+                columns[category_id].append(ticket_id)
+        return columns
+
+    def _state(self, ticket_id: uuid.UUID) -> Dict[str, Any]:
+        state = self.tickets.get(ticket_id)
+        if state is None or ticket_id in self.deleted:
+            raise ValueError("Ticket not found")
+        return state
+
+    def _category(self, category_id: uuid.UUID) -> Category:
+        category = self.categories.get(category_id)
+        if category is None:
+            raise ValueError("Category not found")
+        return category
+
+    def _check_title(self, title: Optional[str]):
+        """Column constraints checked per operation, so they fail it instead of the whole write"""
+        if title is None:
+            raise ValueError("Title is required")
+        if len(title) > MAX_TITLE_LENGTH:
+            raise ValueError(f"Title must be at most {MAX_TITLE_LENGTH} characters")
+
+    def _assignees(self, user_ids: List[uuid.UUID]) -> List[User]:
+        unknown = [str(user_id) for user_id in user_ids if user_id not in self.users]
+        if unknown:
+            raise ValueError(f"Unknown assigned users: {', '.join(unknown)}")
+        return [self.users[user_id] for user_id in dict.fromkeys(user_ids)]
+
+    def _snapshot(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """History values of a ticket state, shaped like TicketService._get_ticket_values"""
+        return {
+            "title": state["title"],
+            "description": state["description"],
+            "expiry_date": state["expiry_date"].isoformat() if state["expiry_date"] else None,
+            "position": state["position"],
+            "category": self.categories[state["category_id"]].name,
+            "assigned_users": [user.username for user in state["assigned"]]
+        }
+
+    def _place(self, ticket_id: uuid.UUID, state: Dict[str, Any], category_id: uuid.UUID, index: Optional[int] = None):
+        """Move a ticket to `index` of a column (the end when None); its position is set on write"""
+        if ticket_id in self.columns.get(state["category_id"], []):
+            self.columns[state["category_id"]].remove(ticket_id)
+
+        column = self.columns[category_id]
+        column.insert(len(column) if index is None else min(max(index, 0), len(column)), ticket_id)
+        state["category_id"] = category_id
+        state["position"] = None
+
+    def _record(self, ticket_id: uuid.UUID, user_id: uuid.UUID, action_type: str,
+                old_values: Optional[Dict[str, Any]], state: Dict[str, Any], **category_names):
+        state["history_seq"] += 1
+        self.history.append({
+            "ticket_id": ticket_id,
+            "user_id": user_id,
+            "action_type": action_type,
+            "old_values": old_values,
+            "new_values": self._snapshot(state),
+            "sequence": state["history_seq"],
+            **category_names
+        })
+
+    def _create(self, operation: BulkTicketCreate, user_id: uuid.UUID) -> uuid.UUID:
+        category = self._category(operation.category_id)
+        self._check_title(operation.title)
+        assigned = self._assignees(operation.assigned_user_ids)
+        ticket_id = uuid.uuid4()
+        state = self.tickets[ticket_id] = {
+            "new": True,
+            "changed": True,
+            "reassigned": True,
+            "title": operation.title,
+            "description": operation.description,
+            "expiry_date": operation.expiry_date,
+            "category_id": category.id,
+            "position": None,
+            "history_seq": 0,
+            "assigned": assigned,
+            "user_id": user_id,
+        }
+        self._place(ticket_id, state, category.id)
+        self._record(ticket_id, user_id, "created", None, state, to_category_name=category.name)
+        return ticket_id
+
+    def _update(self, operation: BulkTicketUpdate, user_id: uuid.UUID) -> uuid.UUID:
+        # Validate everything before touching the state, so a failed operation leaves no trace
+        state = self._state(operation.ticket_id)
+        old_category = new_category = self.categories[state["category_id"]]
+        if operation.category_id and operation.category_id != state["category_id"]:
+            new_category = self._category(operation.category_id)
+
+        fields = operation.model_dump(exclude_unset=True, exclude={"op", "ticket_id", "category_id", "assigned_user_ids"})
+        if "title" in fields:
+            self._check_title(fields["title"])
+        assigned = self._assignees(operation.assigned_user_ids) if operation.assigned_user_ids is not None else None
+
+        old_values = self._snapshot(state)
+        if new_category is not old_category:
+            self._place(operation.ticket_id, state, new_category.id)
+
+        state.update(fields)
+
+        if assigned is not None:
+            state["assigned"] = assigned
+            state["reassigned"] = True
+
+        state["changed"] = True
+        if new_category is not old_category:
+            self._record(operation.ticket_id, user_id, "moved", old_values, state,
+                         from_category_name=old_category.name, to_category_name=new_category.name)
+        else:
+            self._record(operation.ticket_id, user_id, "updated", old_values, state)
+        return operation.ticket_id
+
+    def _move(self, operation: BulkTicketMove, user_id: uuid.UUID) -> uuid.UUID:
+        state = self._state(operation.ticket_id)
+        target_category = self._category(operation.target_category_id)
+        old_values = self._snapshot(state)
+        old_category = self.categories[state["category_id"]]
+
+        self._place(operation.ticket_id, state, target_category.id, operation.target_position)
+
+        state["changed"] = True
+        if target_category is not old_category:
+            self._record(operation.ticket_id, user_id, "moved", old_values, state,
+                         from_category_name=old_category.name, to_category_name=target_category.name)
+        else:
+            self._record(operation.ticket_id, user_id, "updated", old_values, state)
+        return operation.ticket_id
+
+    def _delete(self, operation: BulkTicketDelete, user_id: uuid.UUID) -> uuid.UUID:
+        state = self._state(operation.ticket_id)
+        self.columns[state["category_id"]].remove(operation.ticket_id)
+        self.deleted.add(operation.ticket_id)
+        return operation.ticket_id
+
+    def _write(self):
+        final_positions = {
+            ticket_id: (rank + 1) * POSITION_GAP
+            for column in self.columns.values()
+            for rank, ticket_id in enumerate(column)
+        }
+        for entry in self.history:
+            # Snapshots taken while a ticket was between columns get its final position
+            for values in (entry["old_values"], entry["new_values"]):
+                if values is not None and values["position"] is None:
+                    values["position"] = final_positions[entry["ticket_id"]]
+
+        created, updated, assignments = [], [], []
+        for ticket_id, state in self.tickets.items():
+            if ticket_id in self.deleted:
+                continue
+            state["position"] = final_positions[ticket_id]
+
+            if state["new"]:
+                created.append({
+                    "id": ticket_id,
+                    "title": state["title"],
+                    "description": state["description"],
+                    "expiry_date": state["expiry_date"],
+                    "category_id": state["category_id"],
+                    "position": state["position"],
+                    "user_id": state["user_id"],
+                    "history_seq": state["history_seq"],
+                })
+            elif state["changed"] or (state["category_id"], state["position"]) != state["original"]:
+                updated.append({"id": ticket_id, **{name: state[name] for name in UPDATED_COLUMNS if name != "id"}})
+
+            if state["reassigned"]:
+                assignments.extend({"ticket_id": ticket_id, "user_id": user.id} for user in state["assigned"])
+
+        # Tickets that were only renumbered aren't in self.tickets
+        loaded = set(self.tickets)
+        renumbered = [
+            {"id": ticket_id, "position": position}
+            for ticket_id, position in final_positions.items() if ticket_id not in loaded
+        ]
+
+        existing_deleted = [ticket_id for ticket_id in self.deleted if not self.tickets[ticket_id]["new"]]
+        reassigned = [
+            ticket_id for ticket_id, state in self.tickets.items()
+            if state["reassigned"] and not state["new"] and ticket_id not in self.deleted
+        ]
+
+        if existing_deleted:
+            self.db.execute(delete(tickets_table).where(tickets_table.c.id.in_(existing_deleted)))
+        if created:
+            self.db.execute(insert(tickets_table), created)
+        if updated:
+            self.db.execute(update_from_values(UPDATED_COLUMNS, updated))
+        if renumbered:
+            self.db.execute(update_from_values(RENUMBERED_COLUMNS, renumbered, only_changed_position=True))
+        if reassigned:
+            self.db.execute(delete(ticket_users).where(ticket_users.c.ticket_id.in_(reassigned)))
+        if assignments:
+            self.db.execute(insert(ticket_users), assignments)
+
+        for entry in self.history:
+            if entry["ticket_id"] not in self.deleted:
+                self._create_history_record(**entry)
+
+        # One event for the batch: clients refetch the touched columns
+        publish_change(self.db, "tickets.bulk", category_ids=list(self.columns),
+                       created=len(created), updated=len(updated), deleted=len(existing_deleted))
+        board_version.bump(self.db)
+        self.db.commit()
@@ -1,11 +1,25 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from sqlalchemy import and_, update
-from typing import List, Optional
+from typing import List, Optional, Tuple, Union
+import os
 import uuid
 
+from core.cache import VersionedCache
+from core.events import publish_change
 from models.category import Category
 from models.ticket import Ticket
-from schemas.category import CategoryCreate, CategoryUpdate, CategoryReorder
+from schemas.category import CategoryCreate, CategoryUpdate, CategoryReorder, CategoryOut
+from schemas.ticket import TicketOut
+from schemas.combined import CategoryWithTickets
+from services.board_service import board_version
+from services.ticket_service import TicketService
+
+# Active categories as schemas: the listing under "list", single categories by id
+category_cache = VersionedCache(
+    "categories",
+    maxsize=int(os.getenv("CATEGORY_CACHE_SIZE", 256)),
+    max_staleness=float(os.getenv("CATEGORY_CACHE_MAX_STALENESS", 0))
+)
 
 class CategoryService:
     def __init__(self, db: Session):
@@ -21,14 +35,52 @@ class CategoryService:
             user_id=user_id
         )
         self.db.add(db_category)
+        self.db.flush()
+        publish_change(self.db, "category.created", category_id=db_category.id, position=db_category.position)
+        category_cache.bump(self.db)
+        board_version.bump(self.db)
         self.db.commit()
         self.db.refresh(db_category)
         return db_category
 
-    def get_categories(self, user_id: uuid.UUID) -> List[Category]:
-        return self.db.query(Category).filter(
+    def get_version(self) -> int:
+        """Version of the category data; changes whenever a category is written"""
+        return category_cache.current_version(self.db)
+
+    def get_categories(self, user_id: uuid.UUID) -> List[CategoryOut]:
+        return list(category_cache.get(self.db, "list", self._load_categories))
+
+    def _load_categories(self):
+        categories = self.db.query(Category).filter(
              Category.is_deleted == False
         ).order_by(Category.position).all()
+        return tuple(CategoryOut.model_validate(category) for category in categories)
+
+    def get_category_detail(self, category_id: uuid.UUID,
+                            fields: Optional[Tuple[str, ...]] = None) -> Union[CategoryWithTickets, dict, None]:
+        """Category from the cache with its tickets, which are always read fresh.
+
+        With `fields` the tickets are projected to those fields and a plain dict is returned.
+        """
+        category = category_cache.get(self.db, category_id, lambda: self._load_category(category_id))
+        if not category:
+            return None
+
+        if fields is not None:
+            listing = TicketService(self.db).get_tickets(category_id, fields=fields)
+            return {**category.model_dump(), "tickets": listing["items"]}
+
+        tickets = self.db.query(Ticket).options(selectinload(Ticket.assigned_users)).filter(
+            Ticket.category_id == category_id
+        ).order_by(Ticket.position, Ticket.id).all()
+        return CategoryWithTickets(
+            **category.model_dump(),
+            tickets=[TicketOut.model_validate(ticket) for ticket in tickets]
+        )
+
+    def _load_category(self, category_id: uuid.UUID) -> Optional[CategoryOut]:
+        category = self.get_category(category_id)
+        return CategoryOut.model_validate(category) if category else None
 
     def get_category(self, category_id: uuid.UUID) -> Optional[Category]:
         return self.db.query(Category).filter(
@@ -44,6 +96,9 @@ class CategoryService:
         for field, value in update_data.items():
             setattr(db_category, field, value)
 
+        publish_change(self.db, "category.updated", category_id=db_category.id)
+        category_cache.bump(self.db)
+        board_version.bump(self.db)
         self.db.commit()
         self.db.refresh(db_category)
         return db_category
@@ -60,6 +115,9 @@ class CategoryService:
 
         # Soft delete
         db_category.is_deleted = True
+        publish_change(self.db, "category.deleted", category_id=db_category.id)
+        category_cache.bump(self.db)
+        board_version.bump(self.db)
         self.db.commit()
         return {"success": True}
 
@@ -72,6 +130,9 @@ class CategoryService:
             mappings = [{"id": item.id, "position": item.position} for item in category_positions]
             
             self.db.bulk_update_mappings(Category, mappings)
+            publish_change(self.db, "categories.reordered", category_ids=[item.id for item in category_positions])
+            category_cache.bump(self.db)
+            board_version.bump(self.db)
             self.db.commit()
 
             return True
@@ -0,0 +1,152 @@
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List, Optional
+import gzip
+import logging
+import os
+import re
+
+logger = logging.getLogger("app")
+
+# ticket_history is range partitioned by created_at, one partition per calendar
+# month named ticket_history_yYYYYmMM, plus ticket_history_default for rows
+# outside every monthly range. Partitions are created ahead of time by
+# `python manage_history.py maintain`; old ones are archived and detached by the
+# retention policy.
+HISTORY_PARTITION_MONTHS_AHEAD = int(os.getenv("HISTORY_PARTITION_MONTHS_AHEAD", 3))
+HISTORY_RETENTION_MONTHS = int(os.getenv("HISTORY_RETENTION_MONTHS", 0))  # 0 keeps everything
+HISTORY_ARCHIVE_DIR = os.getenv("HISTORY_ARCHIVE_DIR", "history_archive")
+
+# Feed queries look at this much recent history first so the planner can prune
+# older partitions; they fall back to the whole table when the window runs short.
+HISTORY_FEED_WINDOW = timedelta(days=int(os.getenv("HISTORY_FEED_WINDOW_DAYS", 31)))
+
+# Slack for comparing history timestamps (app clock) with row timestamps (database clock)
+HISTORY_CLOCK_SKEW = timedelta(minutes=5)
+
+PARENT_TABLE = "ticket_history"
+DEFAULT_PARTITION = "ticket_history_default"
+PARTITION_NAME = re.compile(r"^ticket_history_y(\d{4})m(\d{2})$")
+
+
+def month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(value: date, months: int) -> date:
+    month = value.month - 1 + months
+    return date(value.year + month // 12, month % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARENT_TABLE}_y{month.year:04d}m{month.month:02d}"
+
+
+def feed_window_start(until: Optional[datetime] = None) -> datetime:
+    """Lower created_at bound of the recent window for a feed page ending at `until`"""
+    return (until or datetime.now(timezone.utc)) - HISTORY_FEED_WINDOW
+
+
+def list_partitions(db: Session) -> Dict[date, str]:
+    """Monthly partitions currently attached to ticket_history, by month"""
+    names = db.execute(text("""
+        SELECT child.relname
+        FROM pg_inherits
+        JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE parent.relname = :parent
+    """), {"parent": PARENT_TABLE}).scalars().all()
+
+    partitions = {}
+    for name in names:
+        match = PARTITION_NAME.match(name)
+        if match:
+            partitions[date(int(match.group(1)), int(match.group(2)), 1)] = name
+    return partitions
+
+
+def create_partition(db: Session, month: date) -> str:
+    """Create the partition for `month`, moving any of its rows out of the default partition"""
+    name = partition_name(month)
+    bounds = {"start": month, "end": add_months(month, 1)}
+
+    db.execute(text(f"CREATE TABLE {name} (LIKE {PARENT_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+    db.execute(text(f"""
+        WITH moved AS (
+            DELETE FROM {DEFAULT_PARTITION}
+            WHERE created_at >= :start AND created_at < :end
+            RETURNING *
+        )
+        INSERT INTO {name} SELECT * FROM moved
+    """), bounds)
+    db.execute(text(f"""
+        ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {name}
+        FOR VALUES FROM ('{bounds["start"]}') TO ('{bounds["end"]}')
+    """))
+    return name
+
+
+def ensure_partitions(db: Session, months_ahead: int = HISTORY_PARTITION_MONTHS_AHEAD,
+                      today: Optional[date] = None) -> List[str]:
+    """Create any missing monthly partitions from the current month to `months_ahead` months out"""
+    current = month_start(today or datetime.now(timezone.utc).date())
+    existing = list_partitions(db)
+    created = []
+
+    for offset in range(months_ahead + 1):
+        month = add_months(current, offset)
+        if month not in existing:
+            created.append(create_partition(db, month))
+
+    db.commit()
+    return created
+
+
+def archive_partition(db: Session, name: str, directory: str) -> str:
+    """Export a partition to `directory`/<name>.ndjson.gz, one JSON row per line"""
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{name}.ndjson.gz")
+    partial = f"{path}.partial"
+
+    rows = db.connection().execution_options(yield_per=1000).execute(
+        text(f"SELECT row_to_json(h)::text FROM {name} h ORDER BY created_at, id")
+    )
+    with gzip.open(partial, "wt", encoding="utf-8") as archive:
+        for (line,) in rows:
+            archive.write(line + "\n")
+        archive.flush()
+        os.fsync(archive.fileobj.fileno())
+
+    os.replace(partial, path)
+    return path
+
+
+def apply_retention(db: Session, keep_months: int = HISTORY_RETENTION_MONTHS,
+                    directory: str = HISTORY_ARCHIVE_DIR, drop: bool = True,
+                    today: Optional[date] = None) -> List[str]:
+    """Archive and detach the monthly partitions older than `keep_months` months.
+
+    A partition is only detached after its archive has been written. Detached
+    partitions are dropped unless `drop` is False.
+    """
+    if keep_months <= 0:
+        return []
+
+    cutoff = add_months(month_start(today or datetime.now(timezone.utc).date()), -keep_months)
+    archived = []
+
+    for month, name in sorted(list_partitions(db).items()):
+        if month >= cutoff:
+            continue
+
+        path = archive_partition(db, name, directory)
+        db.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}"))
+        if drop:
+            db.execute(text(f"DROP TABLE {name}"))
+        db.commit()
+
+        logger.info("Archived ticket history partition %s to %s", name, path)
+        archived.append(path)
+
+    return archived
@@ -0,0 +1,393 @@
+from sqlalchemy import event, insert, null
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import Session
+from datetime import datetime, timezone
+from threading import Lock, Thread, Event
+from typing import Any, Dict, List, Optional, Tuple
+from collections import Counter
+import atexit
+import fcntl
+import glob
+import json
+import logging
+import os
+import queue
+import time
+import uuid
+
+from core.database import db_session
+from models.ticket_history import TicketHistory
+
+logger = logging.getLogger("app")
+
+# sync:  history rows are buffered per session and written with one multi-row INSERT
+#        just before the mutation's transaction commits.
+# async: after the commit, rows are appended to an on-disk journal and fsynced
+#        before the request is answered, then handed to a background writer that
+#        inserts them in batches. The journal is the durable copy and the queue only
+#        the fast path: rows the bounded queue can't take (it never blocks the
+#        committing thread, which is the event loop in DB_ASYNC_MODE), batches that
+#        can't be written, and anything queued when the process dies stay in the
+#        journal and are written by the next writer that starts.
+HISTORY_WRITER_MODE = os.getenv("HISTORY_WRITER_MODE", "sync").lower()
+HISTORY_QUEUE_SIZE = int(os.getenv("HISTORY_QUEUE_SIZE", 10000))
+HISTORY_BATCH_SIZE = int(os.getenv("HISTORY_BATCH_SIZE", 500))
+HISTORY_FLUSH_INTERVAL = float(os.getenv("HISTORY_FLUSH_INTERVAL", 0.2))
+# Journal segments are <prefix>.<pid>.<id>.ndjson; a new one is started every this many rows
+HISTORY_JOURNAL_PATH = os.getenv("HISTORY_JOURNAL_PATH", "history_journal")
+HISTORY_JOURNAL_SEGMENT_ROWS = int(os.getenv("HISTORY_JOURNAL_SEGMENT_ROWS", 50000))
+
+BUFFER_KEY = "history_buffer"
+JSON_FIELDS = ("old_values", "new_values")
+
+
+class HistoryMetrics:
+    def __init__(self):
+        self._lock = Lock()
+        self.flushes = 0
+        self.records = 0
+        self.flush_seconds_total = 0.0
+        self.flush_seconds_max = 0.0
+        self.last_batch_size = 0
+        self.max_batch_size = 0
+        self.dropped = 0
+        self.journaled = 0
+        self.deferred = 0
+        self.replayed = 0
+
+    def observe_flush(self, batch_size: int, seconds: float):
+        with self._lock:
+            self.flushes += 1
+            self.records += batch_size
+            self.flush_seconds_total += seconds
+            self.flush_seconds_max = max(self.flush_seconds_max, seconds)
+            self.last_batch_size = batch_size
+            self.max_batch_size = max(self.max_batch_size, batch_size)
+
+    def observe_dropped(self, count: int):
+        with self._lock:
+            self.dropped += count
+
+    def observe_journaled(self, count: int):
+        with self._lock:
+            self.journaled += count
+
+    def observe_deferred(self, count: int):
+        with self._lock:
+            self.deferred += count
+
+    def observe_replayed(self, count: int):
+        with self._lock:
+            self.replayed += count
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "mode": HISTORY_WRITER_MODE,
+                "queue_depth": _writer.queue.qsize() if _writer else 0,
+                "flushes": self.flushes,
+                "records": self.records,
+                "flush_seconds_total": self.flush_seconds_total,
+                "flush_seconds_max": self.flush_seconds_max,
+                "last_batch_size": self.last_batch_size,
+                "max_batch_size": self.max_batch_size,
+                "dropped": self.dropped,
+                "journaled": self.journaled,
+                "deferred": self.deferred,
+                "replayed": self.replayed,
+            }
+
+
+history_metrics = HistoryMetrics()
+
+
+def _insert_batch(db: Session, rows: List[Dict[str, Any]]):
+    # None must be SQL NULL here, not the JSON 'null' a Core insert would write
+    values = [
+        {**row, **{key: null() for key in JSON_FIELDS if row[key] is None}}
+        for row in rows
+    ]
+    started = time.perf_counter()
+    db.execute(insert(TicketHistory).values(values))
+    history_metrics.observe_flush(len(rows), time.perf_counter() - started)
+
+
+class HistoryBuffer:
+    """History rows collected during one session's unit of work"""
+
+    def __init__(self):
+        self.rows: List[Dict[str, Any]] = []
+
+    def add(self, ticket_id: uuid.UUID, user_id: uuid.UUID, action_type: str,
+            old_values: Optional[Dict[str, Any]] = None,
+            new_values: Optional[Dict[str, Any]] = None,
+            from_category_name: Optional[str] = None,
+            to_category_name: Optional[str] = None,
+            is_checkpoint: bool = True):
+        self.rows.append({
+            "id": uuid.uuid4(),
+            "ticket_id": ticket_id,
+            "user_id": user_id,
+            "action_type": action_type,
+            "old_values": old_values,
+            "new_values": new_values,
+            "from_category_name": from_category_name,
+            "to_category_name": to_category_name,
+            "is_checkpoint": is_checkpoint,
+            "created_at": datetime.now(timezone.utc),
+        })
+
+    def discard(self, ticket_id: uuid.UUID):
+        """Forget the rows of a ticket deleted in this unit of work; its history cascades away with it"""
+        self.rows = [row for row in self.rows if row["ticket_id"] != ticket_id]
+
+    def drain(self) -> List[Dict[str, Any]]:
+        rows, self.rows = self.rows, []
+        return rows
+
+
+def history_buffer(db: Session) -> HistoryBuffer:
+    """The history buffer bound to a session, created on first use"""
+    buffer = db.info.get(BUFFER_KEY)
+    if buffer is None:
+        buffer = db.info[BUFFER_KEY] = HistoryBuffer()
+    return buffer
+
+
+@event.listens_for(Session, "before_commit")
+def _write_buffered_history(session: Session):
+    buffer = session.info.get(BUFFER_KEY)
+    if buffer and buffer.rows and HISTORY_WRITER_MODE != "async":
+        _insert_batch(session, buffer.drain())
+
+
+@event.listens_for(Session, "after_commit")
+def _enqueue_buffered_history(session: Session):
+    buffer = session.info.get(BUFFER_KEY)
+    if buffer and buffer.rows and HISTORY_WRITER_MODE == "async":
+        get_writer().enqueue(buffer.drain())
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_buffered_history(session: Session):
+    buffer = session.info.get(BUFFER_KEY)
+    if buffer:
+        buffer.drain()
+
+
+def _encode(row: Dict[str, Any]) -> str:
+    return json.dumps(row, default=str) + "\n"
+
+
+def _decode(line: str) -> Dict[str, Any]:
+    row = json.loads(line)
+    row["id"] = uuid.UUID(row["id"])
+    row["ticket_id"] = uuid.UUID(row["ticket_id"])
+    row["user_id"] = uuid.UUID(row["user_id"])
+    row["created_at"] = datetime.fromisoformat(row["created_at"])
+    return row
+
+
+class HistoryJournal:
+    """Append-only NDJSON segments holding every async history row until it is written.
+
+    Each process appends to its own segments and holds an flock on them while they
+    are open, so a replay only ever picks up segments whose process is gone. A
+    segment is removed once all of its rows are in the database. Rows keep their
+    ids, so a row written again on replay fails its primary key and is skipped.
+    """
+
+    def __init__(self, prefix: str, segment_rows: int):
+        self.prefix = prefix
+        self.segment_rows = segment_rows
+        self._lock = Lock()
+        self._files: Dict[str, Any] = {}
+        self._pending: Dict[str, int] = {}
+        self._segment: Optional[str] = None
+        self._segment_rows = 0
+
+    def append(self, rows: List[Dict[str, Any]]) -> str:
+        """Write and fsync `rows`; returns the segment holding them"""
+        with self._lock:
+            if self._segment is None or self._segment_rows >= self.segment_rows:
+                self._start_segment()
+            journal = self._files[self._segment]
+            journal.write("".join(_encode(row) for row in rows))
+            journal.flush()
+            os.fsync(journal.fileno())
+            self._segment_rows += len(rows)
+            self._pending[self._segment] += len(rows)
+            history_metrics.observe_journaled(len(rows))
+            return self._segment
+
+    def written(self, counts: Dict[str, int]):
+        """Record rows of each segment as being in the database"""
+        with self._lock:
+            for segment, count in counts.items():
+                self._pending[segment] -= count
+                if not self._pending[segment] and segment != self._segment:
+                    self._remove(segment)
+
+    def close(self):
+        """Remove the fully written segments and release the rest for the next replay"""
+        with self._lock:
+            for segment in list(self._files):
+                if self._pending[segment]:
+                    self._files.pop(segment).close()
+                else:
+                    self._remove(segment)
+            self._segment = None
+
+    def _start_segment(self):
+        previous = self._segment
+        self._segment = f"{self.prefix}.{os.getpid()}.{uuid.uuid4().hex}.ndjson"
+        journal = open(self._segment, "a")
+        fcntl.flock(journal, fcntl.LOCK_EX)
+        self._files[self._segment] = journal
+        self._pending[self._segment] = 0
+        self._segment_rows = 0
+        if previous is not None and not self._pending[previous]:
+            self._remove(previous)
+
+    def _remove(self, segment: str):
+        os.remove(segment)
+        self._files.pop(segment).close()
+        del self._pending[segment]
+
+    def orphans(self) -> List[str]:
+        """Segments left behind by processes that are no longer running"""
+        return sorted(glob.glob(f"{glob.escape(self.prefix)}.*.ndjson"))
+
+
+class AsyncHistoryWriter:
+    """Background thread that drains the history queue in batches"""
+
+    def __init__(self, maxsize: int, batch_size: int, interval: float, journal: HistoryJournal):
+        self.queue: "queue.Queue[Tuple[str, Dict[str, Any]]]" = queue.Queue(maxsize)
+        self.batch_size = batch_size
+        self.interval = interval
+        self.journal = journal
+        self._stopping = Event()
+        self._thread = Thread(target=self._run, name="history-writer", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def enqueue(self, rows: List[Dict[str, Any]]):
+        """Journal the rows, then queue them; returns once they are on disk"""
+        segment = self.journal.append(rows)
+        for index, row in enumerate(rows):
+            try:
+                self.queue.put_nowait((segment, row))
+            except queue.Full:
+                logger.warning("History queue full; %d rows stay in %s for the next replay", len(rows) - index, segment)
+                history_metrics.observe_deferred(len(rows) - index)
+                return
+
+    def close(self, timeout: float = 10.0):
+        self._stopping.set()
+        self._thread.join(timeout)
+        # A writer still busy keeps its segments locked until the process exits
+        if not self._thread.is_alive():
+            self.journal.close()
+
+    def _next_batch(self) -> List[Tuple[str, Dict[str, Any]]]:
+        try:
+            batch = [self.queue.get(timeout=self.interval)]
+        except queue.Empty:
+            return []
+
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        self._replay_orphans()
+        while not (self._stopping.is_set() and self.queue.empty()):
+            batch = self._next_batch()
+            if batch and self._write([row for _, row in batch]):
+                self.journal.written(Counter(segment for segment, _ in batch))
+
+    def _write(self, batch: List[Dict[str, Any]]) -> bool:
+        """Insert a batch; False if it has to stay in the journal"""
+        with db_session() as db:
+            try:
+                _insert_batch(db, batch)
+                db.commit()
+            except IntegrityError:
+                db.rollback()
+                self._write_rows(db, batch)
+            except SQLAlchemyError:
+                db.rollback()
+                logger.exception("History batch of %d rows could not be written; it stays in the journal", len(batch))
+                history_metrics.observe_deferred(len(batch))
+                return False
+        return True
+
+    def _write_rows(self, db: Session, batch: List[Dict[str, Any]]):
+        """Retry a failed batch row by row, skipping rows already written (a replay)
+        or whose ticket was deleted in the meantime"""
+        for row in batch:
+            try:
+                with db.begin_nested():
+                    _insert_batch(db, [row])
+            except IntegrityError:
+                history_metrics.observe_dropped(1)
+        db.commit()
+
+    def _replay_orphans(self):
+        """Write the journal segments of processes that are gone, on the writer thread.
+
+        Rows go straight to the database in batches, so a large journal can't fill
+        the queue; a segment that can't be written completely is left for later.
+        """
+        for path in self.journal.orphans():
+            with open(path) as segment:
+                try:
+                    fcntl.flock(segment, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    # Still held by a running process
+                    continue
+
+                replayed = 0
+                batch: List[Dict[str, Any]] = []
+                for line in segment:
+                    if not line.endswith("\n"):
+                        # Torn final write: that commit was never acknowledged
+                        break
+                    batch.append(_decode(line))
+                    if len(batch) == self.batch_size:
+                        if not self._write(batch):
+                            return
+                        replayed += len(batch)
+                        batch = []
+                if batch:
+                    if not self._write(batch):
+                        return
+                    replayed += len(batch)
+
+                os.remove(path)
+                history_metrics.observe_replayed(replayed)
+                logger.info("Replayed %d history rows from %s", replayed, path)
+
+
+_writer: Optional[AsyncHistoryWriter] = None
+_writer_lock = Lock()
+
+
+def get_writer() -> AsyncHistoryWriter:
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            journal = HistoryJournal(HISTORY_JOURNAL_PATH, HISTORY_JOURNAL_SEGMENT_ROWS)
+            _writer = AsyncHistoryWriter(HISTORY_QUEUE_SIZE, HISTORY_BATCH_SIZE, HISTORY_FLUSH_INTERVAL, journal)
+            _writer.start()
+            atexit.register(_writer.close)
+        return _writer
+
+
+def history_writer_stats() -> Dict[str, Any]:
+    return history_metrics.snapshot()
@@ -1,35 +1,125 @@
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, update
-from typing import List, Optional, Dict, Any
+from sqlalchemy.orm import Session, joinedload, selectinload, aliased
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy import and_, or_, insert, update, select, func, text, tuple_, cast, column, values, literal_column, Numeric, DateTime
+from sqlalchemy.dialects.postgresql import UUID
+from typing import List, Optional, Dict, Any, Iterable, Set, Tuple
+from collections import defaultdict
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+import html
 import uuid
 import json
 
-from models.ticket import Ticket
+from core.database import db_session
+from core.events import publish_change
+from models.ticket import Ticket, ticket_users
 from models.category import Category
 from models.ticket_history import TicketHistory
 from models.user import User
 from schemas.ticket import TicketCreate, TicketUpdate
+from schemas.user import avatar_url
+from services.board_service import board_version
+from services.history_writer import history_buffer
+from services.history_partitions import HISTORY_CLOCK_SKEW, feed_window_start
+from utils.positions import POSITION_GAP, position_between, gap_exhausted
+from utils.cursor import encode_cursor, decode_cursor
+from utils.history_diff import is_checkpoint, diff_values, reconstruct
+
+DEFAULT_CURSOR_PAGE_SIZE = 50
+
+# Columns read by the unpaged listing, named after the TicketWithCategory fields
+LISTING_TICKET_COLUMNS = (
+    Ticket.id, Ticket.title, Ticket.description, Ticket.expiry_date, Ticket.position,
+    Ticket.category_id, Ticket.user_id, Ticket.created_at, Ticket.updated_at
+)
+LISTING_CATEGORY_COLUMNS = (
+    Category.id, Category.name, Category.color, Category.position,
+    Category.user_id, Category.created_at, Category.updated_at
+)
+
+# Sparse fieldsets for the ticket listings (?view= or ?fields=). Column fields are
+# projected in SQL; the related ones are loaded only when asked for.
+TICKET_COLUMN_FIELDS = {column.key: column for column in LISTING_TICKET_COLUMNS}
+TICKET_RELATED_FIELDS = ("assigned_user_ids", "assigned_users", "category")
+TICKET_VIEWS = {
+    "card": ("id", "title", "position", "category_id", "expiry_date", "assigned_user_ids"),
+    "full": None,
+}
+
+# Full-text search over Ticket.search_vector. Headlines mark matches with control
+# characters so the text can be HTML-escaped before the <mark> tags go in.
+SEARCH_CONFIG = literal_column("'english'::regconfig")
+DEFAULT_SEARCH_PAGE_SIZE = 20
+HIGHLIGHT_START, HIGHLIGHT_STOP = "\x02", "\x03"
+TITLE_HEADLINE_OPTIONS = f"StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_STOP}, HighlightAll=true"
+SNIPPET_HEADLINE_OPTIONS = f"StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_STOP}, MaxFragments=2, MaxWords=20, MinWords=5"
+
+
+def highlight(headline: str) -> str:
+    """HTML-escape a ts_headline result and turn its match markers into <mark> tags"""
+    return html.escape(headline).replace(HIGHLIGHT_START, "<mark>").replace(HIGHLIGHT_STOP, "</mark>")
+
+
+def resolve_ticket_fields(view: str = "full", fields: Optional[str] = None) -> Optional[Tuple[str, ...]]:
+    """Fields a listing returns per ticket; None means the full TicketWithCategory shape"""
+    if not fields:
+        return TICKET_VIEWS[view]
+
+    selected = tuple(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+    unknown = [name for name in selected if name not in TICKET_COLUMN_FIELDS and name not in TICKET_RELATED_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown ticket fields: {', '.join(unknown)}")
+    return selected
+
+
+def listing_items(ticket_rows: Iterable[Any], category_rows: Iterable[Any],
+                  assignment_rows: Iterable[Any]) -> List[Dict[str, Any]]:
+    """Build TicketWithCategory-shaped dicts straight from Core rows"""
+    categories = {row.id: dict(row._mapping) for row in category_rows}
+
+    assigned = defaultdict(list)
+    for ticket_id, user_id, username, avatar_hash in assignment_rows:
+        assigned[ticket_id].append({
+            "id": user_id, "username": username, "profile_picture": avatar_url(user_id, avatar_hash)
+        })
+
+    return [
+        {**row._mapping, "assigned_users": assigned.get(row.id, []), "category": categories[row.category_id]}
+        for row in ticket_rows
+    ]
+
 
 class TicketService:
     def __init__(self, db: Session):
         self.db = db
+        # Categories whose position gaps ran out during this unit of work
+        self.pending_rebalance: Set[uuid.UUID] = set()
 
     def _create_history_record(self, ticket_id: uuid.UUID, user_id: uuid.UUID, action_type: str, 
                               old_values: Optional[Dict[str, Any]] = None, 
                               new_values: Optional[Dict[str, Any]] = None,
                               from_category_name: Optional[str] = None,
-                              to_category_name: Optional[str] = None):
-        """Create a history record for ticket changes"""
-        history_record = TicketHistory(
+                              to_category_name: Optional[str] = None,
+                              sequence: Optional[int] = None):
+        """Queue a history record for ticket changes; it is written with the mutation's commit.
+
+        `sequence` is the ticket's history_seq for this record; between checkpoints
+        only the changed keys of old_values/new_values are stored.
+        """
+        checkpoint = sequence is None or is_checkpoint(action_type, sequence)
+        if not checkpoint:
+            old_values, new_values = diff_values(old_values, new_values)
+
+        history_buffer(self.db).add(
             ticket_id=ticket_id,
             user_id=user_id,
             action_type=action_type,
             old_values=old_values,
             new_values=new_values,
             from_category_name=from_category_name,
-            to_category_name=to_category_name
+            to_category_name=to_category_name,
+            is_checkpoint=checkpoint
         )
-        self.db.add(history_record)
 
     def _get_ticket_values(self, ticket: Ticket) -> Dict[str, Any]:
         """Extract ticket values for history tracking"""
@@ -50,34 +140,65 @@ class TicketService:
             users = self.db.query(User).filter(User.id.in_(user_ids)).all()
             ticket.assigned_users.extend(users)
 
+    def _get_ticket_for_update(self, ticket_id: uuid.UUID) -> Optional[Ticket]:
+        """Load a ticket with everything its history values need in one statement"""
+        return self.db.query(Ticket).options(
+            joinedload(Ticket.category),
+            joinedload(Ticket.assigned_users)
+        ).filter(Ticket.id == ticket_id).first()
+
+    def _update_ticket_row(self, ticket: Ticket, values: Dict[str, Any]) -> int:
+        """UPDATE a loaded ticket in place and count a history record against it.
+
+        updated_at and history_seq come back from RETURNING; the new history_seq is returned.
+        """
+        updated_at, history_seq = self.db.execute(
+            update(Ticket)
+            .where(Ticket.id == ticket.id)
+            .values(**values, history_seq=Ticket.history_seq + 1)
+            .returning(Ticket.updated_at, Ticket.history_seq)
+            .execution_options(synchronize_session="evaluate")
+        ).one()
+        set_committed_value(ticket, "updated_at", updated_at)
+        set_committed_value(ticket, "history_seq", history_seq)
+        return history_seq
+
+    def _commit(self):
+        """Commit without expiring the session: mutations already hold their final state from RETURNING"""
+        expire_on_commit, self.db.expire_on_commit = self.db.expire_on_commit, False
+        try:
+            self.db.commit()
+        finally:
+            self.db.expire_on_commit = expire_on_commit
+
     def create_ticket(self, ticket_data: TicketCreate, user_id: uuid.UUID) -> Optional[Ticket]:
-        category = self.db.query(Category).filter(
-            and_(Category.id == ticket_data.category_id)
+        max_position = select(func.max(Ticket.position)).where(
+            Ticket.category_id == Category.id
+        ).scalar_subquery()
+        row = self.db.execute(
+            select(Category, max_position).where(Category.id == ticket_data.category_id)
         ).first()
         
-        if not category:
+        if not row:
             return None
 
-        max_position = self.db.query(Ticket).filter(
-            Ticket.category_id == ticket_data.category_id
-        ).count()
-        
-        db_ticket = Ticket(
-            title=ticket_data.title,
-            description=ticket_data.description,
-            expiry_date=ticket_data.expiry_date,
-            position=max_position,
-            category_id=ticket_data.category_id,
-            user_id=user_id
-        )
-        self.db.add(db_ticket)
-        self.db.flush() 
+        category, max_position = row
+
+        db_ticket = self.db.scalars(insert(Ticket).returning(Ticket), [{
+            "id": uuid.uuid4(),
+            "title": ticket_data.title,
+            "description": ticket_data.description,
+            "expiry_date": ticket_data.expiry_date,
+            "position": position_between(max_position, None),
+            "category_id": ticket_data.category_id,
+            "user_id": user_id,
+            "history_seq": 1
+        }]).one()
+        set_committed_value(db_ticket, "category", category)
+        set_committed_value(db_ticket, "assigned_users", [])
         
         self._assign_users_to_ticket(db_ticket, ticket_data.assigned_user_ids)
         
-        self.db.commit()
-        self.db.refresh(db_ticket)
-        
         self._create_history_record(
             ticket_id=db_ticket.id,
             user_id=user_id,
@@ -85,22 +206,83 @@ class TicketService:
             new_values=self._get_ticket_values(db_ticket),
             to_category_name=category.name
         )
-        self.db.commit()
+        publish_change(self.db, "ticket.created", ticket_id=db_ticket.id,
+                       category_id=db_ticket.category_id, position=db_ticket.position)
+        board_version.bump(self.db)
+
+        self._commit()
         
         return db_ticket
 
-    def get_tickets(self, category_id: Optional[uuid.UUID] = None, page: int = 0, page_size: int = 0) -> dict:
-        query = self.db.query(Ticket).options(joinedload(Ticket.category))
+    def _listing_query(self, fields: Optional[Tuple[str, ...]] = None):
+        """Tickets with their category and assignees, or just the selected columns plus the ordering keys"""
+        if fields is None:
+            # selectinload keeps LIMIT on the tickets and loads every page's assignees in one query
+            return self.db.query(Ticket).options(joinedload(Ticket.category), selectinload(Ticket.assigned_users))
+
+        names = dict.fromkeys(("id", "category_id", "position") + tuple(
+            name for name in fields if name in TICKET_COLUMN_FIELDS
+        ))
+        return self.db.query(*(TICKET_COLUMN_FIELDS[name] for name in names))
+
+    def _project(self, fields: Tuple[str, ...], rows: List[Any], category_id: Optional[uuid.UUID] = None,
+                 unpaged: bool = False) -> List[Dict[str, Any]]:
+        """Turn projected rows into dicts holding exactly `fields`"""
+        assigned = defaultdict(list)
+        if "assigned_users" in fields or "assigned_user_ids" in fields:
+            assignments = select(ticket_users.c.ticket_id, ticket_users.c.user_id)
+            if "assigned_users" in fields:
+                assignments = select(
+                    ticket_users.c.ticket_id, User.id, User.username, User.avatar_hash
+                ).join(User, User.id == ticket_users.c.user_id)
+
+            if not unpaged:
+                assignments = assignments.where(ticket_users.c.ticket_id.in_([row.id for row in rows]))
+            elif category_id:
+                assignments = assignments.where(
+                    ticket_users.c.ticket_id.in_(select(Ticket.id).where(Ticket.category_id == category_id))
+                )
+
+            for ticket_id, user_id, *user in self.db.execute(assignments):
+                assigned[ticket_id].append((user_id, *user))
+
+        categories = {}
+        if "category" in fields and rows:
+            categories = {
+                row.id: dict(row._mapping)
+                for row in self.db.execute(
+                    select(*LISTING_CATEGORY_COLUMNS).where(Category.id.in_({row.category_id for row in rows}))
+                )
+            }
+
+        items = []
+        for row in rows:
+            item = {name: getattr(row, name) for name in fields if name in TICKET_COLUMN_FIELDS}
+            if "assigned_user_ids" in fields:
+                item["assigned_user_ids"] = [user[0] for user in assigned.get(row.id, ())]
+            if "assigned_users" in fields:
+                item["assigned_users"] = [
+                    {"id": user_id, "username": username, "profile_picture": avatar_url(user_id, avatar_hash)}
+                    for user_id, username, avatar_hash in assigned.get(row.id, ())
+                ]
+            if "category" in fields:
+                item["category"] = categories[row.category_id]
+            items.append(item)
+        return items
+
+    def get_tickets(self, category_id: Optional[uuid.UUID] = None, page: int = 0, page_size: int = 0,
+                    fields: Optional[Tuple[str, ...]] = None) -> dict:
+        query = self._listing_query(fields)
         
         if category_id:
             query = query.filter(Ticket.category_id == category_id)
             
-        query = query.order_by(Ticket.position)
-
-        print(page, page_size)
+        query = query.order_by(Ticket.position, Ticket.id)
         
         if page_size == 0:
             tickets = query.all()
+            if fields is not None:
+                tickets = self._project(fields, tickets, category_id, unpaged=True)
             return {
                 "items": tickets,
                 "total": len(tickets),
@@ -115,6 +297,8 @@ class TicketService:
         offset = (page - 1) * page_size
         
         tickets = query.offset(offset).limit(page_size).all()
+        if fields is not None:
+            tickets = self._project(fields, tickets)
         
         return {
             "items": tickets,
@@ -124,49 +308,184 @@ class TicketService:
             "total_pages": total_pages
         }
 
+    def get_ticket_listing(self, category_id: Optional[uuid.UUID] = None) -> dict:
+        """Unpaged listing in the PaginatedTicketOut shape as plain dicts.
+
+        Three Core selects (tickets, categories, assignees) and no ORM objects, for
+        serialising without validation.
+        """
+        tickets = select(*LISTING_TICKET_COLUMNS).order_by(Ticket.position, Ticket.id)
+        categories = select(*LISTING_CATEGORY_COLUMNS)
+        assignments = select(
+            ticket_users.c.ticket_id, User.id, User.username, User.avatar_hash
+        ).join(User, User.id == ticket_users.c.user_id)
+
+        if category_id:
+            tickets = tickets.where(Ticket.category_id == category_id)
+            categories = categories.where(Category.id == category_id)
+            assignments = assignments.join(Ticket, Ticket.id == ticket_users.c.ticket_id).where(
+                Ticket.category_id == category_id
+            )
+
+        items = listing_items(self.db.execute(tickets), self.db.execute(categories), self.db.execute(assignments))
+        return {
+            "items": items,
+            "total": len(items),
+            "page": 1,
+            "page_size": len(items),
+            "total_pages": 1
+        }
+
+    def get_tickets_after(self, category_id: Optional[uuid.UUID] = None, cursor: Optional[str] = None,
+                          page_size: int = 0, with_total: Optional[str] = None,
+                          fields: Optional[Tuple[str, ...]] = None) -> dict:
+        """Keyset-paginated ticket listing ordered by (category_id, position, id)"""
+        page_size = page_size or DEFAULT_CURSOR_PAGE_SIZE
+        query = self._listing_query(fields)
+
+        if category_id:
+            query = query.filter(Ticket.category_id == category_id)
+
+        if cursor:
+            after_category_id, after_position, after_id = decode_cursor(cursor, 3)
+            try:
+                key = (uuid.UUID(after_category_id), int(after_position), uuid.UUID(after_id))
+            except (TypeError, ValueError) as exc:
+                raise ValueError("Invalid cursor") from exc
+            query = query.filter(tuple_(Ticket.category_id, Ticket.position, Ticket.id) > tuple_(*key))
+
+        tickets = query.order_by(Ticket.category_id, Ticket.position, Ticket.id).limit(page_size + 1).all()
+
+        next_cursor = None
+        if len(tickets) > page_size:
+            tickets = tickets[:page_size]
+            last = tickets[-1]
+            next_cursor = encode_cursor([last.category_id, last.position, last.id])
+        if fields is not None:
+            tickets = self._project(fields, tickets)
+
+        total = None
+        total_is_approximate = False
+        if with_total == "approximate" and not category_id:
+            total = self._estimate_ticket_count()
+            total_is_approximate = total is not None
+        if with_total and total is None:
+            count_query = self.db.query(func.count(Ticket.id))
+            if category_id:
+                count_query = count_query.filter(Ticket.category_id == category_id)
+            total = count_query.scalar()
+
+        return {
+            "items": tickets,
+            "next_cursor": next_cursor,
+            "page_size": page_size,
+            "total": total,
+            "total_is_approximate": total_is_approximate
+        }
+
+    def search_tickets(self, q: str, category_id: Optional[uuid.UUID] = None, cursor: Optional[str] = None,
+                       page_size: int = 0) -> dict:
+        """Tickets matching a web-search style query, best match first, with highlighted snippets.
+
+        Matching uses the GIN index on search_vector. Pages are keyset on (rank, id);
+        headlines are only built for the rows of the page.
+        """
+        page_size = page_size or DEFAULT_SEARCH_PAGE_SIZE
+        query = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+        # Rounded to a fixed-point value so the cursor round-trips exactly
+        rank = cast(func.ts_rank_cd(Ticket.search_vector, query), Numeric(12, 8)).label("rank")
+
+        matches = select(
+            Ticket.id, Ticket.category_id, Ticket.title, Ticket.description, Ticket.position, rank
+        ).where(Ticket.search_vector.op("@@")(query))
+
+        if category_id:
+            matches = matches.where(Ticket.category_id == category_id)
+
+        if cursor:
+            after_rank, after_id = decode_cursor(cursor, 2)
+            try:
+                after_rank, after_id = Decimal(after_rank), uuid.UUID(after_id)
+            except (TypeError, ValueError, InvalidOperation) as exc:
+                raise ValueError("Invalid cursor") from exc
+            matches = matches.where(or_(rank < after_rank, and_(rank == after_rank, Ticket.id > after_id)))
+
+        page = matches.order_by(rank.desc(), Ticket.id).limit(page_size + 1).subquery()
+        rows = self.db.execute(
+            select(
+                page.c.id, page.c.category_id, page.c.title, page.c.position, page.c.rank,
+                func.ts_headline(SEARCH_CONFIG, page.c.title, query, TITLE_HEADLINE_OPTIONS).label("title_highlight"),
+                func.ts_headline(
+                    SEARCH_CONFIG, func.coalesce(page.c.description, ""), query, SNIPPET_HEADLINE_OPTIONS
+                ).label("snippet"),
+            ).order_by(page.c.rank.desc(), page.c.id)
+        ).all()
+
+        next_cursor = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            next_cursor = encode_cursor([rows[-1].rank, rows[-1].id])
+
+        items = [{
+            "id": row.id,
+            "category_id": row.category_id,
+            "title": row.title,
+            "position": row.position,
+            "rank": float(row.rank),
+            "title_highlight": highlight(row.title_highlight),
+            "snippet": highlight(row.snippet) if row.snippet else "",
+        } for row in rows]
+
+        return {"items": items, "next_cursor": next_cursor}
+
+    def _estimate_ticket_count(self) -> Optional[int]:
+        """Planner row estimate for the tickets table; None if the table was never analyzed"""
+        estimate = self.db.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'tickets'::regclass")
+        ).scalar()
+        return estimate if estimate is not None and estimate >= 0 else None
+
     def get_ticket(self, ticket_id: uuid.UUID) -> Optional[Ticket]:
         return self.db.query(Ticket).options(joinedload(Ticket.category)).filter(
             and_(Ticket.id == ticket_id)
         ).first()
 
-    def get_ticket_with_history(self, ticket_id: uuid.UUID) -> Optional[Ticket]:
+    def get_ticket_with_history(self, ticket_id: uuid.UUID, full_values: bool = False) -> Optional[Ticket]:
         """Get a ticket with its complete history"""
         ticket = self.get_ticket(ticket_id)
 
         if ticket:
             history = self.get_ticket_history(ticket_id)
+            if full_values:
+                self._apply_full_values(history, reversed(history))
 
             ticket.history = history
             
         return ticket
 
     def update_ticket(self, ticket_id: uuid.UUID, ticket_data: TicketUpdate, user_id: uuid.UUID) -> Optional[Ticket]:
-        db_ticket = self.get_ticket(ticket_id)
+        db_ticket = self._get_ticket_for_update(ticket_id)
         if not db_ticket:
             return None
 
         old_values = self._get_ticket_values(db_ticket)
         old_category = db_ticket.category
+        old_category_id = db_ticket.category_id
+        new_category = old_category
 
-        if ticket_data.category_id:
-            category = self.db.query(Category).filter(
-                and_(Category.id == ticket_data.category_id)
-            ).first()
-            if not category:
+        if ticket_data.category_id and ticket_data.category_id != db_ticket.category_id:
+            new_category = self.db.get(Category, ticket_data.category_id)
+            if not new_category:
                 return None
 
         update_data = ticket_data.model_dump(exclude_unset=True, exclude={'assigned_user_ids'})
-        for field, value in update_data.items():
-            setattr(db_ticket, field, value)
+        sequence = self._update_ticket_row(db_ticket, update_data)
+        set_committed_value(db_ticket, "category", new_category)
 
         if ticket_data.assigned_user_ids is not None:
             self._assign_users_to_ticket(db_ticket, ticket_data.assigned_user_ids)
-
-        self.db.commit()
-        self.db.refresh(db_ticket)
         
         new_values = self._get_ticket_values(db_ticket)
-        new_category = db_ticket.category
         
         from_category_name = old_category.name if old_category else None
         to_category_name = new_category.name if new_category else None
@@ -179,9 +498,14 @@ class TicketService:
             old_values=old_values,
             new_values=new_values,
             from_category_name=from_category_name if action_type == "moved" else None,
-            to_category_name=to_category_name if action_type == "moved" else None
+            to_category_name=to_category_name if action_type == "moved" else None,
+            sequence=sequence
         )
-        self.db.commit()
+        publish_change(self.db, f"ticket.{action_type}", ticket_id=db_ticket.id, category_id=db_ticket.category_id,
+                       from_category_id=old_category_id, position=db_ticket.position)
+        board_version.bump(self.db)
+
+        self._commit()
         
         return db_ticket
 
@@ -191,29 +515,25 @@ class TicketService:
         if not db_ticket:
             return False
 
-        old_values = self._get_ticket_values(db_ticket)
-        from_category_name = db_ticket.category.name if db_ticket.category else None
-        
-        self._create_history_record(
-            ticket_id=db_ticket.id,
-            user_id=user_id,
-            action_type="deleted",
-            old_values=old_values,
-            from_category_name=from_category_name
-        )
+        # The ticket's history cascades away with it, so nothing is recorded; a queued
+        # row would only fail its foreign key in the async writer
+        history_buffer(self.db).discard(db_ticket.id)
+        publish_change(self.db, "ticket.deleted", ticket_id=db_ticket.id, category_id=db_ticket.category_id)
+        board_version.bump(self.db)
         
         self.db.delete(db_ticket)
         self.db.commit()
         return True
 
     def drag_drop_ticket(self, ticket_id: uuid.UUID, target_category_id: uuid.UUID, target_position: int, user_id: uuid.UUID) -> Optional[Ticket]:
-        db_ticket = self.get_ticket(ticket_id)
+        db_ticket = self._get_ticket_for_update(ticket_id)
         if not db_ticket:
             return None
 
-        target_category = self.db.query(Category).filter(
-            and_(Category.id == target_category_id)
-        ).first()
+        if db_ticket.category_id == target_category_id:
+            target_category = db_ticket.category
+        else:
+            target_category = self.db.get(Category, target_category_id)
         if not target_category:
             return None
 
@@ -222,62 +542,24 @@ class TicketService:
         old_category_id = db_ticket.category_id
         old_position = db_ticket.position
 
-        if old_category_id == target_category_id:
-            if old_position == target_position:
-                return db_ticket
-            
-            if old_position < target_position:
-                self.db.execute(
-                    update(Ticket)
-                    .where(
-                        and_(
-                            Ticket.category_id == target_category_id,
-                            Ticket.position > old_position,
-                            Ticket.position <= target_position,
-                        )
-                    )
-                    .values(position=Ticket.position - 1)
-                )
-            else:
-                self.db.execute(
-                    update(Ticket)
-                    .where(
-                        and_(
-                            Ticket.category_id == target_category_id,
-                            Ticket.position >= target_position,
-                            Ticket.position < old_position,
-                        )
-                    )
-                    .values(position=Ticket.position + 1)
-                )
-        else:
-            self.db.execute(
-                update(Ticket)
-                .where(
-                    and_(
-                        Ticket.category_id == old_category_id,
-                        Ticket.position > old_position,
-                    )
-                )
-                .values(position=Ticket.position - 1)
-            )
-            
-            self.db.execute(
-                update(Ticket)
-                .where(
-                    and_(
-                        Ticket.category_id == target_category_id,
-                        Ticket.position >= target_position,
-                    )
-                )
-                .values(position=Ticket.position + 1)
-            )
+        before, after = self._neighbour_positions(target_category_id, ticket_id, target_position)
 
-        db_ticket.category_id = target_category_id
-        db_ticket.position = target_position
-        
-        self.db.commit()
-        self.db.refresh(db_ticket)
+        if old_category_id == target_category_id and \
+                (before is None or before < old_position) and (after is None or old_position < after):
+            return db_ticket
+
+        new_position = position_between(before, after)
+        if new_position is None:
+            self.rebalance_positions(target_category_id)
+            publish_change(self.db, "tickets.renumbered", category_id=target_category_id)
+            before, after = self._neighbour_positions(target_category_id, ticket_id, target_position)
+            new_position = position_between(before, after)
+
+        if gap_exhausted(before, new_position, after):
+            self.pending_rebalance.add(target_category_id)
+
+        sequence = self._update_ticket_row(db_ticket, {"category_id": target_category_id, "position": new_position})
+        set_committed_value(db_ticket, "category", target_category)
         
         new_values = self._get_ticket_values(db_ticket)
         if old_category_id != target_category_id:
@@ -288,51 +570,201 @@ class TicketService:
                 old_values=old_values,
                 new_values=new_values,
                 from_category_name=old_category.name if old_category else None,
-                to_category_name=target_category.name
+                to_category_name=target_category.name,
+                sequence=sequence
             )
-        elif old_position != target_position:
+        else:
             self._create_history_record(
                 ticket_id=db_ticket.id,
                 user_id=user_id,
                 action_type="updated",
                 old_values=old_values,
-                new_values=new_values
+                new_values=new_values,
+                sequence=sequence
             )
+        publish_change(self.db, "ticket.moved", ticket_id=db_ticket.id, category_id=target_category_id,
+                       from_category_id=old_category_id, position=new_position)
+        board_version.bump(self.db)
         
-        self.db.commit()
+        self._commit()
         return db_ticket
 
+    def _neighbour_positions(self, category_id: uuid.UUID, ticket_id: uuid.UUID, index: int):
+        """Positions of the tickets that would surround `ticket_id` at `index` in a category"""
+        index = max(index, 0)
+        positions = self.db.execute(
+            select(Ticket.position)
+            .where(and_(Ticket.category_id == category_id, Ticket.id != ticket_id))
+            .order_by(Ticket.position, Ticket.id)
+            .offset(max(index - 1, 0))
+            .limit(2)
+        ).scalars().all()
+
+        if index == 0:
+            return None, positions[0] if positions else None
+
+        before = positions[0] if positions else None
+        after = positions[1] if len(positions) > 1 else None
+        return before, after
+
+    def rebalance_positions(self, category_id: uuid.UUID):
+        """Respread the positions of a category POSITION_GAP apart, keeping their order"""
+        # Lock the column's rows in the order they are ranked, so a concurrent move or
+        # rebalance waits here instead of interleaving with the renumbering
+        self.db.execute(
+            select(Ticket.id).where(Ticket.category_id == category_id)
+            .order_by(Ticket.position, Ticket.id).with_for_update()
+        )
+
+        ranked = select(
+            Ticket.id,
+            func.row_number().over(order_by=(Ticket.position, Ticket.id)).label("rank")
+        ).where(Ticket.category_id == category_id).subquery()
+
+        self.db.execute(
+            update(Ticket)
+            .where(Ticket.id == ranked.c.id, Ticket.category_id == category_id)
+            .values(position=ranked.c.rank * POSITION_GAP, updated_at=func.now())
+            .execution_options(synchronize_session=False)
+        )
+
     def get_ticket_history(self, ticket_id: uuid.UUID) -> List[TicketHistory]:
         """Get history records for a specific ticket"""
         ticket = self.get_ticket(ticket_id)
         if not ticket:
             return []
         
+        # Nothing predates the ticket, so partitions older than it are pruned. History
+        # timestamps come from the app's clock and the ticket's from the database's.
         return self.db.query(TicketHistory).filter(
-            TicketHistory.ticket_id == ticket_id
+            TicketHistory.ticket_id == ticket_id,
+            TicketHistory.created_at >= ticket.created_at - HISTORY_CLOCK_SKEW
         ).order_by(TicketHistory.created_at.desc()).all()
 
-    def get_all_activity_logs(self, page: int = 1, page_size: int = 50, filter_user_id: Optional[uuid.UUID] = None) -> List[TicketHistory]:
-        """Get all activity logs for a user across all their tickets"""
-        
-        user_ticket_ids = self.db.query(Ticket.id).subquery()
-        
-        offset = (page - 1) * page_size
-        
-        query = self.db.query(TicketHistory).filter(
-            TicketHistory.ticket_id.in_(
-                self.db.query(user_ticket_ids.c.id)
-            )
-        )
-        
+    def _activity_query(self, filter_user_id: Optional[uuid.UUID] = None):
+        query = self.db.query(TicketHistory, Ticket.title).join(Ticket, Ticket.id == TicketHistory.ticket_id)
+
         if filter_user_id:
             query = query.filter(TicketHistory.user_id == filter_user_id)
-        
-        history_records = query.order_by(TicketHistory.created_at.desc()).offset(offset).limit(page_size).all()
-        
-        for record in history_records:
-            ticket = self.db.query(Ticket).filter(Ticket.id == record.ticket_id).first()
-            if ticket:
-                record.ticket_title = ticket.title
-        
-        return history_records
+
+        return query.order_by(TicketHistory.created_at.desc(), TicketHistory.id.desc())
+
+    def _feed_rows(self, query, offset: int, limit: int, until: Optional[datetime] = None):
+        """Run a feed query over the recent partitions first, and over all of them only if that page comes up short"""
+        rows = query.filter(TicketHistory.created_at >= feed_window_start(until)).offset(offset).limit(limit).all()
+        if len(rows) < limit:
+            rows = query.offset(offset).limit(limit).all()
+        return rows
+
+    def _apply_full_values(self, records: List[TicketHistory], chain) -> None:
+        """Swap the diffs in `records` for full values rebuilt from `chain` (history rows in ascending order)"""
+        chains: Dict[uuid.UUID, List[TicketHistory]] = {}
+        for record in chain:
+            chains.setdefault(record.ticket_id, []).append(record)
+
+        rebuilt = {}
+        for ticket_records in chains.values():
+            rebuilt.update(reconstruct(ticket_records))
+
+        for record in records:
+            if not record.is_checkpoint and record.id in rebuilt:
+                # Committed values, so the rebuilt rows are never flushed back
+                old_values, new_values = rebuilt[record.id]
+                set_committed_value(record, "old_values", old_values)
+                set_committed_value(record, "new_values", new_values)
+
+    def _with_full_values(self, records: List[TicketHistory]) -> List[TicketHistory]:
+        """Rebuild full values for the diff rows of an activity page"""
+        diffs = [record for record in records if not record.is_checkpoint]
+        if not diffs:
+            return records
+
+        # Each ticket's chain runs from its latest checkpoint at or before its own
+        # earliest diff on the page up to its own latest one, so a ticket whose
+        # diffs are all recent doesn't drag in history from the far end of the page
+        spans: Dict[uuid.UUID, Tuple[datetime, datetime]] = {}
+        for record in diffs:
+            earliest, latest = spans.get(record.ticket_id, (record.created_at, record.created_at))
+            spans[record.ticket_id] = (min(earliest, record.created_at), max(latest, record.created_at))
+
+        span_rows = values(
+            column("ticket_id", UUID(as_uuid=True)),
+            column("earliest", DateTime(timezone=True)),
+            column("latest", DateTime(timezone=True)),
+            name="spans"
+        ).data([(ticket_id, earliest, latest) for ticket_id, (earliest, latest) in spans.items()])
+        # VALUES columns are typed by Postgres from their literals, so cast them back explicitly
+        span_ticket_id = cast(span_rows.c.ticket_id, UUID(as_uuid=True))
+        span_earliest = cast(span_rows.c.earliest, DateTime(timezone=True))
+        span_latest = cast(span_rows.c.latest, DateTime(timezone=True))
+
+        checkpoint = aliased(TicketHistory)
+        chain_start = select(func.max(checkpoint.created_at)).where(
+            checkpoint.ticket_id == span_ticket_id,
+            checkpoint.is_checkpoint == True,
+            checkpoint.created_at <= span_earliest
+        ).scalar_subquery()
+
+        chain = self.db.query(TicketHistory).join(span_rows, TicketHistory.ticket_id == span_ticket_id).filter(
+            or_(chain_start.is_(None), TicketHistory.created_at >= chain_start),
+            TicketHistory.created_at <= span_latest,
+            # The plain bound lets the planner prune partitions; the per-ticket one can't
+            TicketHistory.created_at <= max(latest for _, latest in spans.values())
+        ).order_by(TicketHistory.ticket_id, TicketHistory.created_at, TicketHistory.id).all()
+
+        self._apply_full_values(records, chain)
+        return records
+
+    def _with_ticket_titles(self, rows) -> List[TicketHistory]:
+        records = []
+        for record, ticket_title in rows:
+            record.ticket_title = ticket_title
+            records.append(record)
+        return records
+
+    def get_all_activity_logs(self, page: int = 1, page_size: int = 50, filter_user_id: Optional[uuid.UUID] = None,
+                              full_values: bool = False) -> List[TicketHistory]:
+        """Get all activity logs across all tickets"""
+        offset = (page - 1) * page_size
+        rows = self._feed_rows(self._activity_query(filter_user_id), offset, page_size)
+        records = self._with_ticket_titles(rows)
+        return self._with_full_values(records) if full_values else records
+
+    def get_activity_logs_before(self, cursor: Optional[str] = None, page_size: int = 50,
+                                 filter_user_id: Optional[uuid.UUID] = None, full_values: bool = False) -> dict:
+        """Keyset-paginated activity feed ordered by (created_at, id) descending"""
+        query = self._activity_query(filter_user_id)
+        until = None
+
+        if cursor:
+            created_at, history_id = decode_cursor(cursor, 2)
+            try:
+                key = (datetime.fromisoformat(created_at), uuid.UUID(history_id))
+            except (TypeError, ValueError) as exc:
+                raise ValueError("Invalid cursor") from exc
+            until = key[0]
+            # The plain bound lets the planner prune partitions; the row comparison can't
+            query = query.filter(
+                TicketHistory.created_at <= until,
+                tuple_(TicketHistory.created_at, TicketHistory.id) < tuple_(*key)
+            )
+
+        records = self._with_ticket_titles(self._feed_rows(query, 0, page_size + 1, until))
+
+        next_cursor = None
+        if len(records) > page_size:
+            records = records[:page_size]
+            next_cursor = encode_cursor([records[-1].created_at.isoformat(), records[-1].id])
+
+        if full_values:
+            self._with_full_values(records)
+
+        return {"items": records, "next_cursor": next_cursor}
+
+def rebalance_category_positions(category_id: uuid.UUID):
+    """Background task: renumber a category whose position gaps are exhausted"""
+    with db_session() as db:
+        TicketService(db).rebalance_positions(category_id)
+        publish_change(db, "tickets.renumbered", category_id=category_id)
+        board_version.bump(db)
+        db.commit()
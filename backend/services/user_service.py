@@ -1,8 +1,11 @@
 import uuid
 from typing import Optional
 from sqlalchemy.orm import Session
+from core.principal import invalidate_principal
 from models.user import User
 from schemas.user import UserUpdate
+from services.avatar_service import AvatarService
+from services.board_service import board_version
 
 class UserService:
     def __init__(self, db: Session):
@@ -17,9 +20,21 @@ class UserService:
             return None
 
         update_data = user_update.model_dump(exclude_unset=True)
+
+        if "profile_picture" in update_data:
+            picture = update_data.pop("profile_picture")
+            avatar_hash = AvatarService(self.db).store(picture) if picture else None
+            if avatar_hash != user.avatar_hash:
+                # The board carries every assignee's avatar URL
+                board_version.bump(self.db)
+            user.avatar_hash = avatar_hash
+
         for field, value in update_data.items():
             setattr(user, field, value)
 
         self.db.commit()
         self.db.refresh(user)
+
+        # Drop the cached auth snapshot so profile or is_active changes apply on the next request
+        invalidate_principal(user.username)
         return user
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Statement budget check for ADPM (Advanced Project Management)
+Sends the ticket mutations through the app and fails if a request issues more
+SQL statements than its budget. Needs a migrated and seeded database; the
+ticket it works on is created by the check and deleted again at the end.
+"""
+
+import os
+import sys
+from typing import Callable, List
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from core.auth import create_access_token
+from core.database import DB_PGBOUNCER, DB_STATEMENT_TIMEOUT_MS, SessionLocal, engine, async_engine
+from core.events import CHANGE_FEED_BACKEND
+from models.category import Category
+from models.user import User
+from main import app
+
+# Statements per request once the principal cache is warm. COMMIT is not counted.
+#   create:            category + max position, assignees, INSERT ticket, INSERT ticket_users, INSERT history
+#   update fields:     ticket, UPDATE ticket, INSERT history
+#   update move:       ticket, category, assignees, UPDATE ticket, INSERT history, DELETE/INSERT ticket_users
+#   drag-drop:         ticket, neighbours, UPDATE ticket, INSERT history (+ target category when it changes)
+BUDGETS = {
+    "POST /tickets/": 5,
+    "PUT /tickets/{id} fields": 3,
+    "PUT /tickets/{id} move and reassign": 7,
+    "PUT /tickets/drag-drop same category": 4,
+    "PUT /tickets/drag-drop other category": 5,
+}
+# The postgres change feed adds one pg_notify to every mutation
+if CHANGE_FEED_BACKEND == "postgres":
+    BUDGETS = {name: budget + 1 for name, budget in BUDGETS.items()}
+# PgBouncer mode sets the statement timeout at the start of every transaction
+if DB_PGBOUNCER and DB_STATEMENT_TIMEOUT_MS:
+    BUDGETS = {name: budget + 1 for name, budget in BUDGETS.items()}
+
+
+def count_statements(send: Callable):
+    """Send a request and count the statements the app runs for it."""
+    statements: List[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engines = [engine] + ([async_engine.sync_engine] if async_engine is not None else [])
+    for target in engines:
+        event.listen(target, "before_cursor_execute", record)
+    try:
+        response = send()
+    finally:
+        for target in engines:
+            event.remove(target, "before_cursor_execute", record)
+
+    response.raise_for_status()
+    return response, statements
+
+
+def check_statement_budgets() -> bool:
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.is_active == True).first()
+        categories = db.query(Category).order_by(Category.position).limit(2).all()
+    finally:
+        db.close()
+
+    if not user or len(categories) < 2:
+        raise SystemExit("Need a user and two categories. Run seed_data.py first.")
+
+    home, other = (str(category.id) for category in categories)
+    client = TestClient(app)
+    client.cookies.set("access_token", create_access_token({"sub": user.username}))
+    client.get("/auth/me").raise_for_status()
+
+    ok = True
+    ticket_id = None
+
+    def check(name: str, send: Callable):
+        nonlocal ok
+        response, statements = count_statements(send)
+        budget = BUDGETS[name]
+        status = "OK" if len(statements) <= budget else "OVER BUDGET"
+        print(f"{status:<12} {len(statements):>3}/{budget:<3} {name}")
+
+        if len(statements) > budget:
+            ok = False
+            for statement in statements:
+                print(f"    {' '.join(statement.split())}")
+        return response
+
+    try:
+        created = check("POST /tickets/", lambda: client.post("/tickets/", json={
+            "title": "Statement budget", "category_id": home, "assigned_user_ids": [str(user.id)]
+        }))
+        ticket_id = created.json()["id"]
+
+        check("PUT /tickets/{id} fields", lambda: client.put(f"/tickets/{ticket_id}", json={
+            "description": "Checked by statement_budget.py"
+        }))
+        check("PUT /tickets/{id} move and reassign", lambda: client.put(f"/tickets/{ticket_id}", json={
+            "category_id": other, "assigned_user_ids": []
+        }))
+        check("PUT /tickets/drag-drop other category", lambda: client.put("/tickets/drag-drop", json={
+            "ticket_id": ticket_id, "target_category_id": home, "target_position": 0
+        }))
+        check("PUT /tickets/drag-drop same category", lambda: client.put("/tickets/drag-drop", json={
+            "ticket_id": ticket_id, "target_category_id": home, "target_position": 1
+        }))
+    finally:
+        if ticket_id:
+            client.delete(f"/tickets/{ticket_id}")
+
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if check_statement_budgets() else 1)
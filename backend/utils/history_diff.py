@@ -0,0 +1,47 @@
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+# Updates and moves store only the keys that changed. Every CHECKPOINT_INTERVAL-th
+# history row of a ticket (and every created/deleted row) keeps the full values,
+# so rebuilding a row never has to replay more than CHECKPOINT_INTERVAL diffs.
+CHECKPOINT_INTERVAL = 20
+DIFF_ACTIONS = ("updated", "moved")
+
+Values = Optional[Dict[str, Any]]
+
+
+def is_checkpoint(action_type: str, sequence: int) -> bool:
+    """Whether the `sequence`-th history row of a ticket stores full values"""
+    return action_type not in DIFF_ACTIONS or sequence % CHECKPOINT_INTERVAL == 0
+
+
+def diff_values(old_values: Dict[str, Any], new_values: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Reduce a before/after pair to the keys whose value changed"""
+    changed = [key for key in {**old_values, **new_values} if old_values.get(key) != new_values.get(key)]
+    return (
+        {key: old_values[key] for key in changed if key in old_values},
+        {key: new_values[key] for key in changed if key in new_values},
+    )
+
+
+def reconstruct(records: Iterable[Any]) -> Dict[Any, Tuple[Values, Values]]:
+    """Full (old_values, new_values) per record id.
+
+    `records` are one ticket's history rows in (created_at, id) order, starting at
+    a checkpoint. Rows before the first checkpoint can't be rebuilt and are left out.
+    """
+    rebuilt = {}
+    state: Values = None
+
+    for record in records:
+        if record.is_checkpoint:
+            old_values, new_values = record.old_values, record.new_values
+        elif state is None:
+            continue
+        else:
+            old_values = {**state, **(record.old_values or {})}
+            new_values = {**state, **(record.new_values or {})}
+
+        rebuilt[record.id] = (old_values, new_values)
+        state = new_values if new_values is not None else old_values
+
+    return rebuilt
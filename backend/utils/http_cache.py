@@ -0,0 +1,15 @@
+from fastapi import Request
+
+
+def make_etag(version: str) -> str:
+    return f'"{version}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check a request's If-None-Match header against an ETag"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+
+    candidates = [tag.strip() for tag in header.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
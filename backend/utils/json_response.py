@@ -0,0 +1,14 @@
+from fastapi.responses import JSONResponse
+from typing import Any
+import orjson
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered by orjson, which encodes UUIDs and datetimes natively.
+
+    Content is not validated against a response model, so it must already have the
+    documented shape. UTC timestamps end in Z, as pydantic writes them.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z)
@@ -0,0 +1,30 @@
+from typing import Optional
+
+# Tickets are ordered by sparse integer positions so a move only rewrites the
+# moved row. New rows are spaced POSITION_GAP apart; when two neighbours end up
+# adjacent the column is renumbered (see TicketService.rebalance_positions).
+# Appends and moves to the top drift POSITION_GAP past the ends each time and
+# nothing re-centres them, which is why tickets.position is a bigint.
+POSITION_GAP = 1024
+
+
+def position_between(before: Optional[int], after: Optional[int]) -> Optional[int]:
+    """Return a position strictly between two neighbours, or None if there is no room"""
+    if before is None and after is None:
+        return POSITION_GAP
+    if before is None:
+        return after - POSITION_GAP
+    if after is None:
+        return before + POSITION_GAP
+    if after - before < 2:
+        return None
+    return (before + after) // 2
+
+
+def gap_exhausted(before: Optional[int], position: int, after: Optional[int]) -> bool:
+    """Check whether another insert next to `position` would require a rebalance"""
+    if before is not None and position - before < 2:
+        return True
+    if after is not None and after - position < 2:
+        return True
+    return False
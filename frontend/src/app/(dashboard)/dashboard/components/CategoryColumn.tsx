@@ -85,13 +85,7 @@ const CategoryColumn: FC<CategoryColumnProps> = ({
             adjustedDragOverIndex = dragOverIndex - 1;
         }
         
-        if (!tickets.length) {
-            onDropTicket(ticketId, 0);
-        } else if (tickets.length === adjustedDragOverIndex) {
-            onDropTicket(ticketId, tickets[adjustedDragOverIndex - 1].position + 1);
-        } else {
-            onDropTicket(ticketId, tickets[adjustedDragOverIndex].position);
-        }
+        onDropTicket(ticketId, adjustedDragOverIndex);
     }
     
     setDragOverIndex(-1);
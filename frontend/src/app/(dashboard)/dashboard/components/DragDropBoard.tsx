@@ -84,7 +84,7 @@ const DragDropBoard: FC<DragDropBoardProps> = ({
     const categoryTickets = getTicketsForCategory(categoryId);
     const targetPosition = dropPosition !== undefined ? dropPosition : categoryTickets.length;
 
-    if (ticket.category_id === categoryId && ticket.position === targetPosition) {
+    if (ticket.category_id === categoryId && categoryTickets.findIndex((t) => t.id === ticketId) === targetPosition) {
       setIsDropping(false);
       return;
     }
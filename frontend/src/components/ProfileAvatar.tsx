@@ -57,9 +57,14 @@ const ProfileAvatar: FC<ProfileAvatarProps> = ({
   const sizeClass = sizeClasses[size];
 
   if (profile_picture) {
+    // The API returns avatar paths; uploads being previewed are data URLs
+    const src = profile_picture.startsWith("/")
+      ? `${process.env.NEXT_PUBLIC_API_BASE_URL}${profile_picture}`
+      : profile_picture;
+
     return (
       <img
-        src={profile_picture}
+        src={src}
         alt={username}
         className={`${sizeClass} rounded-full object-cover ${className}`}
       />